@@ -0,0 +1,378 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from instrumentation import Instrumentation
+from mesh_io import BINARY_GEOMETRY_EXTENSION, read_in_binary_geometry_file, read_in_json_file_streaming
+from mesh_writers import COMPRESSION_EXTENSIONS, FILE_EXTENSIONS, GEOMETRY_WRITERS, geometry_output_path, write_geometry_files
+from polygon_soup import PolygonSoup
+from quadrilateral_slicing import split_up_quadrilateral_data_indexed, waterplane
+from rendering import PREVIEW_MODES, save_dry_and_wet_previews
+from result_cache import DEFAULT_MAX_CACHE_BYTES, ResultCache, split_up_quadrilateral_data_cached
+
+
+#The slicing parameters of a file's outputs are recorded beside them, e.g. 'hull_dry.json' -> 'hull_dry.params'. The extension is not
+#a geometry one, so a '*.json' input pattern never matches these records when the outputs are written beside the inputs
+PARAMETERS_EXTENSION = '.params'
+
+
+def expand_input_patterns(patterns):
+
+    """
+    Expands input paths and glob patterns (e.g. 'hulls/**/*.json') into a sorted list of unique files. The slicing parameter records
+    written beside the outputs (see 'parameters_path') are never inputs, so broader patterns such as '*.*' leave them out.
+
+    Args:
+        patterns (list): Paths and/or glob patterns.
+
+    Returns:
+        input_paths (list): The matching files.
+        unmatched_patterns (list): The patterns that matched no file.
+
+    Raises:
+        None
+    """
+
+    input_paths = set()
+    unmatched_patterns = []
+
+    for pattern in patterns:
+        matches = [path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path) and not path.endswith(PARAMETERS_EXTENSION)]
+        if matches:
+            input_paths.update(os.path.normpath(path) for path in matches)
+        else:
+            unmatched_patterns.append(pattern)
+
+    return(sorted(input_paths), unmatched_patterns)
+
+
+def read_geometry_file(path):
+
+    """
+    Reads a geometry file into arrays, choosing the reader by extension: binary ('.qpb') files are memory mapped, and json files are
+    read incrementally (see 'mesh_io.py').
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        quadrilateral_position_dict (dict): 'p' as a (V, 3) float array and 'q' as an (N, 4) int array.
+
+    Raises:
+        None
+    """
+
+    if path.endswith(BINARY_GEOMETRY_EXTENSION):
+        return(read_in_binary_geometry_file(path))
+
+    return(read_in_json_file_streaming(path))
+
+
+def _strip_extensions(path):
+
+    #The path without its compression and geometry extensions (only known ones), e.g. 'hulls/hull.v2.json.gz' -> 'hulls/hull.v2'
+    stem, extension = os.path.splitext(path)
+    if extension in COMPRESSION_EXTENSIONS.values():
+        path, (stem, extension) = stem, os.path.splitext(stem)
+
+    return(stem if extension in FILE_EXTENSIONS.values() else path)
+
+
+def batch_output_paths(input_path, output_directory, file_format='json', compression=None, input_root=None):
+
+    """
+    The dry and wet output paths for an input file, named after it, e.g. 'hull_07.json' -> 'hull_07_dry.json' & 'hull_07_wet.json'.
+    With 'input_root', the input's directories below it are kept, e.g. 'hulls/a/hull.json' with root 'hulls' -> 'a/hull_dry.json',
+    so that same named inputs in different directories get different outputs.
+
+    Args:
+        input_path (str): The path of the input file.
+        output_directory (str): The directory the outputs are saved within.
+        file_format (str): One of 'GEOMETRY_WRITERS'.
+        compression (str): One of 'COMPRESSION_EXTENSIONS', or None.
+        input_root (str): If given, the directory the outputs' paths are kept relative to.
+
+    Returns:
+        output_paths (list): The dry and wet output paths.
+
+    Raises:
+        ValueError: If 'file_format' or 'compression' is not recognised.
+    """
+
+    stem = _strip_extensions(input_path)
+    stem = os.path.basename(stem) if input_root is None else os.path.relpath(stem, input_root)
+
+    return([geometry_output_path(output_directory, f'{stem}_{side}', file_format, compression) for side in ['dry', 'wet']])
+
+
+def common_input_root(input_paths):
+
+    #The deepest directory holding every input, so that the outputs mirror the inputs' layout below it
+    if not input_paths:
+        return(None)
+
+    return(os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in input_paths]))
+
+
+def slicing_parameters(plane_normal=(0.0, 0.0, 1.0), plane_offset=0.0, tolerance=None):
+
+    #The parameters the outputs depend on (beyond the input itself), as recorded beside them
+    return({'plane_normal': [float(value) for value in plane_normal], 'plane_offset': float(plane_offset), 'tolerance': None if tolerance is None else float(tolerance)})
+
+
+def parameters_path(output_paths):
+
+    #Where the slicing parameters of the outputs are recorded, beside the dry output
+    return(_strip_extensions(output_paths[0]) + PARAMETERS_EXTENSION)
+
+
+def is_up_to_date(input_path, output_paths, parameters=None):
+
+    """
+    Whether every output exists and is at least as new as the input, and (if 'parameters' is given) was made with the same slicing
+    parameters, in which case the input need not be processed again.
+
+    Args:
+        input_path (str): The path of the input file.
+        output_paths (list): The paths of its outputs.
+        parameters (dict): If given, the slicing parameters of this run (see 'slicing_parameters'), which must match those recorded
+            with the outputs (see 'parameters_path').
+
+    Returns:
+        up_to_date (bool): True if no output is missing or older than the input, and the parameters match.
+
+    Raises:
+        None
+    """
+
+    input_modified = os.path.getmtime(input_path)
+
+    if not all(os.path.exists(path) and os.path.getmtime(path) >= input_modified for path in output_paths):
+        return(False)
+    elif parameters is None:
+        return(True)
+
+    try:
+        with open(parameters_path(output_paths)) as f:
+            return(json.load(f) == parameters)
+    except (OSError, ValueError): #Not recorded (e.g. made by an older version), or unreadable
+        return(False)
+
+
+def process_geometry_file(input_path, output_paths, plane_normal=(0.0, 0.0, 1.0), plane_offset=0.0, preview=None, cache_directory=None,
+                          cache_max_bytes=DEFAULT_MAX_CACHE_BYTES, tolerance=None):
+
+    """
+    Runs the whole pipeline for one geometry file, without any GUI: read, split by index ('split_up_quadrilateral_data_indexed'),
+    write the dry and wet outputs concurrently, and optionally save preview images next to them.
+
+    Args:
+        input_path (str): The path of the input file.
+        output_paths (list): The dry and wet output paths; their extensions set the format and compression.
+        plane_normal (tuple): Normal of the cutting plane, pointing to the dry side.
+        plane_offset (float): Offset of the cutting plane along its normal, the plane being n.x = offset.
+        preview (str): If given, one of 'PREVIEW_MODES', and a '.png' preview is saved beside each output.
+        cache_directory (str): If given, the split goes through a 'ResultCache' in this directory (see 'result_cache.py').
+        cache_max_bytes (int): The size limit of the cache.
+        tolerance (float): If given, the tolerance aware split is used (see 'slice_quadrilateral_arrays').
+
+    Returns:
+        result (dict): 'input', 'outputs', 'status' ('done'), 'dry_polygons', 'wet_polygons', 'seconds' and 'cached' (whether the split
+            was loaded from the cache).
+
+    Raises:
+        Any error raised while reading, splitting or writing.
+    """
+
+    start = time.perf_counter()
+
+    quadrilateral_position_dict = read_geometry_file(input_path)
+    cached = False
+
+    if cache_directory is None:
+        quadrilateral_dicts = split_up_quadrilateral_data_indexed(quadrilateral_position_dict, plane_normal, plane_offset, tolerance=tolerance)
+    else:
+        instrumentation = Instrumentation()
+        quadrilateral_dicts = split_up_quadrilateral_data_cached(quadrilateral_position_dict, ResultCache(cache_directory, cache_max_bytes), plane_normal,
+                                                                 plane_offset, instrumentation=instrumentation, tolerance=tolerance)
+        cached = instrumentation.counters.get('cache_hits', 0) > 0
+
+    #Any earlier record goes first and the new one is written last, after the previews, so outputs left half written by a failure are never up to date
+    if os.path.exists(parameters_path(output_paths)):
+        os.remove(parameters_path(output_paths))
+
+    outputs = write_geometry_files(list(quadrilateral_dicts), output_paths)
+
+    if preview is not None:
+        polygon_soups = [PolygonSoup(quadrilateral_dict['p'][quadrilateral_dict['q'].vertices], quadrilateral_dict['q'].offsets) for quadrilateral_dict in quadrilateral_dicts]
+        preview_paths = [_strip_extensions(path) + '.png' for path in output_paths]
+        outputs += save_dry_and_wet_previews(polygon_soups, preview_paths, preview=preview, plane_normal=plane_normal, plane_offset=plane_offset)
+
+    with open(parameters_path(output_paths), 'w') as f:
+        json.dump(slicing_parameters(plane_normal, plane_offset, tolerance), f)
+
+    return({'input': input_path, 'outputs': outputs, 'status': 'done', 'dry_polygons': len(quadrilateral_dicts[0]['q']),
+            'wet_polygons': len(quadrilateral_dicts[1]['q']), 'seconds': time.perf_counter() - start, 'cached': cached})
+
+
+def run_batch(input_paths, output_directory='resulting_files', file_format='json', compression=None, plane_normal=(0.0, 0.0, 1.0), plane_offset=0.0,
+              workers=1, preview=None, force=False, progress=None, cache_directory=None, cache_max_bytes=DEFAULT_MAX_CACHE_BYTES, tolerance=None,
+              input_root=None):
+
+    """
+    Processes many geometry files, concurrently on a pool of worker processes, skipping those whose outputs are already up to date
+    (newer than the input, and made with the same plane and tolerance).
+    A file that fails is reported in its result rather than stopping the batch.
+
+    Args:
+        input_paths (list): The geometry files to be processed ('.json' or '.qpb').
+        output_directory (str): The directory the outputs are saved within.
+        file_format (str): One of 'GEOMETRY_WRITERS'.
+        compression (str): One of 'COMPRESSION_EXTENSIONS', or None.
+        plane_normal (tuple): Normal of the cutting plane, pointing to the dry side. See 'waterplane' for heel/trim planes.
+        plane_offset (float): Offset of the cutting plane along its normal, the plane being n.x = offset.
+        workers (int): The number of worker processes. 1 processes the files one after another in this process.
+        preview (str): If given, one of 'PREVIEW_MODES', and preview images are saved beside the outputs.
+        force (bool): If True, files are processed even when their outputs are up to date.
+        progress (callable): If given, called as progress(completed_count, total_count, result) as each file finishes.
+        cache_directory (str): If given, splits go through a 'ResultCache' in this directory, shared by the workers, so a mesh split
+            along the same plane before (in this or any earlier run) is loaded instead.
+        cache_max_bytes (int): The size limit of the cache.
+        tolerance (float): If given, points within 'tolerance' of the plane lie on it, and degenerate polygons are removed (see
+            'slice_quadrilateral_arrays').
+        input_root (str): If given, the outputs keep the inputs' directories below it (see 'batch_output_paths' and 'common_input_root').
+
+    Returns:
+        results (list): One dict per input file, in the order given, with 'input', 'outputs' and 'status' ('done', 'skipped' or
+            'failed'), plus 'dry_polygons', 'wet_polygons', 'seconds' and 'cached' when done, or 'error' when failed.
+
+    Raises:
+        TypeError: If 'workers' is not an int.
+        ValueError: If 'workers' is less than 1.
+        ValueError: If 'file_format', 'compression' or 'preview' is not recognised.
+        ValueError: If two inputs would be written to the same outputs, e.g. 'hull.json' and 'hull.qpb' in one directory.
+    """
+
+    if not isinstance(workers, (int)):
+        raise TypeError("'workers' argument must be an int")
+    elif workers < 1:
+        raise ValueError("'workers' argument must be at least 1")
+    elif preview is not None and preview not in PREVIEW_MODES:
+        raise ValueError(f"'preview' argument must be None or one of {PREVIEW_MODES}")
+
+    all_output_paths = [batch_output_paths(input_path, output_directory, file_format, compression, input_root) for input_path in input_paths]
+
+    #Refused before anything is written, as one input's outputs would silently overwrite the other's
+    output_inputs = {}
+    for input_path, output_paths in zip(input_paths, all_output_paths):
+        other_input_path = output_inputs.setdefault(os.path.normcase(os.path.abspath(output_paths[0])), input_path)
+        if other_input_path != input_path:
+            raise ValueError(f"'{other_input_path}' and '{input_path}' would both be written to '{output_paths[0]}'")
+
+    results = [None] * len(input_paths)
+    pending = []
+
+    for position, (input_path, output_paths) in enumerate(zip(input_paths, all_output_paths)):
+        if not force and is_up_to_date(input_path, output_paths, slicing_parameters(plane_normal, plane_offset, tolerance)):
+            results[position] = {'input': input_path, 'outputs': output_paths, 'status': 'skipped'}
+        else:
+            pending.append((position, input_path, output_paths))
+
+    completed_count = 0
+
+    def finish(position, result):
+        nonlocal completed_count
+        results[position] = result
+        completed_count += 1
+        if progress is not None:
+            progress(completed_count, len(input_paths), result)
+
+    for position, result in enumerate(results):
+        if result is not None:
+            finish(position, result)
+
+    def failure(input_path, output_paths, error):
+        return({'input': input_path, 'outputs': output_paths, 'status': 'failed', 'error': f'{type(error).__name__}: {error}'})
+
+    if workers == 1:
+        for position, input_path, output_paths in pending:
+            try:
+                result = process_geometry_file(input_path, output_paths, plane_normal, plane_offset, preview, cache_directory, cache_max_bytes, tolerance)
+            except Exception as error:
+                result = failure(input_path, output_paths, error)
+            finish(position, result)
+        return(results)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(process_geometry_file, input_path, output_paths, plane_normal, plane_offset, preview, cache_directory, cache_max_bytes, tolerance):
+                   (position, input_path, output_paths)
+                   for position, input_path, output_paths in pending}
+        for future in as_completed(futures):
+            position, input_path, output_paths = futures[future]
+            try:
+                result = future.result()
+            except Exception as error:
+                result = failure(input_path, output_paths, error)
+            finish(position, result)
+
+    return(results)
+
+
+def _print_progress(completed_count, total_count, result):
+
+    #One line per file on stderr, so stdout stays free for the summary
+    details = {'done': lambda: f"{result['dry_polygons']} dry / {result['wet_polygons']} wet polygons in {result['seconds']:.2f}s" + (' (cached)' if result['cached'] else ''),
+               'skipped': lambda: 'up to date', 'failed': lambda: result['error']}[result['status']]()
+    print(f"[{completed_count}/{total_count}] {result['status']:>7} {result['input']}: {details}", file=sys.stderr, flush=True)
+
+
+def main(arguments=None):
+
+    parser = argparse.ArgumentParser(description='Split many geometry files into dry and wet geometry files, headless and in parallel.')
+    parser.add_argument('inputs', nargs='+', help="input files ('.json' or '.qpb') or glob patterns, e.g. 'hulls/**/*.json'")
+    parser.add_argument('--output-dir', default='resulting_files', help="directory for the outputs, named <input>_dry / <input>_wet and laid out as the inputs are below their common directory")
+    parser.add_argument('--format', default='json', choices=list(GEOMETRY_WRITERS), help='output format')
+    parser.add_argument('--compression', choices=list(COMPRESSION_EXTENSIONS), help='compress the outputs as they are written')
+    parser.add_argument('--draft', type=float, default=0.0, help='height of the waterline above the mesh origin')
+    parser.add_argument('--heel', type=float, default=0.0, help='heel angle in degrees')
+    parser.add_argument('--trim', type=float, default=0.0, help='trim angle in degrees')
+    parser.add_argument('--plane', nargs=4, type=float, metavar=('NX', 'NY', 'NZ', 'OFFSET'),
+                        help='cut along the plane n.x = offset instead (n points to the dry side); overrides --draft/--heel/--trim')
+    parser.add_argument('--tolerance', type=float, help='treat points within this distance of the plane as on it, and drop degenerate polygons')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='number of worker processes')
+    parser.add_argument('--preview', choices=PREVIEW_MODES, help='also save a .png preview beside each output')
+    parser.add_argument('--force', action='store_true', help='process files even when their outputs are up to date (newer than the file, with the same plane and tolerance)')
+    parser.add_argument('--cache-dir', help='reuse splits of identical meshes and planes from this on-disk cache, adding new ones to it')
+    parser.add_argument('--cache-max-bytes', type=int, default=DEFAULT_MAX_CACHE_BYTES, help='size limit of the cache, least recently used entries go first')
+    parser.add_argument('--quiet', action='store_true', help='do not report progress')
+    arguments = parser.parse_args(arguments)
+
+    input_paths, unmatched_patterns = expand_input_patterns(arguments.inputs)
+    for pattern in unmatched_patterns:
+        print(f"No files match '{pattern}'", file=sys.stderr)
+
+    if arguments.plane is not None:
+        plane_normal, plane_offset = arguments.plane[:3], arguments.plane[3]
+    else:
+        plane_normal, plane_offset = waterplane(arguments.draft, arguments.heel, arguments.trim)
+
+    try:
+        results = run_batch(input_paths, arguments.output_dir, arguments.format, arguments.compression, plane_normal, plane_offset,
+                            max(1, arguments.workers), arguments.preview, arguments.force, None if arguments.quiet else _print_progress,
+                            arguments.cache_dir, arguments.cache_max_bytes, arguments.tolerance, common_input_root(input_paths))
+    except ValueError as error:
+        print(f'Nothing processed: {error}', file=sys.stderr)
+        return(1)
+
+    status_counts = {status: sum(result['status'] == status for result in results) for status in ['done', 'skipped', 'failed']}
+    print(f"{len(results)} files: {status_counts['done']} done, {status_counts['skipped']} skipped, {status_counts['failed']} failed")
+
+    return(1 if status_counts['failed'] or unmatched_patterns else 0)
+
+
+if __name__ == '__main__':
+
+    sys.exit(main())
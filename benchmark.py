@@ -0,0 +1,206 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from utils import read_in_json_file, save_json_file, weld_polygon_vertices
+from quadrilateral_manipulation import split_up_quadrilateral_data
+from quadrilateral_slicing import split_up_quadrilateral_data_vectorised
+from synthetic_meshes import SHAPES, generate_synthetic_mesh, waterline_crossing_ratio
+
+
+SPLIT_ENGINES = {'vectorised': split_up_quadrilateral_data_vectorised, 'sympy': split_up_quadrilateral_data}
+STAGES = ['read_in_json_file', 'split_up_quadrilateral_data', 'weld_polygon_vertices', 'save_json_file']
+
+#The entry points whose start up time is measured, and the heavy dependencies they should only import when plotting or using SymPy
+IMPORT_BENCHMARK_MODULES = ['main', 'batch_runner', 'utils', 'quadrilateral_manipulation', 'parallel_splitting']
+HEAVY_MODULES = ['matplotlib', 'sympy']
+
+
+def measure_stage(function, repeats):
+
+    """
+    Times a function (best of 'repeats' runs) and measures its peak traced memory (in one further run, as tracing slows it down).
+
+    Args:
+        function (callable): The stage to be measured, called with no arguments.
+        repeats (int): The number of timed runs.
+
+    Returns:
+        result: The return value of the function.
+        seconds (float): The fastest wall clock time of the timed runs.
+        peak_memory_bytes (int): The peak memory allocated by Python (and NumPy) during the traced run.
+
+    Raises:
+        None
+    """
+
+    seconds = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        seconds = min(seconds, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        function()
+        peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return(result, seconds, peak_memory_bytes)
+
+
+def benchmark_mesh(quadrilateral_position_dict, engine='vectorised', repeats=3):
+
+    """
+    Runs the full split pipeline on one mesh, measuring each stage separately: reading the json file, splitting, welding the
+    polygons into the output 'p'/'q' data ('weld_polygon_vertices', the bulk of 'create_new_files'), and saving the two json files.
+
+    Args:
+        quadrilateral_position_dict (dict): The mesh, with 'p' and 'q' as lists or arrays.
+        engine (str): The splitting engine, one of 'SPLIT_ENGINES'.
+        repeats (int): The number of timed runs per stage.
+
+    Returns:
+        stage_results (list): One dict per stage, with keys 'stage', 'seconds', 'panels_per_second' and 'peak_memory_bytes'.
+
+    Raises:
+        ValueError: If 'engine' is not one of 'SPLIT_ENGINES'.
+    """
+
+    if engine not in SPLIT_ENGINES:
+        raise ValueError(f"'engine' argument must be one of {list(SPLIT_ENGINES)}")
+
+    panel_count = len(quadrilateral_position_dict['q'])
+    measurements = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        input_filename = os.path.join(directory, 'mesh.json')
+        with open(input_filename, 'w') as f:
+            json.dump({'q': np.asarray(quadrilateral_position_dict['q']).tolist(), 'p': np.asarray(quadrilateral_position_dict['p']).tolist()}, f)
+
+        loaded_dict, *measurement = measure_stage(lambda: read_in_json_file(input_filename), repeats)
+        measurements.append(measurement)
+
+        (dry, wet), *measurement = measure_stage(lambda: SPLIT_ENGINES[engine](loaded_dict), repeats)
+        measurements.append(measurement)
+
+        output_dicts, *measurement = measure_stage(lambda: [dict(zip(['q', 'p'], weld_polygon_vertices(data_set))) for data_set in [dry, wet]], repeats)
+        measurements.append(measurement)
+
+        output_filenames = [f'benchmark_{os.getpid()}_dry', f'benchmark_{os.getpid()}_wet']
+        try:
+            _, *measurement = measure_stage(lambda: [save_json_file(filename, output_dict) for filename, output_dict in zip(output_filenames, output_dicts)], repeats)
+            measurements.append(measurement)
+        finally:
+            for filename in output_filenames:
+                if os.path.exists(f'resulting_files/{filename}.json'):
+                    os.remove(f'resulting_files/{filename}.json')
+
+    return([{'stage': stage, 'seconds': seconds, 'panels_per_second': panel_count / seconds if seconds > 0 else float('inf'), 'peak_memory_bytes': peak_memory_bytes}
+            for stage, (seconds, peak_memory_bytes) in zip(STAGES, measurements)])
+
+
+def measure_import_time(module_name, repeats=3):
+
+    """
+    Times importing a module in a fresh interpreter (best of 'repeats'), as paid by every run and every worker process at start up,
+    and notes which of 'HEAVY_MODULES' the import pulled in.
+
+    Args:
+        module_name (str): The module to be imported, e.g. 'main'.
+        repeats (int): The number of fresh interpreters to time.
+
+    Returns:
+        result (dict): 'module', 'seconds' (the fastest import) and 'heavy_modules_loaded' (a list of 'HEAVY_MODULES').
+
+    Raises:
+        subprocess.CalledProcessError: If the module cannot be imported.
+    """
+
+    script = (f"import sys, time; start = time.perf_counter(); import {module_name}; seconds = time.perf_counter() - start; "
+              f"print(seconds, *[name for name in {HEAVY_MODULES!r} if name in sys.modules])")
+
+    seconds = float('inf')
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, '-c', script], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True).stdout.split()
+        seconds = min(seconds, float(output[0]))
+
+    return({'module': module_name, 'seconds': seconds, 'heavy_modules_loaded': output[1:]})
+
+
+def run_benchmarks(shapes, panel_counts, crossing_ratios, engines=('vectorised',), repeats=3):
+
+    """
+    Benchmarks every combination of synthetic mesh shape, size, waterline crossing ratio and splitting engine.
+
+    Args:
+        shapes (list): Shapes from 'SHAPES'.
+        panel_counts (list): Approximate numbers of quadrilaterals.
+        crossing_ratios (list): Fractions of quadrilaterals crossing z=0.
+        engines (list): Engines from 'SPLIT_ENGINES'.
+        repeats (int): The number of timed runs per stage.
+
+    Returns:
+        report (dict): 'environment' (versions and platform) and 'results' (one flat dict per mesh, engine and stage), ready to be
+            saved as json and compared across versions.
+
+    Raises:
+        None
+    """
+
+    results = []
+
+    for shape in shapes:
+        for panel_count in panel_counts:
+            for crossing_ratio in crossing_ratios:
+                quadrilateral_position_dict = generate_synthetic_mesh(shape, panel_count, crossing_ratio)
+                mesh_description = {'shape': shape, 'panel_count': len(quadrilateral_position_dict['q']), 'point_count': len(quadrilateral_position_dict['p']),
+                                    'crossing_ratio': waterline_crossing_ratio(quadrilateral_position_dict)}
+
+                for engine in engines:
+                    for stage_result in benchmark_mesh(quadrilateral_position_dict, engine, repeats):
+                        results.append({**mesh_description, 'engine': engine, **stage_result})
+
+    environment = {'python': platform.python_version(), 'numpy': np.__version__, 'platform': platform.platform(),
+                   'processor': platform.processor(), 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+    return({'environment': environment, 'results': results})
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Benchmark the dry/wet split pipeline on synthetic panel meshes.')
+    parser.add_argument('--shapes', nargs='+', default=SHAPES, choices=SHAPES)
+    parser.add_argument('--panels', nargs='+', type=int, default=[1000, 10000, 100000], help='approximate quadrilateral counts')
+    parser.add_argument('--crossing-ratios', nargs='+', type=float, default=[0.05], help='fractions of quadrilaterals crossing z=0')
+    parser.add_argument('--engines', nargs='+', default=['vectorised'], choices=list(SPLIT_ENGINES))
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--output', default='benchmark_results.json', help='path of the json report')
+    parser.add_argument('--imports', action='store_true', help='measure the start up (import) time of the entry points instead')
+    arguments = parser.parse_args()
+
+    if arguments.imports:
+        for result in [measure_import_time(module_name, arguments.repeats) for module_name in IMPORT_BENCHMARK_MODULES]:
+            print(f"{result['module']:>28} {result['seconds'] * 1000:>8.1f}ms  heavy modules loaded: {', '.join(result['heavy_modules_loaded']) or 'none'}")
+        return
+
+    report = run_benchmarks(arguments.shapes, arguments.panels, arguments.crossing_ratios, arguments.engines, arguments.repeats)
+
+    with open(arguments.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    for result in report['results']:
+        print(f"{result['shape']:>12} {result['panel_count']:>9} {result['crossing_ratio']:>6.3f} {result['engine']:>10} {result['stage']:>28}"
+              f" {result['seconds']:>10.4f}s {result['panels_per_second']:>14.0f}/s {result['peak_memory_bytes'] / 1e6:>9.1f}MB")
+
+
+if __name__ == '__main__':
+
+    main()
@@ -0,0 +1,240 @@
+import numpy as np
+from quadrilateral_slicing import (_check_points_and_quads, _check_quadrilateral_position_dict, _masks_and_crossings, _apply_split_tables, padded_polygons_to_lists,
+                                   _quadrilateral_position_arrays)
+
+
+#A wet polygon traced in the quadrilateral's own corner order has at most 6 corners (the two wet corners and four crossings of a saddle)
+MAX_ORIENTED_CORNERS = 6
+
+
+def _build_oriented_wet_tables():
+
+    """
+    Builds the lookup tables that trace the wet part of a quadrilateral in the quadrilateral's own corner order, so that it keeps the
+    quadrilateral's orientation (the split tables in 'quadrilateral_slicing.py' follow the SymPy engine's direction instead, which is
+    not consistently oriented). Entries use the same numbering as the split tables: 0-3 for corners, 4-7 for the crossing point on
+    edge (i, i+1), and -1 for padding. Walking the corners, a crossing directly followed by another crossing skipped over
+    dry corners, so the segment between them lies on the cutting plane (the cut edge).
+
+    Args:
+        None
+
+    Returns:
+        wet_table (np.ndarray): (16, 6) int array, the oriented wet polygon for each mask.
+        wet_counts (np.ndarray): (16,) int array, the number of corners in each oriented wet polygon.
+        cut_segments (np.ndarray): (16, 2, 2) int array, the (start, end) entries of up to two cut edges, in the wet polygon's direction.
+
+    Raises:
+        None
+    """
+
+    wet_table = np.full((16, MAX_ORIENTED_CORNERS), -1, dtype=np.int64)
+    wet_counts = np.zeros(16, dtype=np.int64)
+    cut_segments = np.full((16, 2, 2), -1, dtype=np.int64)
+
+    for mask in range(16):
+
+        wet = []
+        for i in range(4):
+            if mask & (1 << i):
+                wet.append(i)
+            if bool(mask & (1 << i)) != bool(mask & (1 << ((i + 1) % 4))):
+                wet.append(4 + i)
+
+        segments = [(a, b) for a, b in zip(wet, wet[1:] + wet[:1]) if a >= 4 and b >= 4 and len(wet) > 2]
+
+        wet_table[mask, :len(wet)] = wet
+        wet_counts[mask] = len(wet)
+        cut_segments[mask, :len(segments)] = np.reshape(segments, (-1, 2))
+
+    return(wet_table, wet_counts, cut_segments)
+
+
+ORIENTED_WET_TABLE, ORIENTED_WET_COUNTS, CUT_SEGMENT_TABLE = _build_oriented_wet_tables()
+
+
+def _plane_basis(plane_normal):
+
+    """
+    Builds a right-handed orthonormal basis (u, v, n) with n the plane normal. For the level plane n = z this is simply (x, y, z).
+
+    Args:
+        plane_normal (np.ndarray): (3,) unit normal.
+
+    Returns:
+        u (np.ndarray): (3,) unit vector in the plane.
+        v (np.ndarray): (3,) unit vector in the plane, with u x v = n.
+
+    Raises:
+        None
+    """
+
+    reference = np.array([0.0, 1.0, 0.0]) if abs(plane_normal[1]) < 0.9 else np.array([0.0, 0.0, 1.0])
+    u = np.cross(reference, plane_normal)
+    u /= np.linalg.norm(u)
+
+    return(u, np.cross(plane_normal, u))
+
+
+def _hydrostatic_integrals(quad_xyz_coordinates, masks, mixed, corners_and_crossings, plane_normal, plane_offset, per_panel=False):
+
+    """
+    Integrates the wet part of gathered quadrilaterals, reusing the classification and crossing points of the split.
+
+    The displaced volume comes from the divergence theorem, as the sum of the signed tetrahedra joining a point on the plane to each
+    wet triangle (the waterplane itself adds nothing, being coplanar with that point), and the centre of buoyancy from the tetrahedra's
+    centroids. The waterplane is never built: its area, first and second moments come from Green's theorem along the cut edges,
+    which bound it. Both assume the wet surface, closed by the waterplane, is a closed surface with outward facing quadrilaterals
+    (corners anticlockwise seen from outside); with inward facing quadrilaterals the volume and waterplane area change sign.
+
+    Args:
+        quad_xyz_coordinates (np.ndarray): (N, 4, 3) array of corner positions.
+        masks, mixed, corners_and_crossings: As returned by '_masks_and_crossings'.
+        plane_normal (np.ndarray): (3,) unit normal of the cutting plane, pointing to the dry side.
+        plane_offset (float): Offset of the cutting plane along its normal, the plane being n.x = offset.
+        per_panel (bool): If True, also return each quadrilateral's contributions.
+
+    Returns:
+        hydrostatics (dict): The summary of the run, see 'slice_quadrilateral_arrays_with_hydrostatics'.
+
+    Raises:
+        None
+    """
+
+    origin = plane_normal * plane_offset #A point on the plane
+    u, v = _plane_basis(plane_normal)
+
+    #Corners and crossings of every quadrilateral with a wet part, relative to the origin
+    wet = masks != 0
+    all_corners = np.zeros((len(quad_xyz_coordinates), 8, 3))
+    all_corners[:, :4] = quad_xyz_coordinates
+    all_corners[mixed] = corners_and_crossings
+    wet_corners = all_corners[wet] - origin
+    wet_masks = masks[wet]
+
+    #Fan triangulate each oriented wet polygon from its first corner
+    recipe = ORIENTED_WET_TABLE[wet_masks]
+    polygons = np.take_along_axis(wet_corners, np.maximum(recipe, 0)[..., None], axis=1)
+    triangle_used = np.arange(1, MAX_ORIENTED_CORNERS - 1) < (ORIENTED_WET_COUNTS[wet_masks] - 1)[:, None]
+    first, second, third = polygons[:, :1], polygons[:, 1:-1], polygons[:, 2:]
+
+    triangle_areas = np.where(triangle_used[..., None], 0.5 * np.cross(second - first, third - first), 0.0)
+    tetrahedron_volumes = np.where(triangle_used, np.einsum('nti,nti->nt', first, np.cross(second, third)) / 6, 0.0)
+    tetrahedron_moments = tetrahedron_volumes[..., None] * (first + second + third) / 4 #Relative to the origin, which is a vertex
+
+    wetted_areas = np.linalg.norm(triangle_areas, axis=2).sum(axis=1)
+    volumes = tetrahedron_volumes.sum(axis=1)
+    volume_moments = tetrahedron_moments.sum(axis=1)
+
+    #Green's theorem along the cut edges, walked backwards (the waterplane faces the dry side, the wet surface away from it)
+    segments = CUT_SEGMENT_TABLE[wet_masks]
+    segment_used = segments[..., 0] >= 0
+    segment_starts = np.take_along_axis(wet_corners, np.maximum(segments[..., 1], 0)[..., None], axis=1)
+    segment_ends = np.take_along_axis(wet_corners, np.maximum(segments[..., 0], 0)[..., None], axis=1)
+    u1, v1, u2, v2 = segment_starts @ u, segment_starts @ v, segment_ends @ u, segment_ends @ v
+    cross = np.where(segment_used, u1 * v2 - u2 * v1, 0.0)
+
+    waterplane_areas = (cross / 2).sum(axis=1)
+    waterplane_first_moments = np.stack([((u1 + u2) * cross / 6).sum(axis=1), ((v1 + v2) * cross / 6).sum(axis=1)], axis=1)
+    waterplane_second_moments = np.stack([((v1 * v1 + v1 * v2 + v2 * v2) * cross / 12).sum(axis=1), #About the u axis
+                                          ((u1 * u1 + u1 * u2 + u2 * u2) * cross / 12).sum(axis=1), #About the v axis
+                                          ((u1 * v2 + 2 * u1 * v1 + 2 * u2 * v2 + u2 * v1) * cross / 24).sum(axis=1)], axis=1) #Product
+
+    #Summaries of the run
+    displaced_volume = float(volumes.sum())
+    waterplane_area = float(waterplane_areas.sum())
+    first_moment = waterplane_first_moments.sum(axis=0)
+    second_moments = waterplane_second_moments.sum(axis=0)
+
+    hydrostatics = {'wetted_area': float(wetted_areas.sum()), 'displaced_volume': displaced_volume, 'centre_of_buoyancy': None,
+                    'waterplane_area': waterplane_area, 'centre_of_flotation': None, 'waterplane_second_moments': None}
+
+    if displaced_volume != 0:
+        hydrostatics['centre_of_buoyancy'] = (origin + volume_moments.sum(axis=0) / displaced_volume).tolist()
+
+    if waterplane_area != 0:
+        centre_u, centre_v = first_moment / waterplane_area
+        hydrostatics['centre_of_flotation'] = (origin + centre_u * u + centre_v * v).tolist()
+        #Parallel axis theorem, moving the second moments to axes through the centre of flotation
+        hydrostatics['waterplane_second_moments'] = [float(second_moments[0] - waterplane_area * centre_v ** 2), float(second_moments[1] - waterplane_area * centre_u ** 2),
+                                                     float(second_moments[2] - waterplane_area * centre_u * centre_v)]
+
+    if per_panel:
+        hydrostatics['per_panel'] = {}
+        for name, values in [('wetted_area', wetted_areas), ('displaced_volume', volumes), ('waterplane_area', waterplane_areas)]:
+            hydrostatics['per_panel'][name] = np.zeros(len(quad_xyz_coordinates))
+            hydrostatics['per_panel'][name][wet] = values
+
+    return(hydrostatics)
+
+
+def slice_quadrilateral_arrays_with_hydrostatics(points, quads, plane_normal=(0.0, 0.0, 1.0), plane_offset=0.0, per_panel=False):
+
+    """
+    Splits a mesh with the vectorised engine and, in the same pass, integrates its wet part: wetted area, displaced volume, centre of
+    buoyancy, waterplane area, centre of flotation and waterplane second moments. The classification and crossing points computed for
+    the split are reused, so the integrals need no second traversal of the wet polygons and no list-of-lists data.
+
+    Args:
+        points (np.ndarray): (V, 3) array of positions in 3D space (the 'p' data).
+        quads (np.ndarray): (N, 4) int array of indices into 'points' (the 'q' data), facing outwards.
+        plane_normal (tuple): Normal of the cutting plane, pointing to the dry side.
+        plane_offset (float): Offset of the cutting plane along its normal, the plane being n.x = offset.
+        per_panel (bool): If True, the hydrostatics also hold 'per_panel', a dict of (N,) arrays of each quadrilateral's 'wetted_area',
+            'displaced_volume' and 'waterplane_area' contributions.
+
+    Returns:
+        dry_polygons, dry_counts, wet_polygons, wet_counts: As returned by 'slice_quadrilateral_arrays'.
+        hydrostatics (dict): 'wetted_area', 'displaced_volume' and 'waterplane_area' (floats), 'centre_of_buoyancy' and
+            'centre_of_flotation' (3D positions, None if the volume or area is zero), and 'waterplane_second_moments' ([I_uu, I_vv, I_uv]
+            about axes through the centre of flotation, where u and v are x and y for a level plane; None if the area is zero).
+
+    Raises:
+        ValueError: If 'points' is not of shape (V, 3), or 'quads' is not of shape (N, 4).
+        ValueError: If 'plane_normal' is zero.
+    """
+
+    points, quads = _check_points_and_quads(points, quads)
+
+    plane_normal = np.asarray(plane_normal, dtype=np.float64)
+    if not np.any(plane_normal):
+        raise ValueError("'plane_normal' argument must not be zero")
+    plane_normal = plane_normal / np.linalg.norm(plane_normal)
+
+    quad_xyz_coordinates = points[quads]
+    masks, mixed, corners_and_crossings = _masks_and_crossings(quad_xyz_coordinates, (points @ plane_normal - plane_offset)[quads])
+
+    split = _apply_split_tables(quad_xyz_coordinates, masks, mixed, corners_and_crossings)
+    hydrostatics = _hydrostatic_integrals(quad_xyz_coordinates, masks, mixed, corners_and_crossings, plane_normal, float(plane_offset), per_panel)
+
+    return(*split, hydrostatics)
+
+
+def split_up_quadrilateral_data_with_hydrostatics(quadrilateral_position_dict, plane_normal=(0.0, 0.0, 1.0), plane_offset=0.0, per_panel=False):
+
+    """
+    'split_up_quadrilateral_data_vectorised' that also returns the hydrostatics of the wet part (see
+    'slice_quadrilateral_arrays_with_hydrostatics').
+
+    Args:
+        quadrilateral_position_dict (dict): The given json file, the primary source of all data.
+        plane_normal (tuple): Normal of the cutting plane, pointing to the dry side.
+        plane_offset (float): Offset of the cutting plane along its normal, the plane being n.x = offset.
+        per_panel (bool): If True, the hydrostatics also hold per quadrilateral arrays.
+
+    Returns:
+        dry_quadrilateral_xyz_positions (list): All 3D coordinates for the 2D shapes existing above the plane.
+        wet_quadrilateral_xyz_positions (list): All 3D coordinates for the 2D shapes existing below the plane.
+        hydrostatics (dict): The integrals of the wet part.
+
+    Raises:
+        TypeError: If 'quadrilateral_position_dict' is not a dict
+        KeyError: If 'p' or 'q' does not exist in 'quadrilateral_position_dict'
+    """
+
+    _check_quadrilateral_position_dict(quadrilateral_position_dict)
+
+    dry_polygons, dry_counts, wet_polygons, wet_counts, hydrostatics = slice_quadrilateral_arrays_with_hydrostatics(*_quadrilateral_position_arrays(quadrilateral_position_dict),
+                                                                                                                  plane_normal, plane_offset, per_panel)
+
+    return(padded_polygons_to_lists(dry_polygons, dry_counts), padded_polygons_to_lists(wet_polygons, wet_counts), hydrostatics)
@@ -0,0 +1,176 @@
+import numpy as np
+from quadrilateral_slicing import _check_points_and_quads, _slice_gathered_quadrilaterals, plane_signed_distances, padded_polygons_to_lists
+
+
+class IncrementalSplitter:
+
+    """
+    Keeps the split of a mesh with fixed 'q' connectivity, and patches it in place as the mesh moves (e.g. every step of a time
+    domain simulation), re-splitting only the quadrilaterals that need it:
+    -   'update_points' takes new positions for the points. Only quadrilaterals with a corner that moved are re-split.
+    -   'update_pose' takes a rigid-body pose (rotation + translation) of the mesh relative to its original position. Instead of
+        moving every point, the cutting plane is moved into the mesh's own frame, so only the quadrilaterals whose sign pattern
+        changed, or which straddle the plane, are re-split. The results are then in the mesh's own frame; 'world_points' maps them
+        into the world frame.
+
+    The current split is held in 'dry_polygons', 'dry_counts', 'wet_polygons' and 'wet_counts', in the zero padded format of
+    'slice_quadrilateral_arrays', and 'as_lists' gives it in the nested list format used throughout the project.
+
+    Args:
+        points (np.ndarray): (V, 3) array of positions in 3D space (the 'p' data).
+        quads (np.ndarray): (N, 4) int array of indices into 'points' (the 'q' data).
+        plane_normal (tuple): Normal of the cutting plane in the world frame, pointing to the dry side.
+        plane_offset (float): Offset of the cutting plane along its normal, the plane being n.x = offset.
+
+    Raises:
+        ValueError: If 'points' is not of shape (V, 3), or 'quads' is not of shape (N, 4).
+    """
+
+    def __init__(self, points, quads, plane_normal=(0.0, 0.0, 1.0), plane_offset=0.0):
+
+        points, self.quads = _check_points_and_quads(points, quads)
+        self.points = points.copy()
+        self.plane_normal = np.asarray(plane_normal, dtype=np.float64) / np.linalg.norm(plane_normal)
+        self.plane_offset = float(plane_offset)
+        self.rotation = np.eye(3)
+        self.translation = np.zeros(3)
+
+        self.signed_distances = plane_signed_distances(self.points, self.plane_normal, self.plane_offset)[0]
+        self.masks = self._masks()
+        self.dry_polygons, self.dry_counts, self.wet_polygons, self.wet_counts = _slice_gathered_quadrilaterals(self.points[self.quads], self.signed_distances[self.quads])
+
+    def _masks(self):
+
+        #The 4-bit sign pattern of every quadrilateral (see '_build_split_tables' in 'quadrilateral_slicing.py')
+        return(((self.signed_distances[self.quads] < 0) * np.array([1, 2, 4, 8])).sum(axis=1))
+
+    def _resplit(self, dirty):
+
+        """
+        Re-splits the quadrilaterals flagged in 'dirty' and patches their results in place.
+
+        Args:
+            dirty (np.ndarray): (N,) bool array of the quadrilaterals to re-split.
+
+        Returns:
+            resplit_count (int): The number of quadrilaterals re-split.
+
+        Raises:
+            None
+        """
+
+        dirty_quads = self.quads[dirty]
+        dry_polygons, dry_counts, wet_polygons, wet_counts = _slice_gathered_quadrilaterals(self.points[dirty_quads], self.signed_distances[dirty_quads])
+
+        self.dry_polygons[dirty], self.dry_counts[dirty] = dry_polygons, dry_counts
+        self.wet_polygons[dirty], self.wet_counts[dirty] = wet_polygons, wet_counts
+
+        return(len(dirty_quads))
+
+    def update_points(self, points):
+
+        """
+        Moves the mesh's points to new positions and re-splits the quadrilaterals with a corner that moved.
+
+        Args:
+            points (np.ndarray): (V, 3) array of the new positions, in the mesh's own frame.
+
+        Returns:
+            resplit_count (int): The number of quadrilaterals re-split.
+
+        Raises:
+            ValueError: If 'points' does not have the same shape as the original points.
+        """
+
+        points = np.asarray(points, dtype=np.float64)
+        if points.shape != self.points.shape:
+            raise ValueError("'points' argument must have the same shape as the original points")
+
+        moved = np.any(points != self.points, axis=1)
+        self.points[moved] = points[moved]
+
+        normal, offset = self._body_frame_plane()
+        self.signed_distances[moved] = self.points[moved] @ normal - offset
+        self.masks = self._masks()
+
+        return(self._resplit(np.any(moved[self.quads], axis=1)))
+
+    def update_pose(self, rotation=None, translation=None):
+
+        """
+        Sets the rigid-body pose of the mesh, world = rotation @ point + translation, relative to its original position. The cutting
+        plane is moved into the mesh's frame rather than every point into the world frame, so only the quadrilaterals whose sign
+        pattern changed, or which straddle the plane (their cut moves with it), are re-split.
+
+        Args:
+            rotation (np.ndarray): (3, 3) rotation matrix. Defaults to no rotation.
+            translation (np.ndarray): (3,) translation. Defaults to no translation.
+
+        Returns:
+            resplit_count (int): The number of quadrilaterals re-split.
+
+        Raises:
+            ValueError: If 'rotation' is not (3, 3) or 'translation' is not (3,).
+        """
+
+        rotation = np.eye(3) if rotation is None else np.asarray(rotation, dtype=np.float64)
+        translation = np.zeros(3) if translation is None else np.asarray(translation, dtype=np.float64)
+
+        if rotation.shape != (3, 3):
+            raise ValueError("'rotation' argument must be of shape (3, 3)")
+        elif translation.shape != (3,):
+            raise ValueError("'translation' argument must be of shape (3,)")
+
+        self.rotation, self.translation = rotation, translation
+
+        previous_masks = self.masks
+        normal, offset = self._body_frame_plane()
+        self.signed_distances = self.points @ normal - offset
+        self.masks = self._masks()
+
+        dirty = (self.masks != previous_masks) | ((self.masks != 0) & (self.masks != 15))
+
+        return(self._resplit(dirty))
+
+    def _body_frame_plane(self):
+
+        #The plane n.x = d in the world frame is (R^T n).b = d - n.t in the mesh's frame, where x = R b + t
+        return(self.rotation.T @ self.plane_normal, self.plane_offset - self.plane_normal @ self.translation)
+
+    def world_points(self, points):
+
+        """
+        Maps positions from the mesh's own frame into the world frame, using the current pose.
+
+        Args:
+            points (np.ndarray): (..., 3) array of positions, e.g. 'dry_polygons'.
+
+        Returns:
+            world_points (np.ndarray): (..., 3) array of the same positions in the world frame.
+
+        Raises:
+            None
+        """
+
+        return(np.asarray(points) @ self.rotation.T + self.translation)
+
+    def as_lists(self, world_frame=False):
+
+        """
+        The current split in the nested list format used throughout the project.
+
+        Args:
+            world_frame (bool): If True the positions are given in the world frame, otherwise in the mesh's own frame.
+
+        Returns:
+            dry_quadrilateral_xyz_positions (list): All 3D coordinates for the 2D shapes existing above the plane.
+            wet_quadrilateral_xyz_positions (list): All 3D coordinates for the 2D shapes existing below the plane.
+
+        Raises:
+            None
+        """
+
+        dry_polygons = self.world_points(self.dry_polygons) if world_frame else self.dry_polygons
+        wet_polygons = self.world_points(self.wet_polygons) if world_frame else self.wet_polygons
+
+        return(padded_polygons_to_lists(dry_polygons, self.dry_counts), padded_polygons_to_lists(wet_polygons, self.wet_counts))
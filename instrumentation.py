@@ -0,0 +1,235 @@
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+import numpy as np
+
+try:
+    import resource
+except ImportError: #Not available on Windows, where the maximum resident set size is not sampled
+    resource = None
+
+
+class Instrumentation:
+
+    """
+    Collects timers, counters and memory samples for the stages of a run (e.g. read, split, write, plot), and reports them as a
+    structured dict or json trace file. Functions that accept an 'instrumentation' argument add their counters to it when given one,
+    and do no extra work when it is None.
+
+    Args:
+        track_memory (bool): If True, the peak memory allocated within each stage is traced with 'tracemalloc'. This slows the run
+            down, so is off by default; the process's maximum resident set size is always sampled. Stages may be nested: tracing is
+            started and stopped by the outermost one, and each stage reports its peak above the memory already allocated when it began.
+    """
+
+    def __init__(self, track_memory=False):
+
+        self.track_memory = track_memory
+        self.stages = []
+        self.counters = {}
+        self._start = time.perf_counter()
+        self._memory_frames = [] #[memory allocated at entry, peak so far] for each open stage, innermost last
+        self._stop_tracing = False
+
+    @contextmanager
+    def stage(self, name):
+
+        """
+        Context manager timing the code within it as a stage named 'name'.
+
+        Args:
+            name (str): The name of the stage, e.g. 'read_in_json_file'.
+
+        Yields:
+            None
+
+        Raises:
+            None
+        """
+
+        if self.track_memory:
+            self._enter_memory_frame()
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            stage_record = {'name': name, 'start_seconds': start - self._start, 'seconds': time.perf_counter() - start, 'max_rss_bytes': _max_rss_bytes()}
+            if self.track_memory:
+                stage_record['peak_memory_bytes'] = self._exit_memory_frame()
+            self.stages.append(stage_record)
+
+    def _enter_memory_frame(self):
+
+        """
+        Starts tracing memory for a stage. The outermost stage starts 'tracemalloc' (unless something else already has), while a nested
+        stage first folds the peak so far into its parent's, and then resets the peak so that its own can be measured.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+
+        if not self._memory_frames and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._stop_tracing = True
+        elif self._memory_frames:
+            parent_frame = self._memory_frames[-1]
+            parent_frame[1] = max(parent_frame[1], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+
+        current = tracemalloc.get_traced_memory()[0]
+        self._memory_frames.append([current, current])
+
+    def _exit_memory_frame(self):
+
+        """
+        Stops tracing memory for a stage, passing its peak on to its parent, and stops 'tracemalloc' after the outermost stage if it
+        was started by '_enter_memory_frame'.
+
+        Args:
+            None
+
+        Returns:
+            peak_memory_bytes (int): The peak memory allocated during the stage, above that allocated when it began.
+
+        Raises:
+            None
+        """
+
+        entry_memory, peak = self._memory_frames.pop()
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        if self._memory_frames:
+            self._memory_frames[-1][1] = max(self._memory_frames[-1][1], peak)
+        elif self._stop_tracing:
+            tracemalloc.stop()
+            self._stop_tracing = False
+
+        return(peak - entry_memory)
+
+    def count(self, name, amount=1):
+
+        """
+        Adds 'amount' to the counter named 'name'.
+
+        Args:
+            name (str): The name of the counter, e.g. 'quadrilaterals_mixed'.
+            amount (int): The amount to add.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+
+        self.counters[name] = self.counters.get(name, 0) + int(amount)
+
+    def report(self):
+
+        """
+        Summarises everything recorded so far.
+
+        Args:
+            None
+
+        Returns:
+            report (dict): 'total_seconds', 'stages' (in the order they finished) and 'counters'.
+
+        Raises:
+            None
+        """
+
+        return({'total_seconds': time.perf_counter() - self._start, 'stages': list(self.stages), 'counters': dict(sorted(self.counters.items()))})
+
+    def save_report(self, filename):
+
+        """
+        Save the report as a json trace file.
+
+        Args:
+            filename (str): The path of the file to be saved.
+
+        Returns:
+            None
+
+        Raises:
+            TypeError: If 'filename' is not a string
+        """
+
+        if not isinstance(filename, (str)):
+            raise TypeError("'filename' argument must be a string")
+
+        with open(filename, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+
+@contextmanager
+def instrumented_stage(instrumentation, name):
+
+    """
+    Times the code within it as a stage of 'instrumentation', or does nothing if 'instrumentation' is None.
+
+    Args:
+        instrumentation (Instrumentation): The instrumentation to record to, or None.
+        name (str): The name of the stage.
+
+    Yields:
+        None
+
+    Raises:
+        None
+    """
+
+    if instrumentation is None:
+        yield
+    else:
+        with instrumentation.stage(name):
+            yield
+
+
+def record_split_statistics(instrumentation, negative_number_counts, intersections_computed):
+
+    """
+    Adds the classification counters of a split to 'instrumentation': the number of dry, wet and mixed quadrilaterals, the mixed
+    ones broken down by how many of their corners are negative, and the number of edge/plane intersections computed.
+
+    Args:
+        instrumentation (Instrumentation): The instrumentation to record to, or None (in which case nothing is done).
+        negative_number_counts (list): The number of negative 'z' corners (0-4) of every quadrilateral.
+        intersections_computed (int): The number of edge/plane intersections the engine computed.
+
+    Returns:
+        None
+
+    Raises:
+        None
+    """
+
+    if instrumentation is None:
+        return
+
+    quadrilaterals_by_negative_count = np.bincount(np.asarray(negative_number_counts, dtype=np.int64), minlength=5)
+
+    instrumentation.count('quadrilaterals_dry', quadrilaterals_by_negative_count[0])
+    instrumentation.count('quadrilaterals_wet', quadrilaterals_by_negative_count[4])
+    instrumentation.count('quadrilaterals_mixed', quadrilaterals_by_negative_count[1:4].sum())
+    for negative_number_count in [1, 2, 3]:
+        instrumentation.count(f'quadrilaterals_mixed_{negative_number_count}_negative', quadrilaterals_by_negative_count[negative_number_count])
+    instrumentation.count('intersections_computed', intersections_computed)
+
+
+def _max_rss_bytes():
+
+    #ru_maxrss is reported in kilobytes on Linux, and in bytes on macOS
+    if resource is None:
+        return(None)
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return(max_rss if sys.platform == 'darwin' else max_rss * 1024)
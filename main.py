@@ -1,22 +1,48 @@
+import argparse
 from utils import read_in_json_file, create_new_files, plot_dry_and_wet_data
-from quadrilateral_manipulation import split_up_quadrilateral_data
+from quadrilateral_slicing import split_up_quadrilateral_data_vectorised
+from instrumentation import Instrumentation, instrumented_stage
+from rendering import PREVIEW_MODES, save_dry_and_wet_previews
 
 
-def main():
+def main(profile_report=None, track_memory=False, headless=False, preview='full'):
+
+    #Optionally time each stage and count what the split does, saving the results to 'profile_report'
+    instrumentation = Instrumentation(track_memory) if profile_report is not None else None
 
     #Read in the given json file
-    quadrilateral_position_dict = read_in_json_file("given_information/simple_challange_data.json")
+    with instrumented_stage(instrumentation, 'read_in_json_file'):
+        quadrilateral_position_dict = read_in_json_file("given_information/simple_challange_data.json")
 
     #Split the given data in to dry (z > 0) and wet (z < 0) data 
-    dry_quadrilateral_xyz_positions, wet_quadrilateral_xyz_positions = split_up_quadrilateral_data(quadrilateral_position_dict)
+    with instrumented_stage(instrumentation, 'split_up_quadrilateral_data'):
+        dry_quadrilateral_xyz_positions, wet_quadrilateral_xyz_positions = split_up_quadrilateral_data_vectorised(quadrilateral_position_dict, instrumentation=instrumentation, polygon_soup=True)
 
     #Create two new files identical in style to the original file read in
-    create_new_files([dry_quadrilateral_xyz_positions, wet_quadrilateral_xyz_positions], ['dry_geometry', 'wet_geometry'])
+    with instrumented_stage(instrumentation, 'create_new_files'):
+        create_new_files([dry_quadrilateral_xyz_positions, wet_quadrilateral_xyz_positions], ['dry_geometry', 'wet_geometry'], instrumentation=instrumentation)
+
+    if instrumentation is not None: #Saved before plotting too, as the plots block until they are closed
+        instrumentation.save_report(profile_report)
 
-    #Plot the two resulting data sets for visual confirmation of success
-    plot_dry_and_wet_data([dry_quadrilateral_xyz_positions, wet_quadrilateral_xyz_positions], ['Dry Surface', 'Wet Surface'])
+    #Plot the two resulting data sets for visual confirmation of success (or save them as images, without opening a window)
+    with instrumented_stage(instrumentation, 'plot_dry_and_wet_data'):
+        if headless:
+            save_dry_and_wet_previews([dry_quadrilateral_xyz_positions, wet_quadrilateral_xyz_positions], ['resulting_files/dry_geometry.png', 'resulting_files/wet_geometry.png'], preview=preview)
+        else:
+            plot_dry_and_wet_data([dry_quadrilateral_xyz_positions, wet_quadrilateral_xyz_positions], ['Dry Surface', 'Wet Surface'], preview)
+
+    if instrumentation is not None:
+        instrumentation.save_report(profile_report)
 
 
 if __name__ == '__main__':
 
-    main()
+    parser = argparse.ArgumentParser(description='Split the given geometry into dry and wet geometry files.')
+    parser.add_argument('--profile', metavar='REPORT', help='save per-stage timings and split counters to this json file')
+    parser.add_argument('--track-memory', action='store_true', help='also trace the peak memory of each stage (slower)')
+    parser.add_argument('--headless', action='store_true', help='save the plots to resulting_files/*.png instead of showing them')
+    parser.add_argument('--preview', default='full', choices=PREVIEW_MODES, help='draw every polygon, or a decimated, bounding box or waterline preview')
+    arguments = parser.parse_args()
+
+    main(arguments.profile, arguments.track_memory, arguments.headless, arguments.preview)
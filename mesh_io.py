@@ -0,0 +1,348 @@
+import array
+import json
+import os
+import re
+import numpy as np
+from polygon_soup import PolygonSoup
+
+
+#Default number of characters read, or rows written, per chunk when streaming
+DEFAULT_READ_CHUNK_SIZE = 1 << 20
+DEFAULT_WRITE_CHUNK_SIZE = 1 << 16
+
+#Binary geometry files start with this magic number, followed by 4 uint64 header fields (see 'save_binary_geometry_file')
+BINARY_GEOMETRY_MAGIC = b'QPMESH01'
+BINARY_GEOMETRY_EXTENSION = '.qpb'
+_BINARY_HEADER_SIZE = len(BINARY_GEOMETRY_MAGIC) + 4 * 8
+
+#Matches either a dictionary key, e.g. "p", or an innermost list, e.g. [-3.0, 0.0, 0.1]
+_KEY_OR_ROW_PATTERN = re.compile(r'"([^"]*)"|\[([^\[\]]*)\]')
+
+
+def _iter_json_row_batches(filename, chunk_size):
+
+    """
+    Scans a json file of the form {"q": [[...], ...], "p": [[...], ...]} in chunks of 'chunk_size' characters, yielding the text of
+    its innermost lists (rows) in batches, together with the key they belong to. Only one chunk is held in memory at a time.
+
+    Args:
+        filename (str): The name of the file to be read in.
+        chunk_size (int): The number of characters read per chunk.
+
+    Yields:
+        key (str): The dictionary key the rows belong to.
+        row_texts (list): The text within each row's brackets, e.g. ['-3.0, 0.0, 0.1', '-2.9, 0.0, 0.5']. Empty when a key is first found.
+
+    Raises:
+        None
+    """
+
+    key = None
+    carry = ''
+
+    with open(filename, "r", encoding="utf-8") as f:
+        while True:
+            text = f.read(chunk_size)
+            buffer = carry + text
+
+            #Only scan up to the last closing bracket, so no row is split across two chunks
+            end = buffer.rfind(']') + 1 if text else len(buffer)
+            carry = buffer[end:]
+
+            row_texts = []
+            for match in _KEY_OR_ROW_PATTERN.finditer(buffer, 0, end):
+                if match.group(1) is not None: #A new key, so hand over the rows of the previous one
+                    if row_texts:
+                        yield(key, row_texts)
+                    key, row_texts = match.group(1), []
+                    yield(key, []) #Announce the key, even if its list turns out to be empty
+                else:
+                    row_texts.append(match.group(2))
+
+            if row_texts:
+                yield(key, row_texts)
+
+            if not text:
+                break
+
+
+def read_in_json_file_streaming(filename, chunk_size=DEFAULT_READ_CHUNK_SIZE):
+
+    """
+    Streaming equivalent of 'read_in_json_file'. Reads the 'p' and 'q' data of a json file incrementally, straight into compact
+    typed arrays, so peak memory grows with 'chunk_size' and the size of the resulting arrays, not with the size of the document.
+
+    Args:
+        filename (str): The name of the file to be read in.
+        chunk_size (int): The number of characters read per chunk.
+
+    Returns:
+        quadrilateral_position_dict (dict): 'p' as a (V, 3) float64 array, and 'q' as an (N, 4) int32 array. If the polygons in 'q'
+            do not all have 4 corners (e.g. a dry/wet output file), 'q' is instead a PolygonSoup of int32 point indices.
+
+    Raises:
+        TypeError: If 'filename' is not a string
+        TypeError: If 'chunk_size' is not an int
+        KeyError: If 'p' or 'q' does not exist in the file
+        ValueError: If a row in 'p' does not have 3 coordinates
+    """
+
+    if not isinstance(filename, (str)):
+        raise TypeError("'filename' argument must be a string")
+    elif not isinstance(chunk_size, (int)):
+        raise TypeError("'chunk_size' argument must be an int")
+
+    values = {'p': array.array('d'), 'q': array.array('i')}
+    counts = {'p': array.array('i'), 'q': array.array('i')}
+    keys_found = set()
+
+    for key, row_texts in _iter_json_row_batches(filename, chunk_size):
+
+        keys_found.add(key)
+        if key not in values or not row_texts: #Rows of any other key are skipped
+            continue
+
+        row_texts = [text for text in row_texts if text.strip()] #An empty list, e.g. the 'q' of a wholly dry or wet side, has no rows
+        if not row_texts:
+            continue
+
+        row_counts = [text.count(',') + 1 for text in row_texts]
+        row_values = np.array(','.join(row_texts).split(','), dtype=np.float64)
+
+        values[key].frombytes(row_values.astype(np.float64 if key == 'p' else np.int32).tobytes())
+        counts[key].frombytes(np.array(row_counts, dtype=np.int32).tobytes())
+
+    for key in ['q', 'p']:
+        if key not in keys_found:
+            raise KeyError(f"The key '{key}' does not exist in the file '{filename}'")
+
+    point_counts = np.frombuffer(counts['p'], dtype=np.int32)
+    if np.any(point_counts != 3):
+        raise ValueError("Every row in 'p' must have 3 coordinates")
+
+    points = np.frombuffer(values['p'], dtype=np.float64).reshape(-1, 3)
+    polygon_counts = np.frombuffer(counts['q'], dtype=np.int32)
+    polygon_indices = np.frombuffer(values['q'], dtype=np.int32)
+
+    if np.all(polygon_counts == 4):
+        quads = polygon_indices.reshape(-1, 4)
+    else:
+        quads = PolygonSoup(polygon_indices, np.concatenate([[0], np.cumsum(polygon_counts)]))
+
+    return({'q': quads, 'p': points})
+
+
+def save_json_file_streaming(filename, quadrilateral_dict_for_saving, chunk_size=DEFAULT_WRITE_CHUNK_SIZE):
+
+    """
+    Streaming equivalent of 'save_json_file'. Writes the 'q' and 'p' data 'chunk_size' rows at a time, so only one chunk is ever
+    converted to Python lists. The file written is identical to the one 'json.dump' would produce for the same data.
+
+    Args:
+        filename (str): The name of the file to be saved (without extension), saved within the 'resulting_files' folder.
+        quadrilateral_dict_for_saving (dict): 'q' as an (N, k) int array, a PolygonSoup of indices or a list of index lists/arrays, and
+            'p' as a (V, 3) array.
+        chunk_size (int): The number of rows written per chunk.
+
+    Returns:
+        None
+
+    Raises:
+        TypeError: If 'filename' is not a string
+        TypeError: If 'quadrilateral_dict_for_saving' is not a dict
+        KeyError: If 'p' or 'q' does not exist in 'quadrilateral_dict_for_saving'
+    """
+
+    if not isinstance(filename, (str)):
+        raise TypeError("'filename' argument must be a string")
+    elif not isinstance(quadrilateral_dict_for_saving, (dict)):
+        raise TypeError("'quadrilateral_dict_for_saving' argument must be a dict")
+
+    for key in ['q', 'p']:
+        if key not in quadrilateral_dict_for_saving:
+            raise KeyError(f"The key '{key}' does not exist in the dictionary 'quadrilateral_dict_for_saving'")
+
+    if not os.path.exists('resulting_files'):
+        os.makedirs('resulting_files')
+
+    with open(f'resulting_files/{filename}.json', 'w') as f:
+        write_json_rows(f, quadrilateral_dict_for_saving, chunk_size)
+
+
+def write_json_rows(f, quadrilateral_dict_for_saving, chunk_size):
+
+    """
+    Writes the 'q' and 'p' data to an open text file a chunk at a time, exactly as 'json.dump' would write them.
+
+    Args:
+        f (file): A file opened for writing text.
+        quadrilateral_dict_for_saving (dict): 'q' as an (N, k) int array, a PolygonSoup of indices or a list of index lists/arrays, and
+            'p' as a (V, 3) array or list.
+        chunk_size (int): The number of rows written per chunk.
+
+    Returns:
+        None
+
+    Raises:
+        None
+    """
+
+    for position, key in enumerate(['q', 'p']):
+        rows = quadrilateral_dict_for_saving[key]
+        f.write(('{' if position == 0 else ', ') + json.dumps(key) + ': [')
+        for start in range(0, len(rows), chunk_size):
+            if isinstance(rows, (np.ndarray, PolygonSoup)):
+                chunk = rows[start:start + chunk_size].tolist()
+            else:
+                chunk = [row if isinstance(row, list) else np.asarray(row).tolist() for row in rows[start:start + chunk_size]]
+            f.write((', ' if start else '') + json.dumps(chunk)[1:-1])
+        f.write(']')
+    f.write('}')
+
+
+def polygons_to_flat_indices(polygons):
+
+    """
+    Flattens polygons of point indices, in any of the forms used for 'q', into the layout of a PolygonSoup.
+
+    Args:
+        polygons: An (N, k) int array, a PolygonSoup of indices or a list of index lists/arrays.
+
+    Returns:
+        flat_indices (np.ndarray): (C,) int32 array of every polygon's corner indices, one polygon after the other.
+        offsets (np.ndarray): (N + 1,) int64 array, polygon i uses corners offsets[i] to offsets[i + 1].
+
+    Raises:
+        ValueError: If an index does not fit in an int32.
+    """
+
+    if isinstance(polygons, PolygonSoup):
+        flat_indices, offsets = polygons.vertices[polygons.offsets[0]:polygons.offsets[-1]], polygons.offsets - polygons.offsets[0]
+    elif isinstance(polygons, np.ndarray) and polygons.ndim == 2:
+        flat_indices, offsets = polygons.reshape(-1), np.arange(len(polygons) + 1, dtype=np.int64) * polygons.shape[1]
+    else:
+        counts = np.array([len(polygon) for polygon in polygons], dtype=np.int64)
+        flat_indices = np.concatenate([np.asarray(polygon, dtype=np.int64) for polygon in polygons]) if len(polygons) else np.zeros(0, dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+    #Indices are stored as int32, so any beyond its range are refused rather than silently wrapped around
+    int32_range = np.iinfo(np.int32)
+    if len(flat_indices) and (flat_indices.max() > int32_range.max or flat_indices.min() < int32_range.min):
+        raise ValueError("Every point index in 'q' must fit in an int32")
+
+    return(flat_indices.astype(np.int32), offsets)
+
+
+def save_binary_geometry_file(filename, quadrilateral_dict_for_saving):
+
+    """
+    Save 'p'/'q' geometry in the compact binary format, which can be opened with 'read_in_binary_geometry_file' via memory mapping.
+    The layout is a fixed size header followed by raw little-endian blocks, each aligned to its own item size:
+    -   Header: the magic number 'BINARY_GEOMETRY_MAGIC', then uint64 point count (V), polygon count (N), total corner count (C), and
+        the number of corners every polygon has (0 if the polygons differ, e.g. a dry/wet output file).
+    -   'p': V x 3 float64.
+    -   Polygon offsets: N + 1 int64, polygon i uses corners offsets[i] to offsets[i + 1].
+    -   'q': C int32 point indices.
+
+    Args:
+        filename (str): The name of the file to be saved (without extension), saved within the 'resulting_files' folder.
+        quadrilateral_dict_for_saving (dict): 'q' as an (N, k) int array, a PolygonSoup of indices or a list of index lists, and 'p' as a
+            (V, 3) array or list.
+
+    Returns:
+        None
+
+    Raises:
+        TypeError: If 'filename' is not a string
+        TypeError: If 'quadrilateral_dict_for_saving' is not a dict
+        KeyError: If 'p' or 'q' does not exist in 'quadrilateral_dict_for_saving'
+        ValueError: If a point index in 'q' does not fit in an int32.
+    """
+
+    if not isinstance(filename, (str)):
+        raise TypeError("'filename' argument must be a string")
+    elif not isinstance(quadrilateral_dict_for_saving, (dict)):
+        raise TypeError("'quadrilateral_dict_for_saving' argument must be a dict")
+
+    for key in ['q', 'p']:
+        if key not in quadrilateral_dict_for_saving:
+            raise KeyError(f"The key '{key}' does not exist in the dictionary 'quadrilateral_dict_for_saving'")
+
+    if not os.path.exists('resulting_files'):
+        os.makedirs('resulting_files')
+
+    with open(f'resulting_files/{filename}{BINARY_GEOMETRY_EXTENSION}', 'wb') as f:
+        write_binary_geometry_data(f, quadrilateral_dict_for_saving)
+
+
+def write_binary_geometry_data(f, quadrilateral_dict_for_saving):
+
+    """
+    Writes the 'q' and 'p' data to an open binary file, in the layout described in 'save_binary_geometry_file'.
+
+    Args:
+        f (file): A file opened for writing bytes.
+        quadrilateral_dict_for_saving (dict): 'q' as an (N, k) int array, a PolygonSoup of indices or a list of index lists, and 'p' as a
+            (V, 3) array or list.
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: If a point index in 'q' does not fit in an int32.
+    """
+
+    points = np.asarray(quadrilateral_dict_for_saving['p'], dtype='<f8').reshape(-1, 3)
+    flat_indices, offsets = polygons_to_flat_indices(quadrilateral_dict_for_saving['q'])
+    counts = np.diff(offsets)
+    uniform_corner_count = int(counts[0]) if len(counts) and np.all(counts == counts[0]) else 0
+
+    f.write(BINARY_GEOMETRY_MAGIC)
+    f.write(np.array([len(points), len(counts), len(flat_indices), uniform_corner_count], dtype='<u8').tobytes())
+    f.write(points.tobytes())
+    f.write(offsets.astype('<i8').tobytes())
+    f.write(flat_indices.astype('<i4').tobytes())
+
+
+def read_in_binary_geometry_file(filename):
+
+    """
+    Open a binary geometry file (see 'save_binary_geometry_file') by memory mapping it, so no data is read or copied up front; the
+    returned arrays are read-only views straight onto the file, and pages are only loaded as they are used.
+
+    Args:
+        filename (str): The name of the file to be read in.
+
+    Returns:
+        quadrilateral_position_dict (dict): 'p' as a (V, 3) float64 array, and 'q' as an (N, k) int32 array if every polygon has k
+            corners, otherwise a PolygonSoup of int32 point indices.
+
+    Raises:
+        TypeError: If 'filename' is not a string
+        ValueError: If the file is not a binary geometry file
+    """
+
+    if not isinstance(filename, (str)):
+        raise TypeError("'filename' argument must be a string")
+
+    with open(filename, 'rb') as f:
+        header = f.read(_BINARY_HEADER_SIZE)
+
+    if len(header) != _BINARY_HEADER_SIZE or not header.startswith(BINARY_GEOMETRY_MAGIC):
+        raise ValueError(f"'{filename}' is not a binary geometry file")
+
+    point_count, polygon_count, corner_count, uniform_corner_count = (int(value) for value in np.frombuffer(header, dtype='<u8', offset=len(BINARY_GEOMETRY_MAGIC)))
+
+    points_offset = _BINARY_HEADER_SIZE
+    offsets_offset = points_offset + point_count * 3 * 8
+    indices_offset = offsets_offset + (polygon_count + 1) * 8
+
+    points = np.memmap(filename, dtype='<f8', mode='r', offset=points_offset, shape=(point_count, 3)) if point_count else np.zeros((0, 3))
+    flat_indices = np.memmap(filename, dtype='<i4', mode='r', offset=indices_offset, shape=(corner_count,)) if corner_count else np.zeros(0, dtype=np.int32)
+
+    if uniform_corner_count or polygon_count == 0:
+        quads = flat_indices.reshape(-1, uniform_corner_count or 4)
+    else:
+        quads = PolygonSoup(flat_indices, np.memmap(filename, dtype='<i8', mode='r', offset=offsets_offset, shape=(polygon_count + 1,)))
+
+    return({'q': quads, 'p': points})
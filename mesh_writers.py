@@ -0,0 +1,321 @@
+import bz2
+import gzip
+import json
+import lzma
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from mesh_io import BINARY_GEOMETRY_EXTENSION, polygons_to_flat_indices, write_binary_geometry_data, write_json_rows
+from polygon_soup import PolygonSoup
+
+try:
+    import zstandard
+except ImportError: #Optional dependency, zstd compression is only offered when it is installed
+    zstandard = None
+
+
+#File extension of each output format, and of each compression (appended after the format's own extension, e.g. '.json.gz')
+FILE_EXTENSIONS = {'json': '.json', 'binary': BINARY_GEOMETRY_EXTENSION, 'stl': '.stl', 'obj': '.obj'}
+COMPRESSION_EXTENSIONS = {'gzip': '.gz', 'bz2': '.bz2', 'xz': '.xz', 'zstd': '.zst'}
+
+#Number of polygons (or points) formatted per write in the text writers
+_TEXT_CHUNK_SIZE = 1 << 16
+
+
+def _open_output(path, mode, compression):
+
+    """
+    Opens an output file for writing, through a compressed stream if 'compression' is given.
+
+    Args:
+        path (str): The path of the file.
+        mode (str): 'wt' or 'wb'.
+        compression (str): None, or one of 'COMPRESSION_EXTENSIONS'.
+
+    Returns:
+        f (file): The open file object.
+
+    Raises:
+        ValueError: If 'compression' is 'zstd' and the 'zstandard' package is not installed.
+    """
+
+    if compression is None:
+        return(open(path, mode))
+    elif compression == 'gzip':
+        return(gzip.open(path, mode))
+    elif compression == 'bz2':
+        return(bz2.open(path, mode))
+    elif compression == 'xz':
+        return(lzma.open(path, mode))
+    elif zstandard is None:
+        raise ValueError("zstd compression requires the 'zstandard' package")
+    return(zstandard.open(path, mode))
+
+
+def _fan_triangles(quadrilateral_dict):
+
+    """
+    Fan triangulates every polygon of 'p'/'q' data from its first corner, as needed by triangle-only formats such as STL.
+
+    Args:
+        quadrilateral_dict (dict): 'q' as an (N, k) int array, a PolygonSoup of indices or a list of index lists, and 'p' as a (V, 3)
+            array or list.
+
+    Returns:
+        triangles (np.ndarray): (T, 3, 3) array of triangle corner positions, in polygon order.
+
+    Raises:
+        None
+    """
+
+    points = np.asarray(quadrilateral_dict['p'], dtype=np.float64).reshape(-1, 3)
+    flat_indices, offsets = polygons_to_flat_indices(quadrilateral_dict['q'])
+
+    triangle_counts = np.maximum(np.diff(offsets) - 2, 0)
+    polygon_starts = np.repeat(offsets[:-1], triangle_counts)
+    fan_positions = np.arange(len(polygon_starts)) - np.repeat(np.cumsum(triangle_counts) - triangle_counts, triangle_counts) + 1
+
+    corner_positions = np.stack([polygon_starts, polygon_starts + fan_positions, polygon_starts + fan_positions + 1], axis=1)
+
+    return(points[flat_indices[corner_positions]])
+
+
+def write_json_geometry(f, quadrilateral_dict, chunk_size=None):
+
+    """
+    Writes 'p'/'q' data as json, exactly as 'json.dump' would write it once converted to lists. This is the one json writer, used
+    by 'write_geometry_files' and 'save_json_file' alike.
+
+    Args:
+        f (file): A file opened for writing text.
+        quadrilateral_dict (dict): 'q' and 'p' as lists, arrays or (for 'q') a PolygonSoup.
+        chunk_size (int): If given, the rows are written 'chunk_size' at a time rather than converted to lists all at once.
+
+    Returns:
+        None
+
+    Raises:
+        None
+    """
+
+    if chunk_size is None:
+        json.dump({key: value.tolist() if isinstance(value, (np.ndarray, PolygonSoup)) else value for key, value in quadrilateral_dict.items()}, f)
+    else:
+        write_json_rows(f, quadrilateral_dict, chunk_size)
+
+
+def write_binary_geometry(f, quadrilateral_dict, chunk_size=None):
+
+    """
+    Writes 'p'/'q' data in the binary geometry format (see 'save_binary_geometry_file' in 'mesh_io.py').
+
+    Args:
+        f (file): A file opened for writing bytes.
+        quadrilateral_dict (dict): 'q' and 'p' as lists, arrays or (for 'q') a PolygonSoup.
+        chunk_size (int): Unused, the blocks are written whole.
+
+    Returns:
+        None
+
+    Raises:
+        None
+    """
+
+    write_binary_geometry_data(f, quadrilateral_dict)
+
+
+def write_stl_geometry(f, quadrilateral_dict, chunk_size=None):
+
+    """
+    Writes 'p'/'q' data as a binary STL file: an 80 byte header, the uint32 triangle count, then per triangle its float32 unit normal,
+    three float32 corners and a uint16 attribute. Polygons are fan triangulated from their first corner; degenerate triangles are
+    given a zero normal.
+
+    Args:
+        f (file): A file opened for writing bytes.
+        quadrilateral_dict (dict): 'q' and 'p' as lists, arrays or (for 'q') a PolygonSoup.
+        chunk_size (int): Unused, the triangles are written in one block.
+
+    Returns:
+        None
+
+    Raises:
+        None
+    """
+
+    triangles = _fan_triangles(quadrilateral_dict)
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+
+    records = np.zeros(len(triangles), dtype=np.dtype([('normal', '<f4', (3,)), ('corners', '<f4', (3, 3)), ('attribute', '<u2')]))
+    records['normal'] = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+    records['corners'] = triangles
+
+    f.write(b'Dry/wet split geometry'.ljust(80, b' '))
+    f.write(np.array([len(records)], dtype='<u4').tobytes())
+    f.write(records.tobytes())
+
+
+def write_obj_geometry(f, quadrilateral_dict, chunk_size=None):
+
+    """
+    Writes 'p'/'q' data as a Wavefront OBJ file: a 'v x y z' line per point, then an 'f i j k ...' line (1-based) per polygon.
+    Polygons keep all of their corners, and coordinates are written with enough digits to be read back exactly.
+
+    Args:
+        f (file): A file opened for writing text.
+        quadrilateral_dict (dict): 'q' and 'p' as lists, arrays or (for 'q') a PolygonSoup.
+        chunk_size (int): The number of points or polygons formatted per write.
+
+    Returns:
+        None
+
+    Raises:
+        None
+    """
+
+    chunk_size = chunk_size or _TEXT_CHUNK_SIZE
+    points = np.asarray(quadrilateral_dict['p'], dtype=np.float64).reshape(-1, 3)
+    flat_indices, offsets = polygons_to_flat_indices(quadrilateral_dict['q'])
+
+    for start in range(0, len(points), chunk_size):
+        f.write(''.join(f'v {x!r} {y!r} {z!r}\n' for x, y, z in points[start:start + chunk_size].tolist()))
+
+    for start in range(0, len(offsets) - 1, chunk_size):
+        bounds = offsets[start:start + chunk_size + 1]
+        corners = (flat_indices[bounds[0]:bounds[-1]] + 1).tolist()
+        bounds = (bounds - bounds[0]).tolist()
+        f.write(''.join('f ' + ' '.join(map(str, corners[first:last])) + '\n' for first, last in zip(bounds[:-1], bounds[1:])))
+
+
+#Each writer, and whether it writes text ('wt') or bytes ('wb')
+GEOMETRY_WRITERS = {'json': (write_json_geometry, 'wt'), 'binary': (write_binary_geometry, 'wb'), 'stl': (write_stl_geometry, 'wb'), 'obj': (write_obj_geometry, 'wt')}
+
+
+def geometry_format_from_path(path):
+
+    """
+    Works out the output format and compression of a path from its extension(s), e.g. 'dry.json.gz' -> ('json', 'gzip').
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        file_format (str): One of 'GEOMETRY_WRITERS'.
+        compression (str): One of 'COMPRESSION_EXTENSIONS', or None.
+
+    Raises:
+        ValueError: If the extension is not recognised.
+    """
+
+    compression = None
+    for name, extension in COMPRESSION_EXTENSIONS.items():
+        if path.endswith(extension):
+            path, compression = path[:-len(extension)], name
+
+    for file_format, extension in FILE_EXTENSIONS.items():
+        if path.endswith(extension):
+            return(file_format, compression)
+
+    raise ValueError(f"Cannot tell the geometry format of '{path}' from its extension, expected one of {list(FILE_EXTENSIONS.values())}")
+
+
+def geometry_output_path(directory, filename, file_format='json', compression=None):
+
+    """
+    Builds the path of an output file from its directory, name (without extension), format and compression.
+
+    Args:
+        directory (str): The output directory.
+        filename (str): The name of the file, without extension.
+        file_format (str): One of 'GEOMETRY_WRITERS'.
+        compression (str): One of 'COMPRESSION_EXTENSIONS', or None.
+
+    Returns:
+        path (str): e.g. 'resulting_files/dry_geometry.json.gz'.
+
+    Raises:
+        ValueError: If 'file_format' or 'compression' is not recognised.
+    """
+
+    if file_format not in FILE_EXTENSIONS:
+        raise ValueError(f"'file_format' argument must be one of {list(FILE_EXTENSIONS)}")
+    elif compression is not None and compression not in COMPRESSION_EXTENSIONS:
+        raise ValueError(f"'compression' argument must be None or one of {list(COMPRESSION_EXTENSIONS)}")
+
+    return(os.path.join(directory, filename + FILE_EXTENSIONS[file_format] + (COMPRESSION_EXTENSIONS[compression] if compression else '')))
+
+
+def write_geometry_file(path, quadrilateral_dict, file_format=None, compression=None, chunk_size=None):
+
+    """
+    Writes 'p'/'q' data to 'path' with the writer for 'file_format', creating the directory if needed.
+
+    Args:
+        path (str): The path of the file to be written.
+        quadrilateral_dict (dict): 'q' and 'p' as lists, arrays or (for 'q') a PolygonSoup.
+        file_format (str): One of 'GEOMETRY_WRITERS'. If None, both the format and the compression come from the path's extension.
+        compression (str): One of 'COMPRESSION_EXTENSIONS', or None for an uncompressed file.
+        chunk_size (int): Passed to the writer, e.g. to stream json a chunk at a time.
+
+    Returns:
+        path (str): The path written.
+
+    Raises:
+        TypeError: If 'path' is not a string
+        ValueError: If the format or compression is not recognised.
+    """
+
+    if not isinstance(path, (str)):
+        raise TypeError("'path' argument must be a string")
+
+    if file_format is None:
+        file_format, compression = geometry_format_from_path(path)
+    elif file_format not in GEOMETRY_WRITERS:
+        raise ValueError(f"'file_format' argument must be one of {list(GEOMETRY_WRITERS)}")
+    elif compression is not None and compression not in COMPRESSION_EXTENSIONS:
+        raise ValueError(f"'compression' argument must be None or one of {list(COMPRESSION_EXTENSIONS)}")
+
+    writer, mode = GEOMETRY_WRITERS[file_format]
+
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with _open_output(path, mode, compression) as f:
+        writer(f, quadrilateral_dict, chunk_size)
+
+    return(path)
+
+
+def write_geometry_files(quadrilateral_dicts, paths, file_format=None, compression=None, chunk_size=None, max_workers=None):
+
+    """
+    Writes several 'p'/'q' data sets (e.g. the dry and wet outputs) concurrently on a thread pool, so that their I/O and compression
+    (both of which release the GIL) overlap rather than add up.
+
+    Args:
+        quadrilateral_dicts (list): The data sets to be written.
+        paths (list): The path of each file.
+        file_format (str): See 'write_geometry_file'.
+        compression (str): See 'write_geometry_file'.
+        chunk_size (int): See 'write_geometry_file'.
+        max_workers (int): The number of writer threads. Defaults to one per file.
+
+    Returns:
+        paths (list): The paths written.
+
+    Raises:
+        ValueError: If 'quadrilateral_dicts' and 'paths' differ in length.
+        Any error raised by 'write_geometry_file', once every write has finished.
+    """
+
+    if len(quadrilateral_dicts) != len(paths):
+        raise ValueError("'quadrilateral_dicts' and 'paths' arguments must have the same length")
+    elif not paths:
+        return([])
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(paths)) as executor:
+        futures = [executor.submit(write_geometry_file, path, quadrilateral_dict, file_format, compression, chunk_size)
+                   for path, quadrilateral_dict in zip(paths, quadrilateral_dicts)]
+
+    return([future.result() for future in futures])
@@ -0,0 +1,132 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from polygon_soup import PolygonSoup
+from quadrilateral_manipulation import split_up_quadrilateral_data
+from quadrilateral_slicing import slice_quadrilateral_arrays
+
+
+ENGINES = ['vectorised', 'sympy']
+
+#Per-worker state, set up once by '_initialise_worker' rather than sent with every task
+_worker_state = {}
+
+
+def _initialise_worker(shared_memory_name, points_shape, engine):
+
+    """
+    Runs once in each worker process. Attaches to the shared memory block holding the 'p' data, so it is never pickled per task.
+
+    Args:
+        shared_memory_name (str): The name of the shared memory block.
+        points_shape (tuple): The shape of the 'p' array, (V, 3).
+        engine (str): The splitting engine the worker will run, one of 'ENGINES'.
+
+    Returns:
+        None
+
+    Raises:
+        None
+    """
+
+    points_memory = shared_memory.SharedMemory(name=shared_memory_name)
+    _worker_state['memory'] = points_memory #Keep a reference, so the buffer outlives this function
+    _worker_state['points'] = np.ndarray(points_shape, dtype=np.float64, buffer=points_memory.buf)
+    _worker_state['engine'] = engine
+
+    if engine == 'sympy': #The SymPy engine works on lists, so each worker converts the points once
+        _worker_state['point_list'] = _worker_state['points'].tolist()
+
+
+def _split_chunk(quads_chunk):
+
+    """
+    Splits one chunk of quadrilaterals in a worker process.
+
+    Args:
+        quads_chunk (np.ndarray): (n, 4) int array of indices into the shared 'p' data.
+
+    Returns:
+        dry_soup (PolygonSoup): The dry polygons of the chunk, in order.
+        wet_soup (PolygonSoup): The wet polygons of the chunk, in order.
+
+    Raises:
+        None
+    """
+
+    #Sent back as two arrays per side rather than nested lists, whose pickling would cost more than the split itself
+    if _worker_state['engine'] == 'sympy':
+        return(tuple(PolygonSoup.from_lists(polygons) for polygons in split_up_quadrilateral_data({'q': quads_chunk.tolist(), 'p': _worker_state['point_list']})))
+
+    dry_polygons, dry_counts, wet_polygons, wet_counts = slice_quadrilateral_arrays(_worker_state['points'], quads_chunk)
+    return(PolygonSoup.from_padded(dry_polygons, dry_counts), PolygonSoup.from_padded(wet_polygons, wet_counts))
+
+
+def split_up_quadrilateral_data_parallel(quadrilateral_position_dict, workers=None, chunk_size=None, engine='vectorised', polygon_soup=False):
+
+    """
+    Parallel equivalent of 'split_up_quadrilateral_data'. The 'q' data is partitioned into chunks which are dispatched to a pool
+    of worker processes, with the 'p' data placed in shared memory once rather than pickled per task. The results are merged back
+    in the original quadrilateral order, so the output is identical to that of the serial engine. The workers send their results back
+    as PolygonSoups, which are only turned into nested lists once, here, when 'polygon_soup' is False.
+
+    Args:
+        quadrilateral_position_dict (dict): The given json file, the primary source of all data.
+        workers (int): The number of worker processes. Defaults to the number of CPUs.
+        chunk_size (int): The number of quadrilaterals per task. Defaults to splitting the data into 4 tasks per worker.
+        engine (str): 'vectorised' (see 'quadrilateral_slicing.py') or 'sympy' (see 'quadrilateral_manipulation.py').
+        polygon_soup (bool): If True, the polygons are returned as PolygonSoups instead of nested lists.
+
+    Returns:
+        dry_quadrilateral_xyz_positions (list): All 3D coordinates for the 2D shapes existing above the z=0 plane (a PolygonSoup if
+            'polygon_soup' is True).
+        wet_quadrilateral_xyz_positions (list): All 3D coordinates for the 2D shapes existing below the z=0 plane (a PolygonSoup if
+            'polygon_soup' is True).
+
+    Raises:
+        TypeError: If 'quadrilateral_position_dict' is not a dict
+        KeyError: If 'p' or 'q' does not exist in 'quadrilateral_position_dict'
+        ValueError: If 'engine' is not one of 'ENGINES'
+        ValueError: If 'workers' or 'chunk_size' is less than 1
+    """
+
+    if not isinstance(quadrilateral_position_dict, (dict)):
+        raise TypeError("'quadrilateral_position_dict' argument must be a dict")
+
+    for key in ['q', 'p']:
+        if key not in quadrilateral_position_dict:
+            raise KeyError(f"The key '{key}' does not exist in the dictionary 'quadrilateral_position_dict'")
+
+    if engine not in ENGINES:
+        raise ValueError(f"'engine' argument must be one of {ENGINES}")
+
+    if (workers is not None and workers < 1) or (chunk_size is not None and chunk_size < 1):
+        raise ValueError("'workers' and 'chunk_size' arguments must be at least 1")
+
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    quads = np.asarray(quadrilateral_position_dict['q'], dtype=np.int64).reshape(-1, 4)
+    chunk_size = max(1, -(-len(quads) // (workers * 4))) if chunk_size is None else chunk_size
+
+    points = np.asarray(quadrilateral_position_dict['p'], dtype=np.float64)
+    points_memory = shared_memory.SharedMemory(create=True, size=max(points.nbytes, 1))
+
+    try:
+        np.ndarray(points.shape, dtype=np.float64, buffer=points_memory.buf)[:] = points
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_initialise_worker, initargs=(points_memory.name, points.shape, engine)) as executor:
+            chunk_results = list(executor.map(_split_chunk, [quads[start:start + chunk_size] for start in range(0, len(quads), chunk_size)]))
+
+    finally:
+        points_memory.close()
+        points_memory.unlink()
+
+    if not chunk_results: #No quadrilaterals
+        chunk_results = [(PolygonSoup.from_lists([]), PolygonSoup.from_lists([]))]
+
+    dry_soup, wet_soup = (PolygonSoup.concatenate([chunk_result[side] for chunk_result in chunk_results]) for side in range(2))
+
+    if polygon_soup:
+        return(dry_soup, wet_soup)
+
+    return(dry_soup.tolist(), wet_soup.tolist())
@@ -0,0 +1,196 @@
+import numpy as np
+
+
+class PolygonSoup:
+
+    """
+    Compact array-backed container for ragged polygons (e.g. the 3, 4 and 5 cornered dry/wet output of a split), stored CSR-style: all
+    corners in one 'vertices' array, and 'offsets' such that polygon i uses vertices[offsets[i]:offsets[i + 1]]. Holding the floats in
+    one array rather than nested lists of Python floats takes around a tenth of the memory, and indexing or slicing the soup gives
+    views onto the same data rather than copies.
+
+    The corners are normally (C, 3) positions, but may also be (C,) point indices, as for the 'q' data of a welded soup (see
+    'weld_polygon_vertices' in 'utils.py').
+
+    Iterating over the soup yields each polygon as an array, so it can be passed wherever a list of polygons is expected (e.g. to
+    matplotlib), and 'tolist' gives the nested list format used throughout the project.
+
+    Args:
+        vertices (np.ndarray): (C, 3) array of corner positions, or (C,) int array of point indices.
+        offsets (np.ndarray): (P + 1,) int array of the start of each polygon within 'vertices', ending with C.
+
+    Raises:
+        ValueError: If 'offsets' is empty, not increasing, or does not span 'vertices'.
+    """
+
+    def __init__(self, vertices, offsets):
+
+        self.vertices = np.asarray(vertices)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+        if self.offsets.ndim != 1 or len(self.offsets) == 0:
+            raise ValueError("'offsets' argument must be a 1D array of at least one offset")
+        elif np.any(np.diff(self.offsets) < 0) or self.offsets[0] < 0 or self.offsets[-1] > len(self.vertices):
+            raise ValueError("'offsets' argument must be increasing and lie within 'vertices'")
+
+    @classmethod
+    def from_padded(cls, polygons, counts):
+
+        """
+        Builds a soup from a padded polygon array (e.g. from 'slice_quadrilateral_arrays'), dropping empty polygons.
+
+        Args:
+            polygons (np.ndarray): (N, k, ...) array of polygon corners.
+            counts (np.ndarray): (N,) int array of the number of corners used in each polygon.
+
+        Returns:
+            soup (PolygonSoup): The used corners of the non-empty polygons.
+
+        Raises:
+            None
+        """
+
+        polygons, counts = np.asarray(polygons), np.asarray(counts, dtype=np.int64)
+        used = np.arange(polygons.shape[1]) < counts[:, None]
+        counts = counts[counts > 0]
+
+        return(cls(polygons[used], np.concatenate([[0], np.cumsum(counts)])))
+
+    @classmethod
+    def from_lists(cls, polygons):
+
+        """
+        Builds a soup from the nested list format used throughout the project.
+
+        Args:
+            polygons (list): A list of polygons, each a list of [x, y, z] points (or of point indices).
+
+        Returns:
+            soup (PolygonSoup): The same polygons.
+
+        Raises:
+            None
+        """
+
+        counts = [len(polygon) for polygon in polygons]
+        vertices = [corner for polygon in polygons for corner in polygon]
+
+        return(cls(np.array(vertices) if vertices else np.zeros((0, 3)), np.concatenate([[0], np.cumsum(counts, dtype=np.int64)])))
+
+    @classmethod
+    def concatenate(cls, soups):
+
+        """
+        Joins soups end to end, e.g. the per chunk results of a parallel split, copying each soup's corners once.
+
+        Args:
+            soups (list): At least one PolygonSoup, all with the same kind of corners.
+
+        Returns:
+            soup (PolygonSoup): The polygons of every soup, in order.
+
+        Raises:
+            ValueError: If 'soups' is empty.
+        """
+
+        if len(soups) == 0:
+            raise ValueError("'soups' argument must hold at least one PolygonSoup")
+
+        vertices = np.concatenate([soup.vertices[soup.offsets[0]:soup.offsets[-1]] for soup in soups])
+        counts = np.concatenate([soup.counts for soup in soups])
+
+        return(cls(vertices, np.concatenate([[0], np.cumsum(counts)])))
+
+    @property
+    def counts(self):
+
+        #The number of corners of each polygon
+        return(np.diff(self.offsets))
+
+    @property
+    def nbytes(self):
+
+        #The memory held by the soup's arrays (shared with any views)
+        return(self.vertices.nbytes + self.offsets.nbytes)
+
+    def __len__(self):
+
+        return(len(self.offsets) - 1)
+
+    def __getitem__(self, index):
+
+        """
+        A polygon as a view onto 'vertices', or for a slice of contiguous polygons, a soup sharing 'vertices'.
+
+        Args:
+            index (int or slice): The polygon (or polygons) wanted.
+
+        Returns:
+            polygon (np.ndarray): (k, 3) view of the polygon's corners, or a PolygonSoup for a slice.
+
+        Raises:
+            IndexError: If 'index' is out of range.
+            TypeError: If 'index' is not an int or slice.
+        """
+
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise TypeError("PolygonSoup slices must be contiguous")
+            stop = max(start, stop)
+            return(PolygonSoup(self.vertices, self.offsets[start:stop + 1]))
+
+        if not isinstance(index, (int, np.integer)):
+            raise TypeError("PolygonSoup indices must be ints or slices")
+        elif not -len(self) <= index < len(self):
+            raise IndexError("PolygonSoup index out of range")
+
+        index = index % len(self)
+        return(self.vertices[self.offsets[index]:self.offsets[index + 1]])
+
+    def __iter__(self):
+
+        for start, stop in zip(self.offsets[:-1].tolist(), self.offsets[1:].tolist()):
+            yield self.vertices[start:stop]
+
+    def take(self, indices):
+
+        """
+        A new soup of the polygons at 'indices', in that order (the corners are copied).
+
+        Args:
+            indices (np.ndarray): (M,) int array of polygon indices.
+
+        Returns:
+            soup (PolygonSoup): The chosen polygons.
+
+        Raises:
+            IndexError: If any index is out of range.
+        """
+
+        indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+        counts = self.counts[indices]
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        corner_positions = np.repeat(self.offsets[indices] - offsets[:-1], counts) + np.arange(offsets[-1])
+
+        return(PolygonSoup(self.vertices[corner_positions], offsets))
+
+    def tolist(self):
+
+        """
+        The polygons in the nested list format used throughout the project.
+
+        Args:
+            None
+
+        Returns:
+            polygon_lists (list): A list of polygons, each a list of [x, y, z] lists (or of point indices).
+
+        Raises:
+            None
+        """
+
+        corners = self.vertices[self.offsets[0]:self.offsets[-1]].tolist()
+        bounds = (self.offsets - self.offsets[0]).tolist()
+
+        return([corners[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])])
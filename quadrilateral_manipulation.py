@@ -1,5 +1,5 @@
 from utils import next_and_previous_index
-from sympy import Plane, Line3D, Point3D
+from instrumentation import record_split_statistics
 
 
 def arrange_coordinate_lists(quad_xyz_coordinates, quad_z_coordinates, negative_number_count):
@@ -98,6 +98,9 @@ def sort_mixed_quadrilaterals(quad_xyz_coordinates, quad_z_coordinates, negative
     elif not isinstance(quad_z_coordinates[0], (int, float)):
         raise TypeError("'quad_z_coordinates' argument must be a list")
 
+    #SymPy takes around a second to import, so it is only imported once the exact geometry is actually needed
+    from sympy import Plane, Line3D, Point3D
+
     Z_PLANE_CONST = Plane(Point3D(-100,-100,0), Point3D(-100,100,0), Point3D(100,100,0)) #Define large z=0 plane as constant for calculating intersections
     quad_xyz_coordinates, quad_z_coordinates, negative_number_positions, positive_number_positions = arrange_coordinate_lists(quad_xyz_coordinates, quad_z_coordinates, negative_number_count)
 
@@ -180,7 +183,7 @@ def sort_mixed_quadrilaterals(quad_xyz_coordinates, quad_z_coordinates, negative
 
 
 
-def split_up_quadrilateral_data(quadrilateral_position_dict):
+def split_up_quadrilateral_data(quadrilateral_position_dict, instrumentation=None):
     
     """
     Given a dictionary, with keys 'q' (list of quadrilaterals) and 'p' (list of points in 3D space), map all corner positions to
@@ -192,6 +195,7 @@ def split_up_quadrilateral_data(quadrilateral_position_dict):
 
     Args:
         quadrilateral_position_dict (dict): The given json file, theprimary source of all data.
+        instrumentation (Instrumentation): If given, the split's counters are recorded to it (see 'instrumentation.py').
 
     Returns:
         dry_quadrilateral_xyz_positions (list): All 3D coordinates for the 2D shapes existing above the z=0 plane.
@@ -219,12 +223,15 @@ def split_up_quadrilateral_data(quadrilateral_position_dict):
 
     dry_quadrilateral_xyz_positions = []
     wet_quadrilateral_xyz_positions = []
+    negative_number_counts = []
 
     for quad_ints in q_data:
 
         quad_xyz_coordinates = [p_data[int(quad_ints[0])], p_data[int(quad_ints[1])], p_data[int(quad_ints[2])], p_data[int(quad_ints[3])]]
         quad_z_coordinates = [float(p_data[int(quad_ints[0])][2]), float(p_data[int(quad_ints[1])][2]), float(p_data[int(quad_ints[2])][2]), float(p_data[int(quad_ints[3])][2])]
 
+        negative_number_counts.append(sum(1 for i in quad_z_coordinates if i < 0))
+
         if all(i > 0 for i in quad_z_coordinates): #All Z positions are positive: dry quadrilateral
             dry_quadrilateral_xyz_positions.append(quad_xyz_coordinates)
         elif all(i < 0 for i in quad_z_coordinates): #All Z positions are positive: dry quadrilateral
@@ -236,5 +243,8 @@ def split_up_quadrilateral_data(quadrilateral_position_dict):
             dry_quadrilateral_xyz_positions.append(dry_component)
             wet_quadrilateral_xyz_positions.append(wet_component)
 
+    #Every mixed quadrilateral needs two line/plane intersections
+    record_split_statistics(instrumentation, negative_number_counts, 2 * sum(1 for i in negative_number_counts if 0 < i < 4))
+
     return (dry_quadrilateral_xyz_positions, wet_quadrilateral_xyz_positions)
 
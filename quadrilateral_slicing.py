@@ -0,0 +1,950 @@
+import numpy as np
+from instrumentation import record_split_statistics
+from polygon_soup import PolygonSoup
+
+
+#Every polygon produced by a split has at most 6 corners (a quadrilateral cut by a plane gives a triangle + pentagon, or two quadrilaterals,
+#and a twisted quadrilateral whose corners alternate sides gives two hexagons)
+MAX_POLYGON_CORNERS = 6
+
+
+def _build_split_tables():
+
+    """
+    Builds the lookup tables that describe how a quadrilateral is split for each of its 16 possible sign patterns. A sign pattern
+    (mask) is a 4-bit integer where bit 'i' is set if corner 'i' lies below the cutting plane (wet). Table entries 0-3 refer to the
+    quadrilateral's own corners, entries 4-7 refer to the crossing point on edge (i, i+1) for i = 0-3, and -1 is padding.
+    Each polygon has the corners of the one produced by 'sort_mixed_quadrilaterals' in 'quadrilateral_manipulation.py', starting from
+    the same corner, but then follows the quadrilateral's boundary (in the direction of the SymPy engine's second corner), so that
+    every polygon is simple. This is the SymPy engine's ordering for every mask except 3 and 12, where listing the crossings after the
+    dry corners gives a self-intersecting polygon, and the saddles 5 and 10 (a twisted quadrilateral whose corners alternate sides).
+    A saddle crosses the plane on all four edges, but the SymPy engine only uses two of the crossings, so its polygons neither cover
+    the quadrilateral nor stay on their own side. Here each side is instead the hexagon of its two corners and all four crossings, as
+    in the tolerance aware split and 'hydrostatics.py'. As one side of a saddle is really two separate triangles, which a single
+    polygon cannot describe, the two hexagons share the quadrilateral between the four crossings.
+
+    Args:
+        None
+
+    Returns:
+        dry_table (np.ndarray): (16, 6) int array, the dry polygon recipe for each mask.
+        wet_table (np.ndarray): (16, 6) int array, the wet polygon recipe for each mask.
+        dry_counts (np.ndarray): (16,) int array, the number of corners in each dry polygon.
+        wet_counts (np.ndarray): (16,) int array, the number of corners in each wet polygon.
+
+    Raises:
+        None
+    """
+
+    def edge(a, b): #Table entry for the crossing point between two neighbouring corners
+        a, b = a % 4, b % 4
+        return(4 + (a if (a + 1) % 4 == b else b))
+
+    def boundary_position(entry): #Position along the boundary, corner i at 2i and the crossing on edge (i, i+1) at 2i + 1
+        return(2 * entry if entry < 4 else 2 * (entry - 4) + 1)
+
+    def follow_boundary(recipe): #Keeps the first entry, and orders the rest along the boundary in the direction of the second entry
+        if len(recipe) < 3:
+            return(recipe)
+        start = boundary_position(recipe[0])
+        steps = [(boundary_position(entry) - start) % 8 for entry in recipe]
+        return([recipe[0]] + [entry for _, entry in sorted(zip(steps[1:], recipe[1:]), reverse=steps[1] > 4)])
+
+    dry_table = np.full((16, MAX_POLYGON_CORNERS), -1, dtype=np.int64)
+    wet_table = np.full((16, MAX_POLYGON_CORNERS), -1, dtype=np.int64)
+    dry_counts = np.zeros(16, dtype=np.int64)
+    wet_counts = np.zeros(16, dtype=np.int64)
+
+    for mask in range(16):
+
+        negative_number_positions = [i for i in range(4) if mask & (1 << i)]
+        positive_number_positions = [i for i in range(4) if not mask & (1 << i)]
+
+        if len(negative_number_positions) == 0: #Fully dry
+            dry, wet = [0, 1, 2, 3], []
+
+        elif len(negative_number_positions) == 4: #Fully wet
+            dry, wet = [], [0, 1, 2, 3]
+
+        elif len(negative_number_positions) == 1:
+            n = negative_number_positions[0]
+            crossings = [edge(n, n + 3), edge(n, n + 1)]
+            dry = [(n + 1) % 4, (n + 2) % 4, (n + 3) % 4] + crossings
+            wet = [n] + crossings
+
+        elif len(negative_number_positions) == 3:
+            m = positive_number_positions[0]
+            crossings = [edge(m, m + 3), edge(m, m + 1)]
+            dry = [m] + crossings
+            wet = [(m + 1) % 4, (m + 2) % 4, (m + 3) % 4] + crossings
+
+        else: #Two negative corners, positives are listed in reverse order
+            index_1, index_2 = negative_number_positions
+            if index_2 == (index_1 + 1): #One after the other, e.g. index: 0,1 or 1,2 or 2,3
+                crossings = [edge(index_1, index_1 - 1), edge(index_2, index_2 + 1)]
+            elif index_2 == (index_1 + 2): #Saddle, e.g. index: 0,2 or 1,3, where every edge is cut
+                crossings = [4, 5, 6, 7]
+            else: #Wraparound, e.g. index: 0,3
+                crossings = [edge(index_1, index_1 + 1), edge(index_2, index_2 - 1)]
+            dry = positive_number_positions[::-1] + crossings
+            wet = [index_2, index_1] + crossings
+
+        dry, wet = follow_boundary(dry), follow_boundary(wet)
+
+        dry_table[mask, :len(dry)] = dry
+        wet_table[mask, :len(wet)] = wet
+        dry_counts[mask] = len(dry)
+        wet_counts[mask] = len(wet)
+
+    return(dry_table, wet_table, dry_counts, wet_counts)
+
+
+DRY_SPLIT_TABLE, WET_SPLIT_TABLE, DRY_SPLIT_COUNTS, WET_SPLIT_COUNTS = _build_split_tables()
+
+#Corner states of the tolerance aware split, a pattern being sum(state_i * 3**i) over the 4 corners
+DRY_STATE, ON_PLANE_STATE, WET_STATE = 0, 1, 2
+_STATE_WEIGHTS = np.array([1, 3, 9, 27])
+
+
+def _build_tolerant_split_tables():
+
+    """
+    Builds the lookup tables of the tolerance aware split, for each of the 81 patterns of corner states (dry, on the plane, or wet).
+    Table entries use the same encoding as '_build_split_tables'. Patterns without an on-plane corner reuse its recipes, so both
+    modes give identical polygons away from the plane. Otherwise an on-plane corner belongs to both sides, and edges are only cut
+    where they run from a dry corner to a wet one, so no crossing point ever coincides with a corner. A side made up of on-plane
+    corners alone is empty (it is the other side's boundary), except that a quadrilateral lying wholly on the plane counts as dry.
+
+    Args:
+        None
+
+    Returns:
+        dry_table (np.ndarray): (81, 6) int array, the dry polygon recipe for each pattern.
+        wet_table (np.ndarray): (81, 6) int array, the wet polygon recipe for each pattern.
+        dry_counts (np.ndarray): (81,) int array, the number of corners in each dry polygon.
+        wet_counts (np.ndarray): (81,) int array, the number of corners in each wet polygon.
+        cuts_edges (np.ndarray): (81,) bool array, True for the patterns that need edge crossing points.
+
+    Raises:
+        None
+    """
+
+    dry_table = np.full((81, MAX_POLYGON_CORNERS), -1, dtype=np.int64)
+    wet_table = np.full((81, MAX_POLYGON_CORNERS), -1, dtype=np.int64)
+    dry_counts = np.zeros(81, dtype=np.int64)
+    wet_counts = np.zeros(81, dtype=np.int64)
+
+    for pattern in range(81):
+
+        states = [pattern // 3 ** i % 3 for i in range(4)]
+
+        if ON_PLANE_STATE not in states:
+            mask = sum(1 << i for i in range(4) if states[i] == WET_STATE)
+            dry = DRY_SPLIT_TABLE[mask, :DRY_SPLIT_COUNTS[mask]].tolist()
+            wet = WET_SPLIT_TABLE[mask, :WET_SPLIT_COUNTS[mask]].tolist()
+
+        elif states == [ON_PLANE_STATE] * 4: #Lying in the plane
+            dry, wet = [0, 1, 2, 3], []
+
+        else: #Walk around the quadrilateral, as in Sutherland-Hodgman clipping
+            dry, wet = [], []
+            for i in range(4):
+                if states[i] != WET_STATE:
+                    dry.append(i)
+                if states[i] != DRY_STATE:
+                    wet.append(i)
+                if {states[i], states[(i + 1) % 4]} == {DRY_STATE, WET_STATE}:
+                    dry.append(4 + i)
+                    wet.append(4 + i)
+            dry = dry if DRY_STATE in states and len(dry) >= 3 else []
+            wet = wet if WET_STATE in states and len(wet) >= 3 else []
+
+        dry_table[pattern, :len(dry)] = dry
+        wet_table[pattern, :len(wet)] = wet
+        dry_counts[pattern] = len(dry)
+        wet_counts[pattern] = len(wet)
+
+    cuts_edges = ((dry_table >= 4) | (wet_table >= 4)).any(axis=1)
+
+    return(dry_table, wet_table, dry_counts, wet_counts, cuts_edges)
+
+
+TOLERANT_DRY_SPLIT_TABLE, TOLERANT_WET_SPLIT_TABLE, TOLERANT_DRY_SPLIT_COUNTS, TOLERANT_WET_SPLIT_COUNTS, TOLERANT_CUTS_EDGES = _build_tolerant_split_tables()
+
+
+def edge_crossing_points(start_points, end_points, start_distances, end_distances):
+
+    """
+    Closed-form linear interpolation of the point where each edge crosses the cutting plane. The formula is symmetric in the two
+    end points, so a shared edge gives a bit-identical crossing point whichever quadrilateral it is computed from.
+
+    Args:
+        start_points (np.ndarray): (..., 3) array of edge start positions.
+        end_points (np.ndarray): (..., 3) array of edge end positions.
+        start_distances (np.ndarray): (...) array of signed distances of the start positions from the plane.
+        end_distances (np.ndarray): (...) array of signed distances of the end positions from the plane.
+
+    Returns:
+        crossing_points (np.ndarray): (..., 3) array of positions where each edge meets the plane.
+
+    Raises:
+        None
+        ** Edges that do not cross the plane have no crossing point; their rows are returned as the edge start point.
+    """
+
+    denominator = end_distances - start_distances
+    crosses = denominator != 0
+    safe_denominator = np.where(crosses, denominator, 1.0)[..., None]
+
+    crossing_points = (start_points * end_distances[..., None] - end_points * start_distances[..., None]) / safe_denominator + 0.0 #'+ 0.0' turns -0.0 into 0.0
+
+    return(np.where(crosses[..., None], crossing_points, start_points))
+
+
+def waterplane(z_offset=0.0, heel_angle=0.0, trim_angle=0.0):
+
+    """
+    Builds the cutting plane for a waterline at height 'z_offset', with the hull heeled (rotated about the x-axis) and trimmed
+    (rotated about the y-axis). The plane is expressed in the mesh's own coordinate frame, so the mesh itself never needs rotating.
+
+    Args:
+        z_offset (float): Height of the waterline above the mesh origin.
+        heel_angle (float): Heel angle in degrees.
+        trim_angle (float): Trim angle in degrees.
+
+    Returns:
+        plane_normal (np.ndarray): (3,) unit normal of the plane, pointing to the dry side.
+        plane_offset (float): Offset of the plane along its normal, i.e. the plane is n.x = offset.
+
+    Raises:
+        None
+    """
+
+    heel, trim = np.radians(heel_angle), np.radians(trim_angle)
+    rotation_x = np.array([[1, 0, 0], [0, np.cos(heel), -np.sin(heel)], [0, np.sin(heel), np.cos(heel)]])
+    rotation_y = np.array([[np.cos(trim), 0, np.sin(trim)], [0, 1, 0], [-np.sin(trim), 0, np.cos(trim)]])
+
+    plane_normal = (rotation_y @ rotation_x).T @ np.array([0.0, 0.0, 1.0])
+
+    return(plane_normal, float(z_offset))
+
+
+def plane_signed_distances(points, plane_normals, plane_offsets):
+
+    """
+    Signed distance of every point from every plane, computed with a single matrix multiply. Positive distances are dry.
+
+    Args:
+        points (np.ndarray): (V, 3) array of positions in 3D space.
+        plane_normals (np.ndarray): (K, 3) array of plane normals (or a single (3,) normal). Normals are normalised here.
+        plane_offsets (np.ndarray): (K,) array of plane offsets (or a single float), the plane being n.x = offset.
+
+    Returns:
+        signed_distances (np.ndarray): (K, V) array of signed distances.
+
+    Raises:
+        ValueError: If 'plane_normals' and 'plane_offsets' describe a different number of planes.
+        ValueError: If any plane normal has zero length.
+    """
+
+    plane_normals = np.atleast_2d(np.asarray(plane_normals, dtype=np.float64))
+    plane_offsets = np.atleast_1d(np.asarray(plane_offsets, dtype=np.float64))
+
+    if len(plane_normals) != len(plane_offsets):
+        raise ValueError("'plane_normals' and 'plane_offsets' must describe the same number of planes")
+
+    lengths = np.linalg.norm(plane_normals, axis=1)
+    if np.any(lengths == 0):
+        raise ValueError("'plane_normals' must not contain zero length normals")
+
+    return((plane_normals / lengths[:, None]) @ np.asarray(points, dtype=np.float64).T - plane_offsets[:, None])
+
+
+def snap_signed_distances(signed_distances, tolerance):
+
+    """
+    Snaps the signed distances within 'tolerance' of the plane to exactly zero, so those points are treated as lying on it.
+
+    Args:
+        signed_distances (np.ndarray): Array of signed distances from the cutting plane.
+        tolerance (float): The largest distance from the plane at which a point counts as on it.
+
+    Returns:
+        snapped_distances (np.ndarray): The same distances, with those within 'tolerance' set to 0.
+
+    Raises:
+        ValueError: If 'tolerance' is negative.
+    """
+
+    if tolerance < 0:
+        raise ValueError("'tolerance' argument must not be negative")
+
+    signed_distances = np.asarray(signed_distances, dtype=np.float64)
+
+    return(np.where(np.abs(signed_distances) <= tolerance, 0.0, signed_distances))
+
+
+def _corner_patterns(quad_distances):
+
+    #Tolerant split pattern of each quadrilateral, from its (already snapped) corner distances
+    states = np.where(quad_distances > 0, DRY_STATE, np.where(quad_distances < 0, WET_STATE, ON_PLANE_STATE))
+    return((states * _STATE_WEIGHTS).sum(axis=1))
+
+
+def _gather_tolerant_polygons(table, patterns, cuts_edges, corners, corners_and_crossings, fill_value):
+
+    """
+    Builds one side's polygons through a tolerant split table, for either corner positions or corner indices.
+
+    Args:
+        table (np.ndarray): 'TOLERANT_DRY_SPLIT_TABLE' or 'TOLERANT_WET_SPLIT_TABLE'.
+        patterns (np.ndarray): (N,) int array of corner state patterns.
+        cuts_edges (np.ndarray): (N,) bool array, True for the M quadrilaterals whose edges are cut.
+        corners (np.ndarray): (N, 4, 3) array of corner positions, or (N, 4) array of corner indices.
+        corners_and_crossings (np.ndarray): (M, 8, 3) or (M, 8) array of the cut quadrilaterals' corners followed by their crossings.
+        fill_value (float): The padding value, 0 for positions or -1 for indices.
+
+    Returns:
+        polygons (np.ndarray): (N, 6, 3) or (N, 6) array of polygon corners, padded with 'fill_value'.
+
+    Raises:
+        None
+    """
+
+    polygons = np.full((len(corners), MAX_POLYGON_CORNERS) + corners.shape[2:], fill_value, dtype=corners.dtype)
+
+    for rows, source in [(~cuts_edges, corners[~cuts_edges]), (cuts_edges, corners_and_crossings)]:
+        recipe = table[patterns[rows]]
+        positions = np.maximum(recipe, 0).reshape(recipe.shape + (1,) * (source.ndim - 2))
+        used = (recipe >= 0).reshape(positions.shape)
+        polygons[rows] = np.where(used, np.take_along_axis(source, positions, axis=1), fill_value)
+
+    return(polygons)
+
+
+def remove_degenerate_polygons(polygons, counts, tolerance=0.0, polygon_indices=None):
+
+    """
+    Cleans padded polygons in one vectorised pass: corners within 'tolerance' of the next corner (e.g. from a quadrilateral repeating
+    an index, such as [21, 42, 20, 21]) are merged, and polygons left with fewer than 3 corners, or with an area no more than
+    'tolerance' times their perimeter (zero-area slivers, thinner than about the tolerance), are dropped.
+
+    Args:
+        polygons (np.ndarray): (N, 6, 3) array of polygon corners, zero padded.
+        counts (np.ndarray): (N,) int array of the number of corners used in each polygon.
+        tolerance (float): The distance within which corners are merged, and the width below which polygons are dropped.
+        polygon_indices (np.ndarray): Optional (N, 6) array of the corners' point indices, padded with -1, cleaned alongside.
+
+    Returns:
+        polygons (np.ndarray): (N, 6, 3) array of the cleaned polygons, zero padded.
+        counts (np.ndarray): (N,) int array of corner counts, 0 for dropped polygons.
+        polygon_indices (np.ndarray): The cleaned indices, padded with -1 (only if 'polygon_indices' is given).
+
+    Raises:
+        None
+    """
+
+    corner_positions = np.arange(polygons.shape[1])
+
+    def next_corners(values, counts):
+        next_positions = np.where(corner_positions + 1 < counts[:, None], corner_positions + 1, 0)
+        return(np.take_along_axis(values, next_positions.reshape(next_positions.shape + (1,) * (values.ndim - 2)), axis=1))
+
+    present = corner_positions < counts[:, None]
+    repeated = present & (np.linalg.norm(next_corners(polygons, counts) - polygons, axis=-1) <= tolerance)
+    keep = present & ~(repeated & (counts[:, None] > 1))
+
+    #Kept corners move to the front of their row, in their original order
+    order = np.argsort(~keep, axis=1, kind='stable')
+    polygons = np.take_along_axis(polygons, order[..., None], axis=1)
+    counts = keep.sum(axis=1)
+
+    edges = next_corners(polygons, counts) - polygons
+    present = corner_positions < counts[:, None]
+    vector_areas = np.where(present[..., None], np.cross(polygons, polygons + edges), 0.0).sum(axis=1) / 2
+    perimeters = np.where(present, np.linalg.norm(edges, axis=-1), 0.0).sum(axis=1)
+
+    counts = np.where((counts < 3) | (np.linalg.norm(vector_areas, axis=1) <= tolerance * perimeters), 0, counts)
+    present = corner_positions < counts[:, None]
+    polygons = np.where(present[..., None], polygons, 0.0)
+
+    if polygon_indices is None:
+        return(polygons, counts)
+
+    return(polygons, counts, np.where(present, np.take_along_axis(polygon_indices, order, axis=1), -1))
+
+
+def _special_quadrilaterals(quads, quad_distances):
+
+    #The quadrilaterals needing the tolerant tables and clean up: those with a corner on the plane, or a collapsed edge (a repeated
+    #point index). Every other quadrilateral gives the same polygons through the plain split tables, and none of its crossing points
+    #can fall within the tolerance of a corner. Comparing indices rather than edge lengths keeps this check nearly free
+    return((quad_distances == 0).any(axis=1) | (quads == quads[:, [1, 2, 3, 0]]).any(axis=1))
+
+
+def _slice_gathered_quadrilaterals_tolerant(quad_xyz_coordinates, quad_distances, tolerance, quads):
+
+    """
+    Tolerance aware core of the slicing engine: corners within 'tolerance' of the plane lie on it and belong to both sides, only
+    edges running from a dry corner to a wet one are cut, and repeated corners and zero-area slivers are then removed. Only the few
+    quadrilaterals touching the plane or with a collapsed edge take this path, the rest are split as usual.
+
+    Args:
+        quad_xyz_coordinates (np.ndarray): (N, 4, 3) array of corner positions.
+        quad_distances (np.ndarray): (N, 4) array of corner signed distances from the cutting plane.
+        tolerance (float): The largest distance from the plane at which a corner counts as on it.
+        quads (np.ndarray): (N, 4) int array of the quadrilaterals' point indices.
+
+    Returns:
+        The same four arrays as 'slice_quadrilateral_arrays'.
+
+    Raises:
+        ValueError: If 'tolerance' is negative.
+    """
+
+    quad_distances = snap_signed_distances(quad_distances, tolerance)
+    special = _special_quadrilaterals(quads, quad_distances)
+    sides = list(_slice_gathered_quadrilaterals(quad_xyz_coordinates, quad_distances))
+    if not special.any():
+        return(tuple(sides))
+
+    special_xyz = quad_xyz_coordinates[special]
+    patterns = _corner_patterns(quad_distances[special])
+    cuts_edges = TOLERANT_CUTS_EDGES[patterns]
+
+    cut_xyz = special_xyz[cuts_edges]
+    cut_distances = quad_distances[special][cuts_edges]
+    crossings = edge_crossing_points(cut_xyz, np.roll(cut_xyz, -1, axis=1), cut_distances, np.roll(cut_distances, -1, axis=1))
+    corners_and_crossings = np.concatenate([cut_xyz, crossings], axis=1)
+
+    for side, (table, table_counts) in enumerate([(TOLERANT_DRY_SPLIT_TABLE, TOLERANT_DRY_SPLIT_COUNTS), (TOLERANT_WET_SPLIT_TABLE, TOLERANT_WET_SPLIT_COUNTS)]):
+        polygons = _gather_tolerant_polygons(table, patterns, cuts_edges, special_xyz, corners_and_crossings, 0.0)
+        for position, special_values in enumerate(remove_degenerate_polygons(polygons, table_counts[patterns], tolerance)):
+            sides[2 * side + position][special] = special_values
+
+    return(tuple(sides))
+
+
+def _check_points_and_quads(points, quads):
+
+    #Shared argument checks for the array level slicing functions
+    points = np.asarray(points, dtype=np.float64)
+    quads = np.asarray(quads, dtype=np.int64)
+
+    if points.ndim != 2 or points.shape[1] != 3:
+        raise ValueError("'points' argument must be of shape (V, 3)")
+    elif quads.ndim != 2 or quads.shape[1] != 4:
+        raise ValueError("'quads' argument must be of shape (N, 4)")
+
+    return(points, quads)
+
+
+def _masks_and_crossings(quad_xyz_coordinates, quad_distances):
+
+    """
+    Classifies gathered quadrilaterals by their sign pattern, and computes the edge crossing points of the mixed ones.
+
+    Args:
+        quad_xyz_coordinates (np.ndarray): (N, 4, 3) array of corner positions.
+        quad_distances (np.ndarray): (N, 4) array of corner signed distances from the cutting plane.
+
+    Returns:
+        masks (np.ndarray): (N,) int array of 4-bit sign patterns (see '_build_split_tables').
+        mixed (np.ndarray): (N,) bool array, True for the M quadrilaterals crossing the plane.
+        corners_and_crossings (np.ndarray): (M, 8, 3) array of the mixed quadrilaterals' corners followed by the crossing points on
+            their edges (i, i+1), indexed by the split table entries (edges the plane does not cut hold their start point).
+
+    Raises:
+        None
+    """
+
+    masks = ((quad_distances < 0) * np.array([1, 2, 4, 8])).sum(axis=1)
+    mixed = (masks != 0) & (masks != 15)
+
+    mixed_xyz = quad_xyz_coordinates[mixed]
+    mixed_distances = quad_distances[mixed]
+    crossings = edge_crossing_points(mixed_xyz, np.roll(mixed_xyz, -1, axis=1), mixed_distances, np.roll(mixed_distances, -1, axis=1))
+
+    return(masks, mixed, np.concatenate([mixed_xyz, crossings], axis=1))
+
+
+def _slice_gathered_quadrilaterals(quad_xyz_coordinates, quad_distances):
+
+    """
+    Core of the slicing engine, working on corner data that has already been gathered per quadrilateral.
+
+    Args:
+        quad_xyz_coordinates (np.ndarray): (N, 4, 3) array of corner positions.
+        quad_distances (np.ndarray): (N, 4) array of corner signed distances from the cutting plane.
+
+    Returns:
+        The same four arrays as 'slice_quadrilateral_arrays'.
+
+    Raises:
+        None
+    """
+
+    return(_apply_split_tables(quad_xyz_coordinates, *_masks_and_crossings(quad_xyz_coordinates, quad_distances)))
+
+
+def _apply_split_tables(quad_xyz_coordinates, masks, mixed, corners_and_crossings):
+
+    """
+    Builds the dry and wet polygons of gathered quadrilaterals from the output of '_masks_and_crossings'.
+
+    Args:
+        quad_xyz_coordinates (np.ndarray): (N, 4, 3) array of corner positions.
+        masks, mixed, corners_and_crossings: As returned by '_masks_and_crossings'.
+
+    Returns:
+        The same four arrays as 'slice_quadrilateral_arrays'.
+
+    Raises:
+        None
+    """
+
+    dry_polygons = np.zeros((len(quad_xyz_coordinates), MAX_POLYGON_CORNERS, 3))
+    wet_polygons = np.zeros((len(quad_xyz_coordinates), MAX_POLYGON_CORNERS, 3))
+
+    #Fully dry and fully wet quadrilaterals pass straight through
+    dry_polygons[masks == 0, :4] = quad_xyz_coordinates[masks == 0]
+    wet_polygons[masks == 15, :4] = quad_xyz_coordinates[masks == 15]
+
+    if mixed.any():
+        for table, polygons in [(DRY_SPLIT_TABLE, dry_polygons), (WET_SPLIT_TABLE, wet_polygons)]:
+            recipe = table[masks[mixed]]
+            gathered = np.take_along_axis(corners_and_crossings, np.maximum(recipe, 0)[..., None], axis=1)
+            polygons[mixed] = np.where(recipe[..., None] >= 0, gathered, 0.0)
+
+    return(dry_polygons, DRY_SPLIT_COUNTS[masks], wet_polygons, WET_SPLIT_COUNTS[masks])
+
+
+def slice_quadrilateral_arrays(points, quads, signed_distances=None, tolerance=None):
+
+    """
+    Splits every quadrilateral of a mesh along a plane in one vectorised pass. Each quadrilateral is classified by the 4-bit sign
+    pattern of its corners, and the dry (above plane) and wet (below plane) polygons are gathered through the split tables. Only
+    the quadrilaterals that straddle the plane have their edge crossings computed.
+
+    Args:
+        points (np.ndarray): (V, 3) array of positions in 3D space (the 'p' data).
+        quads (np.ndarray): (N, 4) int array of indices into 'points' (the 'q' data).
+        signed_distances (np.ndarray): (V,) array of signed distances of each point from the cutting plane, negative meaning wet.
+            Defaults to the z-coordinate of each point, i.e. the z=0 plane.
+        tolerance (float): If given, the tolerance aware mode is used: points within 'tolerance' of the plane lie on it and belong to
+            both sides (rather than counting as dry, which cuts their edges at the corner itself), and repeated corners and
+            zero-area slivers (see 'remove_degenerate_polygons') are removed. Otherwise every point is taken as strictly dry or wet.
+
+    Returns:
+        dry_polygons (np.ndarray): (N, 6, 3) array of dry polygon corners for each quadrilateral, zero padded.
+        dry_counts (np.ndarray): (N,) int array of dry polygon corner counts, 0 where a quadrilateral has no dry part.
+        wet_polygons (np.ndarray): (N, 6, 3) array of wet polygon corners for each quadrilateral, zero padded.
+        wet_counts (np.ndarray): (N,) int array of wet polygon corner counts, 0 where a quadrilateral has no wet part.
+
+    Raises:
+        ValueError: If 'points' is not of shape (V, 3).
+        ValueError: If 'quads' is not of shape (N, 4).
+    """
+
+    points, quads = _check_points_and_quads(points, quads)
+
+    if signed_distances is None:
+        signed_distances = points[:, 2]
+    signed_distances = np.asarray(signed_distances, dtype=np.float64)
+
+    if tolerance is not None:
+        return(_slice_gathered_quadrilaterals_tolerant(points[quads], signed_distances[quads], tolerance, quads))
+
+    return(_slice_gathered_quadrilaterals(points[quads], signed_distances[quads]))
+
+
+def slice_quadrilateral_arrays_by_planes(points, quads, plane_normals, plane_offsets):
+
+    """
+    Splits a mesh against a batch of planes, e.g. a sweep of drafts, heel angles and trim angles. The corner positions are gathered
+    once and the signed distances of every vertex from every plane are computed in a single matrix multiply, so each additional
+    plane only costs its own classification and the crossings of the quadrilaterals it actually cuts.
+
+    Args:
+        points (np.ndarray): (V, 3) array of positions in 3D space (the 'p' data).
+        quads (np.ndarray): (N, 4) int array of indices into 'points' (the 'q' data).
+        plane_normals (np.ndarray): (K, 3) array of plane normals, pointing to the dry side.
+        plane_offsets (np.ndarray): (K,) array of plane offsets, the plane being n.x = offset.
+
+    Returns:
+        plane_results (list): K tuples of (dry_polygons, dry_counts, wet_polygons, wet_counts), as from 'slice_quadrilateral_arrays'.
+
+    Raises:
+        ValueError: If 'points' is not of shape (V, 3).
+        ValueError: If 'quads' is not of shape (N, 4).
+        ValueError: If the plane arguments are inconsistent (see 'plane_signed_distances').
+    """
+
+    points, quads = _check_points_and_quads(points, quads)
+
+    quad_xyz_coordinates = points[quads]
+    signed_distances = plane_signed_distances(points, plane_normals, plane_offsets)
+
+    return([_slice_gathered_quadrilaterals(quad_xyz_coordinates, plane_distances[quads]) for plane_distances in signed_distances])
+
+
+def quadrilateral_edge_crossings(points, quads, signed_distances):
+
+    """
+    Builds the table of mesh edges that cross the cutting plane, keyed by their sorted vertex-index pair, and computes each crossing
+    point once. An interior edge is shared by two quadrilaterals, so both of them are given the same crossing point (and index).
+
+    Args:
+        points (np.ndarray): (V, 3) array of positions in 3D space.
+        quads (np.ndarray): (N, 4) int array of indices into 'points'.
+        signed_distances (np.ndarray): (V,) array of signed distances of each point from the cutting plane.
+
+    Returns:
+        edge_vertex_indices (np.ndarray): (N, 4) int array, for edge (i, i+1) of each quadrilateral the index of its crossing point,
+            counted on from the end of 'points' (i.e. V + position in 'crossing_points'), or -1 if the edge does not cross.
+        edge_keys (np.ndarray): (E,) int array of the unique crossing edges, each encoded as smaller_index * V + larger_index.
+        crossing_points (np.ndarray): (E, 3) array of the crossing point of each unique edge.
+
+    Raises:
+        None
+    """
+
+    start_indices = quads
+    end_indices = np.roll(quads, -1, axis=1)
+    crosses = (signed_distances[start_indices] < 0) != (signed_distances[end_indices] < 0)
+
+    smaller_indices = np.minimum(start_indices, end_indices)[crosses]
+    larger_indices = np.maximum(start_indices, end_indices)[crosses]
+    edge_keys, edge_positions = np.unique(smaller_indices * len(points) + larger_indices, return_inverse=True)
+
+    smaller_indices, larger_indices = np.divmod(edge_keys, len(points))
+    crossing_points = edge_crossing_points(points[smaller_indices], points[larger_indices], signed_distances[smaller_indices], signed_distances[larger_indices])
+
+    edge_vertex_indices = np.full(quads.shape, -1, dtype=np.int64)
+    edge_vertex_indices[crosses] = len(points) + edge_positions.reshape(-1)
+
+    return(edge_vertex_indices, edge_keys, crossing_points)
+
+
+def slice_quadrilateral_indices(points, quads, signed_distances=None, tolerance=None):
+
+    """
+    Index based equivalent of 'slice_quadrilateral_arrays'. Rather than copying corner coordinates, every dry and wet polygon is
+    described by indices into the original points followed by the new crossing points. Crossing points come from the shared edge
+    table ('quadrilateral_edge_crossings'), so each is computed once and the cut along the plane is watertight without a weld.
+
+    Args:
+        points (np.ndarray): (V, 3) array of positions in 3D space (the 'p' data).
+        quads (np.ndarray): (N, 4) int array of indices into 'points' (the 'q' data).
+        signed_distances (np.ndarray): (V,) array of signed distances of each point from the cutting plane, negative meaning wet.
+            Defaults to the z-coordinate of each point, i.e. the z=0 plane.
+        tolerance (float): If given, the tolerance aware mode is used (see 'slice_quadrilateral_arrays').
+
+    Returns:
+        all_points (np.ndarray): (V + E, 3) array, 'points' followed by the E crossing points.
+        dry_indices (np.ndarray): (N, 6) int array of dry polygon corners as indices into 'all_points', padded with -1.
+        dry_counts (np.ndarray): (N,) int array of dry polygon corner counts, 0 where a quadrilateral has no dry part.
+        wet_indices (np.ndarray): (N, 6) int array of wet polygon corners as indices into 'all_points', padded with -1.
+        wet_counts (np.ndarray): (N,) int array of wet polygon corner counts, 0 where a quadrilateral has no wet part.
+
+    Raises:
+        ValueError: If 'points' is not of shape (V, 3).
+        ValueError: If 'quads' is not of shape (N, 4).
+    """
+
+    points, quads = _check_points_and_quads(points, quads)
+
+    if signed_distances is None:
+        signed_distances = points[:, 2]
+    signed_distances = np.asarray(signed_distances, dtype=np.float64)
+
+    if tolerance is not None:
+        return(_slice_quadrilateral_indices_tolerant(points, quads, signed_distances, tolerance))
+
+    return(_slice_quadrilateral_indices(points, quads, signed_distances)[:5])
+
+
+def _slice_quadrilateral_indices(points, quads, signed_distances):
+
+    #Body of 'slice_quadrilateral_indices', also returning the keys of the crossing edges (see 'quadrilateral_edge_crossings')
+    masks = ((signed_distances[quads] < 0) * np.array([1, 2, 4, 8])).sum(axis=1)
+    mixed = (masks != 0) & (masks != 15)
+
+    dry_indices = np.full((len(quads), MAX_POLYGON_CORNERS), -1, dtype=np.int64)
+    wet_indices = np.full((len(quads), MAX_POLYGON_CORNERS), -1, dtype=np.int64)
+
+    #Fully dry and fully wet quadrilaterals keep their original indices
+    dry_indices[masks == 0, :4] = quads[masks == 0]
+    wet_indices[masks == 15, :4] = quads[masks == 15]
+
+    edge_vertex_indices, edge_keys, crossing_points = quadrilateral_edge_crossings(points, quads[mixed], signed_distances)
+    corners_and_crossings = np.concatenate([quads[mixed], edge_vertex_indices], axis=1) #(M, 8)
+
+    for table, indices in [(DRY_SPLIT_TABLE, dry_indices), (WET_SPLIT_TABLE, wet_indices)]:
+        recipe = table[masks[mixed]]
+        gathered = np.take_along_axis(corners_and_crossings, np.maximum(recipe, 0), axis=1)
+        indices[mixed] = np.where(recipe >= 0, gathered, -1)
+
+    return(np.concatenate([points, crossing_points]), dry_indices, DRY_SPLIT_COUNTS[masks], wet_indices, WET_SPLIT_COUNTS[masks], edge_keys)
+
+
+def _slice_quadrilateral_indices_tolerant(points, quads, signed_distances, tolerance):
+
+    #Tolerance aware mode of 'slice_quadrilateral_indices' (see '_slice_gathered_quadrilaterals_tolerant'). Every quadrilateral is
+    #split as usual, then the special ones are redone. An edge the tolerant split cuts runs from a positive to a negative distance, so
+    #the plain split has already computed its crossing point; the crossings it adds on edges ending on the plane are left unused
+    signed_distances = snap_signed_distances(signed_distances, tolerance)
+    all_points, dry_indices, dry_counts, wet_indices, wet_counts, edge_keys = _slice_quadrilateral_indices(points, quads, signed_distances)
+
+    special = _special_quadrilaterals(quads, signed_distances[quads])
+    if not special.any():
+        return(all_points, dry_indices, dry_counts, wet_indices, wet_counts)
+
+    special_quads = quads[special]
+    patterns = _corner_patterns(signed_distances[special_quads])
+    cuts_edges = TOLERANT_CUTS_EDGES[patterns]
+
+    start_indices, end_indices = special_quads[cuts_edges], special_quads[cuts_edges][:, [1, 2, 3, 0]]
+    crosses = np.sign(signed_distances[start_indices]) * np.sign(signed_distances[end_indices]) < 0
+    edge_positions = np.searchsorted(edge_keys, np.minimum(start_indices, end_indices) * len(points) + np.maximum(start_indices, end_indices))
+    corners_and_crossings = np.concatenate([start_indices, np.where(crosses, len(points) + edge_positions, -1)], axis=1) #(M, 8)
+
+    for table, table_counts, indices, counts in [(TOLERANT_DRY_SPLIT_TABLE, TOLERANT_DRY_SPLIT_COUNTS, dry_indices, dry_counts),
+                                                 (TOLERANT_WET_SPLIT_TABLE, TOLERANT_WET_SPLIT_COUNTS, wet_indices, wet_counts)]:
+        special_indices = _gather_tolerant_polygons(table, patterns, cuts_edges, special_quads, corners_and_crossings, -1)
+        _, counts[special], indices[special] = remove_degenerate_polygons(all_points[np.maximum(special_indices, 0)], table_counts[patterns], tolerance, special_indices)
+
+    return(all_points, dry_indices, dry_counts, wet_indices, wet_counts)
+
+
+def padded_polygons_to_lists(polygons, counts):
+
+    """
+    Converts a zero padded polygon array into the nested list format used throughout the project, dropping empty polygons.
+
+    Args:
+        polygons (np.ndarray): (N, 6, 3) array of polygon corners.
+        counts (np.ndarray): (N,) int array of the number of corners used in each polygon.
+
+    Returns:
+        polygon_lists (list): A list of polygons, each a list of [x, y, z] lists, e.g. [[[1,2,3], [1,2,3], [1,2,3]], [...], ...].
+
+    Raises:
+        None
+    """
+
+    present = counts > 0
+    return([polygon[:count] for polygon, count in zip(polygons[present].tolist(), counts[present].tolist())])
+
+
+def indexed_polygons_to_lists(all_points, indices, counts):
+
+    """
+    Converts index based polygons (see 'slice_quadrilateral_indices') into the nested list format used throughout the project,
+    dropping empty polygons.
+
+    Args:
+        all_points (np.ndarray): (V, 3) array of positions referenced by 'indices'.
+        indices (np.ndarray): (N, 6) int array of polygon corner indices, padded with -1.
+        counts (np.ndarray): (N,) int array of the number of corners used in each polygon.
+
+    Returns:
+        polygon_lists (list): A list of polygons, each a list of [x, y, z] lists, e.g. [[[1,2,3], [1,2,3], [1,2,3]], [...], ...].
+
+    Raises:
+        None
+    """
+
+    return(padded_polygons_to_lists(all_points[np.maximum(indices, 0)], counts))
+
+
+def compact_indexed_polygons(all_points, indices, counts):
+
+    """
+    Subsets the point table of index based polygons (see 'slice_quadrilateral_indices') to the points they actually use, renumbering
+    their indices through a remap array. The points keep their original relative order, so fully dry or wet quadrilaterals are
+    written as their original 'p' indices shifted down past the unused points, with no coordinate comparisons.
+
+    Args:
+        all_points (np.ndarray): (V, 3) array of positions referenced by 'indices'.
+        indices (np.ndarray): (N, 6) int array of polygon corner indices, padded with -1.
+        counts (np.ndarray): (N,) int array of the number of corners used in each polygon.
+
+    Returns:
+        q_for_dict (PolygonSoup): The non-empty polygons, as indices into 'p_for_dict'.
+        p_for_dict (np.ndarray): (U, 3) array of the points used, in their order within 'all_points'.
+        remap (np.ndarray): (V,) int array giving each point's index in 'p_for_dict', or -1 if it is not used.
+
+    Raises:
+        None
+    """
+
+    used = np.zeros(len(all_points), dtype=bool)
+    used[indices[indices >= 0]] = True
+
+    remap = np.full(len(all_points), -1, dtype=np.int64)
+    remap[used] = np.arange(np.count_nonzero(used))
+
+    index_soup = PolygonSoup.from_padded(indices, counts)
+
+    return(PolygonSoup(remap[index_soup.vertices], index_soup.offsets), all_points[used], remap)
+
+
+def _check_quadrilateral_position_dict(quadrilateral_position_dict):
+
+    #Shared argument checks for the dictionary level slicing functions
+    if not isinstance(quadrilateral_position_dict, (dict)):
+        raise TypeError("'quadrilateral_position_dict' argument must be a dict")
+
+    for key in ['q', 'p']:
+        if key not in quadrilateral_position_dict:
+            raise KeyError(f"The key '{key}' does not exist in the dictionary 'quadrilateral_position_dict'")
+
+
+def _quadrilateral_position_arrays(quadrilateral_position_dict):
+
+    #'p' and 'q' as (V, 3) float and (N, 4) int arrays, reshaped so that an empty mesh (e.g. {'p': [], 'q': []}) gives empty arrays
+    return(np.asarray(quadrilateral_position_dict['p'], dtype=np.float64).reshape(-1, 3), np.asarray(quadrilateral_position_dict['q'], dtype=np.int64).reshape(-1, 4))
+
+
+def _negative_number_counts(dry_counts, wet_counts):
+
+    #The number of negative corners of each quadrilateral follows from its polygon sizes: 3, 4 or 5 wet corners for 1, 2 or 3 negatives
+    return(np.where(wet_counts == 0, 0, np.where(dry_counts == 0, 4, wet_counts - 2)))
+
+
+def _record_tolerant_split_statistics(instrumentation, quad_distances, tolerance, dry_counts, wet_counts, intersections_computed):
+
+    #The split's counters in the tolerance aware mode, plus the corners found on the plane and the degenerate polygons dropped
+    if instrumentation is None:
+        return
+
+    quad_distances = snap_signed_distances(quad_distances, tolerance)
+    patterns = _corner_patterns(quad_distances)
+    polygons_expected = np.count_nonzero(TOLERANT_DRY_SPLIT_COUNTS[patterns]) + np.count_nonzero(TOLERANT_WET_SPLIT_COUNTS[patterns])
+
+    record_split_statistics(instrumentation, (quad_distances < 0).sum(axis=1), intersections_computed)
+    instrumentation.count('corners_on_plane', np.count_nonzero(quad_distances == 0))
+    instrumentation.count('degenerate_polygons_dropped', polygons_expected - np.count_nonzero(dry_counts) - np.count_nonzero(wet_counts))
+
+
+def split_up_quadrilateral_data_vectorised(quadrilateral_position_dict, plane_normal=(0.0, 0.0, 1.0), plane_offset=0.0, instrumentation=None, polygon_soup=False,
+                                           tolerance=None):
+
+    """
+    Vectorised equivalent of 'split_up_quadrilateral_data'. Given a dictionary, with keys 'q' (list of quadrilaterals) and 'p'
+    (list of points in 3D space), split every quadrilateral along a plane (z=0 by default) in a single NumPy pass and return the
+    same dry and wet polygon lists, in the same order.
+
+    Args:
+        quadrilateral_position_dict (dict): The given json file, the primary source of all data.
+        plane_normal (tuple): Normal of the cutting plane, pointing to the dry side. See 'waterplane' for heel/trim planes.
+        plane_offset (float): Offset of the cutting plane along its normal, the plane being n.x = offset.
+        instrumentation (Instrumentation): If given, the split's counters are recorded to it (see 'instrumentation.py').
+        polygon_soup (bool): If True, the polygons are returned as PolygonSoups (see 'polygon_soup.py') instead of nested lists,
+            which holds them in about a tenth of the memory and skips building the lists altogether.
+        tolerance (float): If given, points within 'tolerance' of the plane lie on it, and degenerate polygons are removed (see
+            'slice_quadrilateral_arrays'). The polygons are then no longer those of the SymPy engine where a corner lies on the plane.
+
+    Returns:
+        dry_quadrilateral_xyz_positions (list): All 3D coordinates for the 2D shapes existing above the plane.
+        wet_quadrilateral_xyz_positions (list): All 3D coordinates for the 2D shapes existing below the plane.
+
+    Raises:
+        TypeError: If 'quadrilateral_position_dict' is not a dict
+        KeyError: If 'p' or 'q' does not exist in 'quadrilateral_position_dict'
+    """
+
+    _check_quadrilateral_position_dict(quadrilateral_position_dict)
+
+    points, quads = _quadrilateral_position_arrays(quadrilateral_position_dict)
+    signed_distances = plane_signed_distances(points, plane_normal, plane_offset)[0]
+    dry_polygons, dry_counts, wet_polygons, wet_counts = slice_quadrilateral_arrays(points, quads, signed_distances, tolerance)
+
+    #Every edge of a mixed quadrilateral is intersected with the plane in one batch
+    if tolerance is not None and instrumentation is not None:
+        quad_distances = signed_distances[quads]
+        intersections_computed = 4 * np.count_nonzero(TOLERANT_CUTS_EDGES[_corner_patterns(snap_signed_distances(quad_distances, tolerance))])
+        _record_tolerant_split_statistics(instrumentation, quad_distances, tolerance, dry_counts, wet_counts, intersections_computed)
+    elif tolerance is None:
+        negative_number_counts = _negative_number_counts(dry_counts, wet_counts)
+        record_split_statistics(instrumentation, negative_number_counts, 4 * np.count_nonzero((negative_number_counts > 0) & (negative_number_counts < 4)))
+
+    if polygon_soup:
+        return(PolygonSoup.from_padded(dry_polygons, dry_counts), PolygonSoup.from_padded(wet_polygons, wet_counts))
+
+    return(padded_polygons_to_lists(dry_polygons, dry_counts), padded_polygons_to_lists(wet_polygons, wet_counts))
+
+
+def split_up_quadrilateral_data_by_planes(quadrilateral_position_dict, plane_normals, plane_offsets):
+
+    """
+    Splits the same mesh against many planes in one pass (see 'slice_quadrilateral_arrays_by_planes').
+
+    Args:
+        quadrilateral_position_dict (dict): The given json file, the primary source of all data.
+        plane_normals (list): K plane normals, pointing to the dry side.
+        plane_offsets (list): K plane offsets, the planes being n.x = offset.
+
+    Returns:
+        plane_results (list): K tuples of (dry_quadrilateral_xyz_positions, wet_quadrilateral_xyz_positions), one per plane.
+
+    Raises:
+        TypeError: If 'quadrilateral_position_dict' is not a dict
+        KeyError: If 'p' or 'q' does not exist in 'quadrilateral_position_dict'
+    """
+
+    _check_quadrilateral_position_dict(quadrilateral_position_dict)
+
+    points, quads = _quadrilateral_position_arrays(quadrilateral_position_dict)
+    plane_results = slice_quadrilateral_arrays_by_planes(points, quads, plane_normals, plane_offsets)
+
+    return([(padded_polygons_to_lists(dry_polygons, dry_counts), padded_polygons_to_lists(wet_polygons, wet_counts))
+            for dry_polygons, dry_counts, wet_polygons, wet_counts in plane_results])
+
+
+def split_up_quadrilateral_data_indexed(quadrilateral_position_dict, plane_normal=(0.0, 0.0, 1.0), plane_offset=0.0, instrumentation=None, tolerance=None):
+
+    """
+    Index based mode of 'split_up_quadrilateral_data_vectorised', giving each side ready to be saved rather than as coordinate lists.
+    Fully dry and fully wet quadrilaterals (most panels of a typical hull) keep their original 'p' indices, only the crossing points
+    of the cut edges are appended (once per edge, see 'slice_quadrilateral_indices'), and each side's 'p' table is the subset of
+    points it uses ('compact_indexed_polygons'). No vertices need welding, so writing the output is index arithmetic rather than
+    coordinate lookups. Unlike welding, points repeated in the input 'p' data stay separate points.
+
+    Args:
+        quadrilateral_position_dict (dict): The given json file, the primary source of all data.
+        plane_normal (tuple): Normal of the cutting plane, pointing to the dry side. See 'waterplane' for heel/trim planes.
+        plane_offset (float): Offset of the cutting plane along its normal, the plane being n.x = offset.
+        instrumentation (Instrumentation): If given, the split's counters are recorded to it (see 'instrumentation.py').
+        tolerance (float): If given, points within 'tolerance' of the plane lie on it, and degenerate polygons are removed (see
+            'slice_quadrilateral_arrays').
+
+    Returns:
+        dry_quadrilateral_dict (dict): 'q' as a PolygonSoup of indices and 'p' as a (V, 3) array, for the shapes above the plane.
+        wet_quadrilateral_dict (dict): 'q' as a PolygonSoup of indices and 'p' as a (V, 3) array, for the shapes below the plane.
+
+    Raises:
+        TypeError: If 'quadrilateral_position_dict' is not a dict
+        KeyError: If 'p' or 'q' does not exist in 'quadrilateral_position_dict'
+    """
+
+    _check_quadrilateral_position_dict(quadrilateral_position_dict)
+
+    points, quads = _quadrilateral_position_arrays(quadrilateral_position_dict)
+    signed_distances = plane_signed_distances(points, plane_normal, plane_offset)[0]
+    all_points, dry_indices, dry_counts, wet_indices, wet_counts = slice_quadrilateral_indices(points, quads, signed_distances, tolerance)
+
+    #Each crossing edge is intersected with the plane once
+    if tolerance is not None:
+        quad_distances = signed_distances[quads]
+        _record_tolerant_split_statistics(instrumentation, quad_distances, tolerance, dry_counts, wet_counts, len(all_points) - len(points))
+    else:
+        record_split_statistics(instrumentation, _negative_number_counts(dry_counts, wet_counts), len(all_points) - len(points))
+
+    quadrilateral_dicts = []
+    for indices, counts in [(dry_indices, dry_counts), (wet_indices, wet_counts)]:
+        q_for_dict, p_for_dict, _ = compact_indexed_polygons(all_points, indices, counts)
+        quadrilateral_dicts.append({'q': q_for_dict, 'p': p_for_dict})
+
+    return(tuple(quadrilateral_dicts))
@@ -0,0 +1,203 @@
+import math
+import numpy as np
+from polygon_soup import PolygonSoup
+
+
+#'auto' draws every polygon up to 'DEFAULT_MAX_PREVIEW_POLYGONS', and a decimated mesh beyond that
+PREVIEW_MODES = ['auto', 'full', 'decimated', 'bounding_box', 'waterline']
+DEFAULT_MAX_PREVIEW_POLYGONS = 20000
+
+#The smallest half-width of the (cubic) axes, as used by 'plot_dry_and_wet_data'
+MINIMUM_AXIS_LIMIT = 8
+
+
+def _as_polygon_soup(position_data):
+
+    #Accepts either a PolygonSoup or the nested list format used throughout the project
+    return(position_data if isinstance(position_data, PolygonSoup) else PolygonSoup.from_lists(position_data))
+
+
+def decimate_polygons(position_data, max_polygons):
+
+    """
+    Level-of-detail reduction for previews: keeps at most 'max_polygons' polygons, evenly spaced through the mesh (panel meshes are
+    usually ordered row by row, so a regular stride keeps the whole surface covered, just more sparsely).
+
+    Args:
+        position_data (list): The polygons, as a list of polygons or a PolygonSoup.
+        max_polygons (int): The most polygons to keep.
+
+    Returns:
+        soup (PolygonSoup): The kept polygons (all of them, if there are no more than 'max_polygons').
+
+    Raises:
+        ValueError: If 'max_polygons' is less than 1.
+    """
+
+    if max_polygons < 1:
+        raise ValueError("'max_polygons' argument must be at least 1")
+
+    soup = _as_polygon_soup(position_data)
+    if len(soup) <= max_polygons:
+        return(soup)
+
+    return(soup.take(np.unique(np.linspace(0, len(soup) - 1, max_polygons).astype(np.int64))))
+
+
+def bounding_box_edges(position_data):
+
+    """
+    The 12 edges of the axis aligned bounding box of a set of polygons, for the cheapest possible preview.
+
+    Args:
+        position_data (list): The polygons, as a list of polygons or a PolygonSoup.
+
+    Returns:
+        edges (np.ndarray): (12, 2, 3) array of edge end points, or (0, 2, 3) if there are no polygons.
+
+    Raises:
+        None
+    """
+
+    soup = _as_polygon_soup(position_data)
+    if len(soup.vertices) == 0:
+        return(np.zeros((0, 2, 3)))
+
+    lower, upper = soup.vertices.min(axis=0), soup.vertices.max(axis=0)
+    corners = np.array([[upper[i] if corner >> i & 1 else lower[i] for i in range(3)] for corner in range(8)])
+    edges = [(corner, corner | 1 << i) for corner in range(8) for i in range(3) if not corner >> i & 1]
+
+    return(corners[np.array(edges)])
+
+
+def waterline_segments(position_data, plane_normal=(0.0, 0.0, 1.0), plane_offset=0.0, tolerance=1e-9):
+
+    """
+    The polygon edges lying on the cutting plane (within 'tolerance'), i.e. the waterline traced by the split.
+
+    Args:
+        position_data (list): The polygons, as a list of polygons or a PolygonSoup.
+        plane_normal (tuple): Normal of the cutting plane.
+        plane_offset (float): Offset of the cutting plane along its normal, the plane being n.x = offset.
+        tolerance (float): The largest distance from the plane at which a corner counts as on it.
+
+    Returns:
+        segments (np.ndarray): (S, 2, 3) array of segment end points.
+
+    Raises:
+        None
+    """
+
+    soup = _as_polygon_soup(position_data)
+    vertices = soup.vertices[soup.offsets[0]:soup.offsets[-1]]
+    offsets = soup.offsets - soup.offsets[0]
+
+    #Each corner's next corner around its own polygon
+    next_positions = np.arange(1, len(vertices) + 1)
+    next_positions[offsets[1:] - 1] = offsets[:-1]
+
+    plane_normal = np.asarray(plane_normal, dtype=np.float64)
+    on_plane = np.abs(vertices @ (plane_normal / np.linalg.norm(plane_normal)) - plane_offset) <= tolerance
+    on_waterline = on_plane & on_plane[next_positions]
+
+    return(np.stack([vertices[on_waterline], vertices[next_positions[on_waterline]]], axis=1))
+
+
+def draw_preview(ax, position_data, colour, preview='auto', max_polygons=DEFAULT_MAX_PREVIEW_POLYGONS, plane_normal=(0.0, 0.0, 1.0), plane_offset=0.0):
+
+    """
+    Draws one set of polygons onto a 3D axes, as a full, decimated, bounding box or waterline preview, and fits the axis limits to it.
+
+    Args:
+        ax (Axes3D): The axes to draw onto.
+        position_data (list): The polygons, as a list of polygons or a PolygonSoup.
+        colour (str): The colour to draw with.
+        preview (str): One of 'PREVIEW_MODES'.
+        max_polygons (int): The most polygons drawn by the 'auto' and 'decimated' previews.
+        plane_normal (tuple): Normal of the cutting plane the 'waterline' preview traces.
+        plane_offset (float): Offset of the cutting plane along its normal, the plane being n.x = offset.
+
+    Returns:
+        drawn_count (int): The number of polygons or line segments drawn.
+
+    Raises:
+        ValueError: If 'preview' is not one of 'PREVIEW_MODES'.
+    """
+
+    if preview not in PREVIEW_MODES:
+        raise ValueError(f"'preview' argument must be one of {PREVIEW_MODES}")
+
+    #matplotlib is only imported once something is drawn (see 'plot_dry_and_wet_data' in 'utils.py')
+    from mpl_toolkits.mplot3d.art3d import Line3DCollection, Poly3DCollection
+
+    soup = _as_polygon_soup(position_data)
+
+    if preview == 'bounding_box':
+        drawn = bounding_box_edges(soup)
+        collection = Line3DCollection(drawn, colors=colour)
+    elif preview == 'waterline':
+        drawn = waterline_segments(soup, plane_normal, plane_offset)
+        collection = Line3DCollection(drawn, colors=colour)
+    else:
+        drawn = soup if preview == 'full' or (preview == 'auto' and len(soup) <= max_polygons) else decimate_polygons(soup, max_polygons)
+        collection = Poly3DCollection(list(drawn), facecolor=colour)
+
+    if len(drawn) > 0: #matplotlib cannot add an empty collection, e.g. for a side that is wholly dry or wet
+        ax.add_collection3d(collection)
+
+    axis_limits = max(MINIMUM_AXIS_LIMIT, math.ceil(np.abs(soup.vertices).max())) if len(soup.vertices) else MINIMUM_AXIS_LIMIT
+    ax.set_xlabel('x')
+    ax.set_ylabel('y')
+    ax.set_zlabel('z')
+    ax.set_xlim3d(-axis_limits, axis_limits)
+    ax.set_ylim3d(-axis_limits, axis_limits)
+    ax.set_zlim3d(-axis_limits, axis_limits)
+
+    return(len(drawn))
+
+
+def save_dry_and_wet_previews(quadrilateral_xyz_positions, output_filenames, figure_suptitle=('Dry Surface', 'Wet Surface'), preview='auto',
+                              max_polygons=DEFAULT_MAX_PREVIEW_POLYGONS, dpi=100, plane_normal=(0.0, 0.0, 1.0), plane_offset=0.0):
+
+    """
+    Headless equivalent of 'plot_dry_and_wet_data': renders each data set straight to an image file, without pyplot, a GUI or
+    blocking, so batch jobs can emit QA images. Large meshes are decimated (or reduced to their bounding box or waterline) first,
+    as matplotlib's 3D rendering slows down badly beyond a few tens of thousands of polygons.
+
+    Args:
+        quadrilateral_xyz_positions (list): The data sets, each a list of polygons or a PolygonSoup.
+        output_filenames (list): The image path for each data set; the format follows the extension (e.g. '.png', '.svg').
+        figure_suptitle (list): The title of each image.
+        preview (str): One of 'PREVIEW_MODES'.
+        max_polygons (int): The most polygons drawn per image by the 'auto' and 'decimated' previews.
+        dpi (int): The resolution of raster images.
+        plane_normal (tuple): Normal of the cutting plane the data sets were split along, traced by the 'waterline' preview.
+        plane_offset (float): Offset of the cutting plane along its normal, the plane being n.x = offset.
+
+    Returns:
+        output_filenames (list): The image paths written.
+
+    Raises:
+        TypeError: If 'quadrilateral_xyz_positions' or 'output_filenames' is not a list.
+        ValueError: If 'preview' is not one of 'PREVIEW_MODES'.
+    """
+
+    if not isinstance(quadrilateral_xyz_positions, (list)):
+        raise TypeError("'quadrilateral_xyz_positions' argument must be a list")
+    elif not isinstance(output_filenames, (list)):
+        raise TypeError("'output_filenames' argument must be a list")
+    elif preview not in PREVIEW_MODES:
+        raise ValueError(f"'preview' argument must be one of {PREVIEW_MODES}")
+
+    from matplotlib.figure import Figure
+
+    colours = ['red', 'blue']
+
+    for position_data, filename, suptitle, colour in zip(quadrilateral_xyz_positions, output_filenames, figure_suptitle, colours):
+
+        fig = Figure() #Not registered with pyplot, so no GUI backend is involved and nothing is left open
+        fig.suptitle(suptitle)
+        draw_preview(fig.add_subplot(projection='3d'), position_data, colour, preview, max_polygons, plane_normal, plane_offset)
+        fig.savefig(filename, dpi=dpi)
+
+    return(output_filenames)
@@ -0,0 +1,307 @@
+import hashlib
+import os
+import tempfile
+import zipfile
+import numpy as np
+from polygon_soup import PolygonSoup
+from quadrilateral_slicing import split_up_quadrilateral_data_indexed, split_up_quadrilateral_data_vectorised
+
+
+#Bumped whenever the stored layout or the split's output changes, so that stale entries are never returned
+CACHE_FORMAT_VERSION = 2
+CACHE_EXTENSION = '.npz'
+DEFAULT_MAX_CACHE_BYTES = 1 << 30
+
+#The split each cached result comes from: 'indexed' gives 'split_up_quadrilateral_data_indexed' dicts, 'soup' gives the PolygonSoups
+#of 'split_up_quadrilateral_data_vectorised'
+CACHE_MODES = ['indexed', 'soup']
+
+
+def cache_key(quadrilateral_position_dict, plane_normal=(0.0, 0.0, 1.0), plane_offset=0.0, mode='indexed', tolerance=None):
+
+    """
+    The content address of a split: a SHA-256 hash of the 'p' and 'q' data and the slicing parameters. The data is hashed as float64
+    and int64 arrays, so the same mesh read from json (lists), the streaming reader or a binary file gives the same key. The normal is
+    hashed normalised, as the split normalises it too, so e.g. (0, 0, 2) and (0, 0, 1) with the same offset give the same key (the
+    offset is a distance along the unit normal, so it is not rescaled).
+
+    Args:
+        quadrilateral_position_dict (dict): The given json file, the primary source of all data.
+        plane_normal (tuple): Normal of the cutting plane, pointing to the dry side.
+        plane_offset (float): Offset of the cutting plane along its normal, the plane being n.x = offset.
+        mode (str): One of 'CACHE_MODES'.
+        tolerance (float): The tolerance of the split (see 'slice_quadrilateral_arrays'), or None.
+
+    Returns:
+        key (str): The hexadecimal hash.
+
+    Raises:
+        KeyError: If 'p' or 'q' does not exist in 'quadrilateral_position_dict'
+        ValueError: If 'plane_normal' has zero length.
+    """
+
+    for key in ['q', 'p']:
+        if key not in quadrilateral_position_dict:
+            raise KeyError(f"The key '{key}' does not exist in the dictionary 'quadrilateral_position_dict'")
+
+    plane_normal = np.asarray(plane_normal, dtype=np.float64).reshape(3)
+    length = np.linalg.norm(plane_normal)
+    if length == 0:
+        raise ValueError("'plane_normal' must not have zero length")
+
+    arrays = [np.ascontiguousarray(quadrilateral_position_dict['p'], dtype=np.float64).reshape(-1, 3),
+              np.ascontiguousarray(quadrilateral_position_dict['q'], dtype=np.int64),
+              plane_normal / length, np.asarray([plane_offset], dtype=np.float64)]
+
+    digest = hashlib.sha256(f'{CACHE_FORMAT_VERSION}:{mode}:{None if tolerance is None else float(tolerance)!r}'.encode())
+    for array in arrays:
+        digest.update(repr(array.shape).encode()) #Keeps e.g. (N, 4) and (N / 2, 8) quads apart
+        digest.update(array.tobytes())
+
+    return(digest.hexdigest())
+
+
+def _flatten_results(results):
+
+    #Each side's arrays under names like 'dry_q_offsets', as 'np.savez' stores a flat set of named arrays
+    arrays = {}
+    for side, result in zip(['dry', 'wet'], results):
+        if isinstance(result, PolygonSoup):
+            arrays[f'{side}_vertices'], arrays[f'{side}_offsets'] = result.vertices, result.offsets
+        else:
+            arrays[f'{side}_q_vertices'], arrays[f'{side}_q_offsets'], arrays[f'{side}_p'] = result['q'].vertices, result['q'].offsets, result['p']
+
+    return(arrays)
+
+
+def _unflatten_results(arrays):
+
+    results = []
+    for side in ['dry', 'wet']:
+        if f'{side}_vertices' in arrays:
+            results.append(PolygonSoup(arrays[f'{side}_vertices'], arrays[f'{side}_offsets']))
+        else:
+            results.append({'q': PolygonSoup(arrays[f'{side}_q_vertices'], arrays[f'{side}_q_offsets']), 'p': arrays[f'{side}_p']})
+
+    return(tuple(results))
+
+
+class ResultCache:
+
+    """
+    Persistent, content-addressed cache of dry/wet split results, one '.npz' file per entry in 'directory', keyed by 'cache_key'.
+    The cache is bounded to 'max_bytes' on disk with least recently used eviction: an entry's modification time is its last use, so
+    the entries untouched the longest are deleted first once the limit is passed. Entries are written to a temporary file and moved
+    into place, so several processes (e.g. the workers of 'batch_runner.py') can share one cache directory.
+
+    Args:
+        directory (str): The cache directory, created if needed.
+        max_bytes (int): The most bytes the cache's entries may take up on disk.
+
+    Raises:
+        TypeError: If 'directory' is not a string
+        TypeError: If 'max_bytes' is not an int
+        ValueError: If 'max_bytes' is negative.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_CACHE_BYTES):
+
+        if not isinstance(directory, (str)):
+            raise TypeError("'directory' argument must be a string")
+        elif not isinstance(max_bytes, (int)):
+            raise TypeError("'max_bytes' argument must be an int")
+        elif max_bytes < 0:
+            raise ValueError("'max_bytes' argument must not be negative")
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+
+        return(os.path.join(self.directory, key + CACHE_EXTENSION))
+
+    def _entries(self):
+
+        #(last used, size, path) of every entry, least recently used first
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(CACHE_EXTENSION):
+                try:
+                    status = os.stat(os.path.join(self.directory, name))
+                except FileNotFoundError: #Evicted by another process meanwhile
+                    continue
+                entries.append((status.st_mtime_ns, status.st_size, os.path.join(self.directory, name)))
+
+        return(sorted(entries))
+
+    @property
+    def size(self):
+
+        #The bytes taken up on disk by the cache's entries
+        return(sum(size for _, size, _ in self._entries()))
+
+    def __len__(self):
+
+        return(len(self._entries()))
+
+    def __contains__(self, key):
+
+        return(os.path.exists(self._path(key)))
+
+    def get(self, key):
+
+        """
+        The results stored under 'key', marking the entry as the most recently used.
+
+        Args:
+            key (str): The key, from 'cache_key'.
+
+        Returns:
+            results (tuple): The dry and wet results as they were stored, or None if there is no such entry (an unreadable entry is
+                deleted, and also gives None).
+
+        Raises:
+            None
+        """
+
+        path = self._path(key)
+        try:
+            with np.load(path) as arrays:
+                results = _unflatten_results({name: arrays[name] for name in arrays.files})
+            os.utime(path)
+        except FileNotFoundError: #Missing, or evicted meanwhile
+            return(None)
+        except (zipfile.BadZipFile, EOFError, KeyError, ValueError, OSError): #Unreadable, e.g. truncated: deleted, and treated as a miss
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            return(None)
+
+        return(results)
+
+    def put(self, key, results):
+
+        """
+        Stores the dry and wet results of a split under 'key', then evicts the least recently used entries until the cache fits within
+        'max_bytes'. A result larger than 'max_bytes' on its own is not kept.
+
+        Args:
+            key (str): The key, from 'cache_key'.
+            results (tuple): The dry and wet results, each a PolygonSoup or a dict with 'q' as a PolygonSoup of indices and 'p' as an array.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+
+        handle, temporary_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as f:
+                np.savez(f, **_flatten_results(results))
+            if os.path.getsize(temporary_path) > self.max_bytes:
+                os.remove(temporary_path)
+                return
+            os.replace(temporary_path, self._path(key))
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+        self.evict()
+
+    def evict(self):
+
+        """
+        Deletes the least recently used entries until the cache fits within 'max_bytes'.
+
+        Args:
+            None
+
+        Returns:
+            evicted_count (int): The number of entries deleted.
+
+        Raises:
+            None
+        """
+
+        entries = self._entries()
+        total_bytes = sum(size for _, size, _ in entries)
+        evicted_count = 0
+
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+            evicted_count += 1
+
+        return(evicted_count)
+
+    def clear(self):
+
+        #Deletes every entry
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def split_up_quadrilateral_data_cached(quadrilateral_position_dict, cache, plane_normal=(0.0, 0.0, 1.0), plane_offset=0.0, mode='indexed', instrumentation=None,
+                                       tolerance=None):
+
+    """
+    'split_up_quadrilateral_data_indexed' (or, with mode='soup', 'split_up_quadrilateral_data_vectorised' with polygon_soup=True)
+    through a 'ResultCache': an identical mesh split along an identical plane before is loaded rather than split again, so a repeated
+    split costs a hash and a load.
+
+    Args:
+        quadrilateral_position_dict (dict): The given json file, the primary source of all data.
+        cache (ResultCache): The cache to look in and add to.
+        plane_normal (tuple): Normal of the cutting plane, pointing to the dry side. See 'waterplane' for heel/trim planes.
+        plane_offset (float): Offset of the cutting plane along its normal, the plane being n.x = offset.
+        mode (str): One of 'CACHE_MODES'.
+        instrumentation (Instrumentation): If given, 'cache_hits' or 'cache_misses' is counted, and a miss records the split's counters.
+        tolerance (float): If given, the tolerance aware split is used (see 'slice_quadrilateral_arrays').
+
+    Returns:
+        dry_result (dict or PolygonSoup): As returned by the split, for the shapes above the plane.
+        wet_result (dict or PolygonSoup): As returned by the split, for the shapes below the plane.
+
+    Raises:
+        TypeError: If 'cache' is not a ResultCache
+        ValueError: If 'mode' is not one of 'CACHE_MODES'.
+        KeyError: If 'p' or 'q' does not exist in 'quadrilateral_position_dict'
+    """
+
+    if not isinstance(cache, (ResultCache)):
+        raise TypeError("'cache' argument must be a ResultCache")
+    elif mode not in CACHE_MODES:
+        raise ValueError(f"'mode' argument must be one of {CACHE_MODES}")
+
+    key = cache_key(quadrilateral_position_dict, plane_normal, plane_offset, mode, tolerance)
+    results = cache.get(key)
+
+    if results is not None:
+        if instrumentation is not None:
+            instrumentation.count('cache_hits')
+        return(results)
+
+    if instrumentation is not None:
+        instrumentation.count('cache_misses')
+
+    if mode == 'indexed':
+        results = split_up_quadrilateral_data_indexed(quadrilateral_position_dict, plane_normal, plane_offset, instrumentation, tolerance)
+    else:
+        results = split_up_quadrilateral_data_vectorised(quadrilateral_position_dict, plane_normal, plane_offset, instrumentation, polygon_soup=True, tolerance=tolerance)
+
+    cache.put(key, results)
+
+    return(tuple(results))
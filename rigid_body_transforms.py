@@ -0,0 +1,171 @@
+import numpy as np
+from quadrilateral_slicing import _check_points_and_quads, _check_quadrilateral_position_dict, _quadrilateral_position_arrays, _slice_gathered_quadrilaterals, padded_polygons_to_lists
+
+
+def rotation_matrix(heel_angle=0.0, trim_angle=0.0, yaw_angle=0.0):
+
+    """
+    Builds the rotation matrix (or matrices) for a hull heeled (rotated about the x-axis), trimmed (about the y-axis) and yawed (about
+    the z-axis), applied in that order, i.e. R = Rz(yaw) @ Ry(trim) @ Rx(heel). Angles may be scalars or equal length arrays.
+
+    Args:
+        heel_angle (float): Heel angle(s) in degrees.
+        trim_angle (float): Trim angle(s) in degrees.
+        yaw_angle (float): Yaw angle(s) in degrees.
+
+    Returns:
+        rotation (np.ndarray): (3, 3) rotation matrix, or (K, 3, 3) if any angle is given as an array of K angles.
+
+    Raises:
+        None
+    """
+
+    heel, trim, yaw = [np.radians(angle) for angle in np.broadcast_arrays(np.asarray(heel_angle, dtype=np.float64), np.asarray(trim_angle, dtype=np.float64), np.asarray(yaw_angle, dtype=np.float64))]
+    zeros, ones = np.zeros_like(heel), np.ones_like(heel)
+
+    rotation_x = np.stack([np.stack([ones, zeros, zeros], -1), np.stack([zeros, np.cos(heel), -np.sin(heel)], -1), np.stack([zeros, np.sin(heel), np.cos(heel)], -1)], -2)
+    rotation_y = np.stack([np.stack([np.cos(trim), zeros, np.sin(trim)], -1), np.stack([zeros, ones, zeros], -1), np.stack([-np.sin(trim), zeros, np.cos(trim)], -1)], -2)
+    rotation_z = np.stack([np.stack([np.cos(yaw), -np.sin(yaw), zeros], -1), np.stack([np.sin(yaw), np.cos(yaw), zeros], -1), np.stack([zeros, zeros, ones], -1)], -2)
+
+    return(rotation_z @ rotation_y @ rotation_x)
+
+
+def pose_matrices(heel_angles=0.0, trim_angles=0.0, yaw_angles=0.0, translations=(0.0, 0.0, 0.0)):
+
+    """
+    Builds a batch of 4x4 homogeneous rigid-body transforms, world = R @ point + t, one per pose. Every argument may be a single
+    value (shared by all poses) or one value per pose.
+
+    Args:
+        heel_angles (np.ndarray): (K,) heel angles in degrees.
+        trim_angles (np.ndarray): (K,) trim angles in degrees.
+        yaw_angles (np.ndarray): (K,) yaw angles in degrees.
+        translations (np.ndarray): (K, 3) translations, e.g. [0, 0, -draft] to sink the hull.
+
+    Returns:
+        transforms (np.ndarray): (K, 4, 4) array of homogeneous transforms.
+
+    Raises:
+        ValueError: If the arguments describe different numbers of poses.
+    """
+
+    rotations = rotation_matrix(heel_angles, trim_angles, yaw_angles).reshape(-1, 3, 3) #(K, 3, 3), also for a single pose
+    translations = np.atleast_2d(np.asarray(translations, dtype=np.float64))
+
+    try:
+        pose_count = np.broadcast_shapes((len(rotations),), (len(translations),))[0]
+    except ValueError:
+        raise ValueError("The pose arguments must describe the same number of poses")
+
+    transforms = np.zeros((pose_count, 4, 4))
+    transforms[:, :3, :3] = rotations
+    transforms[:, :3, 3] = translations
+    transforms[:, 3, 3] = 1.0
+
+    return(transforms)
+
+
+def transform_points(points, transforms):
+
+    """
+    Applies a batch of rigid-body transforms to the whole point array at once, as a single matrix multiply.
+
+    Args:
+        points (np.ndarray): (V, 3) array of positions in 3D space (the 'p' data).
+        transforms (np.ndarray): (K, 4, 4) array of homogeneous transforms (see 'pose_matrices'), or a single (4, 4) transform.
+
+    Returns:
+        transformed_points (np.ndarray): (K, V, 3) array of the points in each pose, or (V, 3) for a single transform.
+
+    Raises:
+        ValueError: If 'points' is not of shape (V, 3).
+        ValueError: If 'transforms' is not of shape (K, 4, 4) or (4, 4).
+    """
+
+    points = np.asarray(points, dtype=np.float64)
+    transforms = np.asarray(transforms, dtype=np.float64)
+
+    if points.ndim != 2 or points.shape[1] != 3:
+        raise ValueError("'points' argument must be of shape (V, 3)")
+    elif transforms.shape[-2:] != (4, 4) or transforms.ndim not in (2, 3):
+        raise ValueError("'transforms' argument must be of shape (K, 4, 4) or (4, 4)")
+
+    return(points @ np.swapaxes(transforms[..., :3, :3], -1, -2) + transforms[..., None, :3, 3])
+
+
+def slice_quadrilateral_arrays_by_poses(points, quads, transforms, plane_normal=(0.0, 0.0, 1.0), plane_offset=0.0):
+
+    """
+    Splits a mesh at a batch of rigid-body poses against one (world frame) plane. Every pose's points come from one matrix multiply
+    ('transform_points'), and all K poses are then gathered and sliced together as a single (K * N) batch of quadrilaterals, so a
+    sweep over poses involves no Python loop and no list-of-lists data.
+
+    When only the cut in the mesh's own frame is needed, moving the plane instead of the points ('slice_quadrilateral_arrays_by_planes'
+    with 'waterplane') is cheaper still.
+
+    Args:
+        points (np.ndarray): (V, 3) array of positions in 3D space (the 'p' data), in the mesh's own frame.
+        quads (np.ndarray): (N, 4) int array of indices into 'points' (the 'q' data).
+        transforms (np.ndarray): (K, 4, 4) array of homogeneous transforms, see 'pose_matrices'.
+        plane_normal (tuple): Normal of the cutting plane, pointing to the dry side.
+        plane_offset (float): Offset of the cutting plane along its normal, the plane being n.x = offset.
+
+    Returns:
+        dry_polygons (np.ndarray): (K, N, 6, 3) array of the dry polygons in the world frame, zero padded.
+        dry_counts (np.ndarray): (K, N) array of the number of corners of each dry polygon (0 if there is none).
+        wet_polygons (np.ndarray): (K, N, 6, 3) array of the wet polygons in the world frame, zero padded.
+        wet_counts (np.ndarray): (K, N) array of the number of corners of each wet polygon (0 if there is none).
+
+    Raises:
+        ValueError: If 'points' is not of shape (V, 3), or 'quads' is not of shape (N, 4).
+        ValueError: If 'transforms' is not of shape (K, 4, 4).
+        ValueError: If 'plane_normal' is zero.
+    """
+
+    points, quads = _check_points_and_quads(points, quads)
+    transforms = np.asarray(transforms, dtype=np.float64)
+
+    if transforms.ndim != 3:
+        raise ValueError("'transforms' argument must be of shape (K, 4, 4)")
+
+    plane_normal = np.asarray(plane_normal, dtype=np.float64)
+    if not np.any(plane_normal):
+        raise ValueError("'plane_normal' argument must not be zero")
+    plane_normal = plane_normal / np.linalg.norm(plane_normal)
+
+    posed_points = transform_points(points, transforms)
+    signed_distances = posed_points @ plane_normal - plane_offset
+
+    pose_count, quad_count = len(transforms), len(quads)
+    results = _slice_gathered_quadrilaterals(posed_points[:, quads].reshape(-1, 4, 3), signed_distances[:, quads].reshape(-1, 4))
+
+    return(tuple(result.reshape(pose_count, quad_count, *result.shape[1:]) for result in results))
+
+
+def split_up_quadrilateral_data_by_poses(quadrilateral_position_dict, transforms, plane_normal=(0.0, 0.0, 1.0), plane_offset=0.0):
+
+    """
+    Splits the same mesh at many rigid-body poses in one pass (see 'slice_quadrilateral_arrays_by_poses').
+
+    Args:
+        quadrilateral_position_dict (dict): The given json file, the primary source of all data.
+        transforms (np.ndarray): (K, 4, 4) array of homogeneous transforms, see 'pose_matrices'.
+        plane_normal (tuple): Normal of the cutting plane, pointing to the dry side.
+        plane_offset (float): Offset of the cutting plane along its normal, the plane being n.x = offset.
+
+    Returns:
+        pose_results (list): K tuples of (dry_quadrilateral_xyz_positions, wet_quadrilateral_xyz_positions), one per pose, in the
+            world frame.
+
+    Raises:
+        TypeError: If 'quadrilateral_position_dict' is not a dict
+        KeyError: If 'p' or 'q' does not exist in 'quadrilateral_position_dict'
+    """
+
+    _check_quadrilateral_position_dict(quadrilateral_position_dict)
+
+    dry_polygons, dry_counts, wet_polygons, wet_counts = slice_quadrilateral_arrays_by_poses(*_quadrilateral_position_arrays(quadrilateral_position_dict),
+                                                                                             transforms, plane_normal, plane_offset)
+
+    return([(padded_polygons_to_lists(dry_polygons[pose], dry_counts[pose]), padded_polygons_to_lists(wet_polygons[pose], wet_counts[pose]))
+            for pose in range(len(dry_counts))])
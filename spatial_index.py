@@ -0,0 +1,460 @@
+import math
+import os
+import numpy as np
+from polygon_soup import PolygonSoup
+from quadrilateral_slicing import _check_points_and_quads, _check_quadrilateral_position_dict, padded_polygons_to_lists, plane_signed_distances, slice_quadrilateral_arrays
+
+
+#The average number of quadrilaterals per grid cell: queries test every cell's bounds, then the quadrilaterals of the matching cells
+DEFAULT_QUADS_PER_CELL = 64
+
+#Labels given by 'SpatialIndex.classify_quadrilaterals': wholly dry, wholly wet, or straddling the plane (and so to be split)
+DRY_QUADRILATERAL, WET_QUADRILATERAL, CANDIDATE_QUADRILATERAL = 0, 1, 2
+
+#Appended to a mesh file's path to give the path of its saved index, e.g. 'hull.qpb' -> 'hull.qpb.qpi.npz'
+SPATIAL_INDEX_EXTENSION = '.qpi.npz'
+
+
+def _gather_ranges(starts, stops):
+
+    #The concatenation of arange(start, stop) over every range, without a Python loop
+    lengths = stops - starts
+    return(np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum()))
+
+
+def _box_signed_distance_ranges(lower, upper, plane_normal, plane_offset):
+
+    #The smallest and largest signed distance of any point of each axis aligned box from the plane n.x = offset
+    plane_normal = np.asarray(plane_normal, dtype=np.float64)
+    length = np.linalg.norm(plane_normal)
+    if length == 0:
+        raise ValueError("'plane_normal' argument must not have zero length")
+    plane_normal = plane_normal / length
+
+    centre_distances = (lower + upper) / 2 @ plane_normal - plane_offset
+    radii = (upper - lower) / 2 @ np.abs(plane_normal)
+
+    #Widened by a bound on the rounding error, so a box is only ever said to lie wholly to one side when each of its corners'
+    #distances (as computed by 'plane_signed_distances') certainly does
+    margins = 8 * np.finfo(np.float64).eps * ((np.abs(lower) + np.abs(upper)) @ np.abs(plane_normal) + abs(plane_offset))
+
+    return(centre_distances - radii - margins, centre_distances + radii + margins)
+
+
+class SpatialIndex:
+
+    """
+    Uniform grid over the bounding boxes of a mesh's quadrilaterals, built once (see 'build') and saved alongside the mesh, so that
+    region of interest and waterline queries only look at the quadrilaterals that can possibly match.
+
+    Each quadrilateral is placed in the grid cell holding the centre of its bounding box, and the quadrilaterals are stored sorted
+    by cell, so every cell's quadrilaterals are contiguous. Each non-empty cell keeps the union of its quadrilaterals' bounding
+    boxes, which may reach past the cell itself, so no quadrilateral needs listing twice. A query tests the bounds of every
+    cell (around N / 'DEFAULT_QUADS_PER_CELL' of them) in one vectorised pass, then only the quadrilaterals of the cells that match.
+
+    Args:
+        quad_order (np.ndarray): (N,) int array of the quadrilaterals' indices, sorted by cell.
+        quad_lower (np.ndarray): (N, 3) array of the lower corner of each quadrilateral's bounding box, in 'quad_order'.
+        quad_upper (np.ndarray): (N, 3) array of the upper corners, in 'quad_order'.
+        cell_offsets (np.ndarray): (C + 1,) int array, cell c holding the quadrilaterals at positions cell_offsets[c]:cell_offsets[c + 1].
+        cell_lower (np.ndarray): (C, 3) array of the lower corner of each cell's bounds.
+        cell_upper (np.ndarray): (C, 3) array of the upper corners.
+        point_count (int): The number of points of the indexed mesh, used to detect a stale index.
+
+    Raises:
+        ValueError: If the arrays are inconsistent in length.
+    """
+
+    def __init__(self, quad_order, quad_lower, quad_upper, cell_offsets, cell_lower, cell_upper, point_count):
+
+        self.quad_order = np.asarray(quad_order, dtype=np.int64)
+        self.quad_lower = np.asarray(quad_lower, dtype=np.float64).reshape(-1, 3)
+        self.quad_upper = np.asarray(quad_upper, dtype=np.float64).reshape(-1, 3)
+        self.cell_offsets = np.asarray(cell_offsets, dtype=np.int64)
+        self.cell_lower = np.asarray(cell_lower, dtype=np.float64).reshape(-1, 3)
+        self.cell_upper = np.asarray(cell_upper, dtype=np.float64).reshape(-1, 3)
+        self.point_count = int(point_count)
+
+        if not len(self.quad_order) == len(self.quad_lower) == len(self.quad_upper) == self.cell_offsets[-1]:
+            raise ValueError("'quad_order', 'quad_lower', 'quad_upper' and 'cell_offsets' must describe the same quadrilaterals")
+        elif not len(self.cell_offsets) - 1 == len(self.cell_lower) == len(self.cell_upper):
+            raise ValueError("'cell_offsets', 'cell_lower' and 'cell_upper' must describe the same cells")
+
+    @classmethod
+    def build(cls, points, quads, quads_per_cell=DEFAULT_QUADS_PER_CELL):
+
+        """
+        Builds the index of a mesh. The grid spans the mesh's bounding box with roughly cubic cells, sized for 'quads_per_cell'
+        quadrilaterals each on average (flat meshes get a single layer of cells across their flat axis).
+
+        Args:
+            points (np.ndarray): (V, 3) array of positions in 3D space (the 'p' data).
+            quads (np.ndarray): (N, 4) int array of indices into 'points' (the 'q' data).
+            quads_per_cell (int): The average number of quadrilaterals per cell.
+
+        Returns:
+            spatial_index (SpatialIndex): The index.
+
+        Raises:
+            ValueError: If 'points' is not of shape (V, 3).
+            ValueError: If 'quads' is not of shape (N, 4).
+            ValueError: If 'quads_per_cell' is less than 1.
+        """
+
+        if quads_per_cell < 1:
+            raise ValueError("'quads_per_cell' argument must be at least 1")
+
+        points, quads = _check_points_and_quads(points, quads)
+        if len(quads) == 0:
+            return(cls(np.zeros(0), np.zeros((0, 3)), np.zeros((0, 3)), [0], np.zeros((0, 3)), np.zeros((0, 3)), len(points)))
+
+        quad_xyz_coordinates = points[quads]
+        quad_lower, quad_upper = quad_xyz_coordinates.min(axis=1), quad_xyz_coordinates.max(axis=1)
+
+        mesh_lower, mesh_upper = quad_lower.min(axis=0), quad_upper.max(axis=0)
+        extents = mesh_upper - mesh_lower
+        spanned = extents > 0
+
+        #Cell edge length giving about len(quads) / quads_per_cell cells over the axes the mesh spans
+        target_cell_count = max(1, math.ceil(len(quads) / quads_per_cell))
+        spanned_axes = max(1, np.count_nonzero(spanned))
+        cell_size = (np.prod(extents[spanned]) / target_cell_count) ** (1 / spanned_axes)
+        grid_shape = np.where(spanned, np.ceil(extents / (cell_size if cell_size > 0 else 1.0)), 1).astype(np.int64)
+
+        centres = (quad_lower + quad_upper) / 2
+        cell_coordinates = np.minimum(((centres - mesh_lower) / np.where(spanned, extents, 1.0) * grid_shape).astype(np.int64), grid_shape - 1)
+        cell_ids = np.ravel_multi_index(tuple(cell_coordinates.T), tuple(grid_shape))
+
+        quad_order = np.argsort(cell_ids, kind='stable')
+        sorted_cell_ids = cell_ids[quad_order]
+        cell_starts = np.flatnonzero(np.concatenate([[True], sorted_cell_ids[1:] != sorted_cell_ids[:-1]]))
+
+        quad_lower, quad_upper = quad_lower[quad_order], quad_upper[quad_order]
+
+        return(cls(quad_order, quad_lower, quad_upper, np.append(cell_starts, len(quads)), np.minimum.reduceat(quad_lower, cell_starts, axis=0),
+                   np.maximum.reduceat(quad_upper, cell_starts, axis=0), len(points)))
+
+    def __len__(self):
+
+        #The number of quadrilaterals indexed
+        return(len(self.quad_order))
+
+    @property
+    def cell_count(self):
+
+        return(len(self.cell_offsets) - 1)
+
+    @property
+    def nbytes(self):
+
+        #The memory held by the index's arrays
+        return(sum(array.nbytes for array in [self.quad_order, self.quad_lower, self.quad_upper, self.cell_offsets, self.cell_lower, self.cell_upper]))
+
+    def _candidate_positions(self, matching_cells):
+
+        #Positions (into the sorted arrays) of the quadrilaterals of the matching cells
+        cells = np.flatnonzero(matching_cells)
+        return(_gather_ranges(self.cell_offsets[cells], self.cell_offsets[cells + 1]))
+
+    def query_box(self, lower, upper):
+
+        """
+        The quadrilaterals whose bounding boxes overlap an axis aligned box, e.g. a region of interest around the bow or a moonpool.
+        Use -np.inf/np.inf for unbounded axes, e.g. lower=(-np.inf, -np.inf, -1) and upper=(np.inf, np.inf, 1) for a band of z.
+
+        Args:
+            lower (tuple): The lower corner (x, y, z) of the box.
+            upper (tuple): The upper corner (x, y, z) of the box.
+
+        Returns:
+            quad_indices (np.ndarray): Sorted int array of the indices of the matching quadrilaterals.
+
+        Raises:
+            None
+        """
+
+        lower, upper = np.asarray(lower, dtype=np.float64), np.asarray(upper, dtype=np.float64)
+
+        matching_cells = np.all((self.cell_lower <= upper) & (self.cell_upper >= lower), axis=1)
+        positions = self._candidate_positions(matching_cells)
+        matching = np.all((self.quad_lower[positions] <= upper) & (self.quad_upper[positions] >= lower), axis=1)
+
+        return(np.sort(self.quad_order[positions[matching]]))
+
+    def query_plane(self, plane_normal=(0.0, 0.0, 1.0), plane_offset=0.0, lower=None, upper=None):
+
+        """
+        The quadrilaterals whose bounding boxes straddle a plane, i.e. the only ones that can need splitting by it (any other
+        quadrilateral is wholly dry or wholly wet), optionally within a region of interest. Cells wholly to one side of the plane are
+        skipped unopened, so a sweep of many planes costs little more than the quadrilaterals near each waterline.
+
+        Args:
+            plane_normal (tuple): Normal of the cutting plane, pointing to the dry side.
+            plane_offset (float): Offset of the cutting plane along its normal, the plane being n.x = offset.
+            lower (tuple): If given with 'upper', the lower corner of a region of interest (see 'query_box').
+            upper (tuple): The upper corner of the region of interest.
+
+        Returns:
+            quad_indices (np.ndarray): Sorted int array of the indices of the candidate quadrilaterals.
+
+        Raises:
+            ValueError: If 'plane_normal' has zero length.
+        """
+
+        in_region = lower is not None and upper is not None
+        if in_region:
+            lower, upper = np.asarray(lower, dtype=np.float64), np.asarray(upper, dtype=np.float64)
+
+        smallest, largest = _box_signed_distance_ranges(self.cell_lower, self.cell_upper, plane_normal, plane_offset)
+        matching_cells = (smallest < 0) & (largest >= 0) #As in the split, a point at distance 0 is dry
+        if in_region:
+            matching_cells &= np.all((self.cell_lower <= upper) & (self.cell_upper >= lower), axis=1)
+
+        positions = self._candidate_positions(matching_cells)
+        smallest, largest = _box_signed_distance_ranges(self.quad_lower[positions], self.quad_upper[positions], plane_normal, plane_offset)
+        matching = (smallest < 0) & (largest >= 0)
+        if in_region:
+            matching &= np.all((self.quad_lower[positions] <= upper) & (self.quad_upper[positions] >= lower), axis=1)
+
+        return(np.sort(self.quad_order[positions[matching]]))
+
+    def classify_quadrilaterals(self, plane_normal=(0.0, 0.0, 1.0), plane_offset=0.0):
+
+        """
+        Labels every quadrilateral as wholly dry, wholly wet, or a candidate for splitting, by a plane. Whole cells to one side of the
+        plane are labelled from the cell's bounds without looking at their quadrilaterals; only those of the cells straddling the
+        plane are labelled from their own bounds. The candidates are a superset of the quadrilaterals the plane actually cuts.
+
+        Args:
+            plane_normal (tuple): Normal of the cutting plane, pointing to the dry side.
+            plane_offset (float): Offset of the cutting plane along its normal, the plane being n.x = offset.
+
+        Returns:
+            labels (np.ndarray): (N,) int8 array of 'DRY_QUADRILATERAL', 'WET_QUADRILATERAL' or 'CANDIDATE_QUADRILATERAL' per quadrilateral.
+
+        Raises:
+            ValueError: If 'plane_normal' has zero length.
+        """
+
+        labels = np.empty(len(self), dtype=np.int8)
+
+        smallest, largest = _box_signed_distance_ranges(self.cell_lower, self.cell_upper, plane_normal, plane_offset)
+        dry_cells, wet_cells = smallest >= 0, largest < 0 #As in the split, a point at distance 0 is dry
+        labels[self.quad_order[self._candidate_positions(dry_cells)]] = DRY_QUADRILATERAL
+        labels[self.quad_order[self._candidate_positions(wet_cells)]] = WET_QUADRILATERAL
+
+        positions = self._candidate_positions(~dry_cells & ~wet_cells)
+        smallest, largest = _box_signed_distance_ranges(self.quad_lower[positions], self.quad_upper[positions], plane_normal, plane_offset)
+        labels[self.quad_order[positions]] = np.where(smallest >= 0, DRY_QUADRILATERAL, np.where(largest < 0, WET_QUADRILATERAL, CANDIDATE_QUADRILATERAL))
+
+        return(labels)
+
+    def save(self, filename):
+
+        """
+        Saves the index as an uncompressed '.npz' file (see 'spatial_index_path' for where it is kept beside its mesh).
+
+        Args:
+            filename (str): The path of the file.
+
+        Returns:
+            filename (str): The path written.
+
+        Raises:
+            TypeError: If 'filename' is not a string
+        """
+
+        if not isinstance(filename, (str)):
+            raise TypeError("'filename' argument must be a string")
+
+        with open(filename, 'wb') as f:
+            np.savez(f, quad_order=self.quad_order, quad_lower=self.quad_lower, quad_upper=self.quad_upper, cell_offsets=self.cell_offsets,
+                     cell_lower=self.cell_lower, cell_upper=self.cell_upper, point_count=np.array(self.point_count))
+
+        return(filename)
+
+    @classmethod
+    def load(cls, filename):
+
+        """
+        Loads an index saved by 'save'.
+
+        Args:
+            filename (str): The path of the file.
+
+        Returns:
+            spatial_index (SpatialIndex): The index.
+
+        Raises:
+            TypeError: If 'filename' is not a string
+        """
+
+        if not isinstance(filename, (str)):
+            raise TypeError("'filename' argument must be a string")
+
+        with np.load(filename) as arrays:
+            return(cls(**{name: arrays[name] for name in arrays.files}))
+
+
+def spatial_index_path(mesh_filename):
+
+    #The saved index of a mesh file lives beside it, e.g. 'hull.qpb' -> 'hull.qpb.qpi.npz'
+    return(mesh_filename + SPATIAL_INDEX_EXTENSION)
+
+
+def load_or_build_spatial_index(mesh_filename, quadrilateral_position_dict, quads_per_cell=DEFAULT_QUADS_PER_CELL):
+
+    """
+    The index saved beside a mesh file, or if there is none (or it is older than the mesh, or indexes a different number of points or
+    quadrilaterals), a newly built one, which is then saved beside the mesh for next time.
+
+    Args:
+        mesh_filename (str): The path of the mesh file.
+        quadrilateral_position_dict (dict): The mesh, as read from 'mesh_filename'.
+        quads_per_cell (int): The average number of quadrilaterals per cell of a newly built index.
+
+    Returns:
+        spatial_index (SpatialIndex): The index.
+
+    Raises:
+        TypeError: If 'quadrilateral_position_dict' is not a dict
+        KeyError: If 'p' or 'q' does not exist in 'quadrilateral_position_dict'
+    """
+
+    _check_quadrilateral_position_dict(quadrilateral_position_dict)
+
+    index_filename = spatial_index_path(mesh_filename)
+
+    if os.path.exists(index_filename) and os.path.getmtime(index_filename) >= os.path.getmtime(mesh_filename):
+        spatial_index = SpatialIndex.load(index_filename)
+        if spatial_index.point_count == len(quadrilateral_position_dict['p']) and len(spatial_index) == len(quadrilateral_position_dict['q']):
+            return(spatial_index)
+
+    spatial_index = SpatialIndex.build(quadrilateral_position_dict['p'], quadrilateral_position_dict['q'], quads_per_cell)
+    spatial_index.save(index_filename)
+
+    return(spatial_index)
+
+
+def split_up_quadrilateral_data_in_region(quadrilateral_position_dict, spatial_index, lower, upper, plane_normal=(0.0, 0.0, 1.0), plane_offset=0.0,
+                                          polygon_soup=False, tolerance=None):
+
+    """
+    Region of interest equivalent of 'split_up_quadrilateral_data_vectorised': only the quadrilaterals whose bounding boxes overlap
+    the box from 'lower' to 'upper' (found through 'spatial_index') are read and split, so the cost follows the size of the region
+    rather than of the mesh. The quadrilaterals are split whole, not clipped to the region, and give exactly the polygons the full
+    split gives them, in the same order.
+
+    Args:
+        quadrilateral_position_dict (dict): The given json file, with 'p' and 'q' as NumPy arrays.
+        spatial_index (SpatialIndex): The index of the mesh (see 'SpatialIndex.build' and 'load_or_build_spatial_index').
+        lower (tuple): The lower corner (x, y, z) of the region of interest.
+        upper (tuple): The upper corner (x, y, z) of the region of interest.
+        plane_normal (tuple): Normal of the cutting plane, pointing to the dry side. See 'waterplane' for heel/trim planes.
+        plane_offset (float): Offset of the cutting plane along its normal, the plane being n.x = offset.
+        polygon_soup (bool): If True, the polygons are returned as PolygonSoups instead of nested lists.
+        tolerance (float): If given, the tolerance aware split is used (see 'slice_quadrilateral_arrays').
+
+    Returns:
+        dry_quadrilateral_xyz_positions (list): All 3D coordinates for the 2D shapes existing above the plane, in the region.
+        wet_quadrilateral_xyz_positions (list): All 3D coordinates for the 2D shapes existing below the plane, in the region.
+        quad_indices (np.ndarray): Sorted int array of the indices of the quadrilaterals split.
+
+    Raises:
+        TypeError: If 'quadrilateral_position_dict' is not a dict, or its 'p' or 'q' is not a NumPy array
+        TypeError: If 'spatial_index' is not a SpatialIndex
+        KeyError: If 'p' or 'q' does not exist in 'quadrilateral_position_dict'
+        ValueError: If 'spatial_index' indexes a different mesh.
+    """
+
+    points, quads = _indexed_mesh_arrays(quadrilateral_position_dict, spatial_index)
+
+    quad_indices = spatial_index.query_box(lower, upper)
+    region_quads = quads[quad_indices].astype(np.int64)
+
+    #Only the points the region uses are gathered (and the plane distance measured), rather than all of 'p'
+    used_points, local_quads = np.unique(region_quads, return_inverse=True)
+    region_points = points[used_points].astype(np.float64)
+    signed_distances = plane_signed_distances(region_points, plane_normal, plane_offset)[0]
+
+    dry_polygons, dry_counts, wet_polygons, wet_counts = slice_quadrilateral_arrays(region_points, local_quads.reshape(-1, 4), signed_distances, tolerance)
+
+    if polygon_soup:
+        return(PolygonSoup.from_padded(dry_polygons, dry_counts), PolygonSoup.from_padded(wet_polygons, wet_counts), quad_indices)
+
+    return(padded_polygons_to_lists(dry_polygons, dry_counts), padded_polygons_to_lists(wet_polygons, wet_counts), quad_indices)
+
+
+def _indexed_mesh_arrays(quadrilateral_position_dict, spatial_index):
+
+    #'p' and 'q' as given (no conversion of the whole mesh per call), checked against the index
+    _check_quadrilateral_position_dict(quadrilateral_position_dict)
+
+    if not isinstance(spatial_index, (SpatialIndex)):
+        raise TypeError("'spatial_index' argument must be a SpatialIndex")
+
+    points, quads = quadrilateral_position_dict['p'], quadrilateral_position_dict['q']
+    if not isinstance(points, (np.ndarray)) or not isinstance(quads, (np.ndarray)):
+        raise TypeError("'p' and 'q' must be NumPy arrays (converted once, e.g. as 'read_geometry_file' reads them), not converted on every query")
+    elif len(spatial_index) != len(quads) or spatial_index.point_count != len(points):
+        raise ValueError("'spatial_index' does not index the quadrilaterals of 'quadrilateral_position_dict'")
+
+    return(points.reshape(-1, 3), quads.reshape(-1, 4))
+
+
+def split_up_quadrilateral_data_with_index(quadrilateral_position_dict, spatial_index, plane_normal=(0.0, 0.0, 1.0), plane_offset=0.0, polygon_soup=False):
+
+    """
+    Equivalent of 'split_up_quadrilateral_data_vectorised' (giving the same polygons, in the same order) that uses the index to avoid
+    per corner work away from the plane: quadrilaterals are labelled wholly dry or wet from their cells' bounds (see
+    'classify_quadrilaterals') and copied to their side as they are, and only the candidates near the plane have their corners'
+    distances measured and are split. Repeated splits of one mesh by many planes thus cost little more than copying the output.
+
+    Args:
+        quadrilateral_position_dict (dict): The given json file, with 'p' and 'q' as NumPy arrays.
+        spatial_index (SpatialIndex): The index of the mesh (see 'SpatialIndex.build' and 'load_or_build_spatial_index').
+        plane_normal (tuple): Normal of the cutting plane, pointing to the dry side. See 'waterplane' for heel/trim planes.
+        plane_offset (float): Offset of the cutting plane along its normal, the plane being n.x = offset.
+        polygon_soup (bool): If True, the polygons are returned as PolygonSoups instead of nested lists.
+
+    Returns:
+        dry_quadrilateral_xyz_positions (list): All 3D coordinates for the 2D shapes existing above the plane.
+        wet_quadrilateral_xyz_positions (list): All 3D coordinates for the 2D shapes existing below the plane.
+
+    Raises:
+        TypeError: If 'quadrilateral_position_dict' is not a dict, or its 'p' or 'q' is not a NumPy array
+        TypeError: If 'spatial_index' is not a SpatialIndex
+        KeyError: If 'p' or 'q' does not exist in 'quadrilateral_position_dict'
+        ValueError: If 'spatial_index' indexes a different mesh.
+        ValueError: If 'plane_normal' has zero length.
+    """
+
+    points, quads = _indexed_mesh_arrays(quadrilateral_position_dict, spatial_index)
+
+    labels = spatial_index.classify_quadrilaterals(plane_normal, plane_offset)
+    candidates = np.flatnonzero(labels == CANDIDATE_QUADRILATERAL)
+
+    used_points, local_quads = np.unique(quads[candidates].astype(np.int64), return_inverse=True)
+    candidate_points = points[used_points].astype(np.float64)
+    signed_distances = plane_signed_distances(candidate_points, plane_normal, plane_offset)[0]
+    dry_polygons, dry_counts, wet_polygons, wet_counts = slice_quadrilateral_arrays(candidate_points, local_quads.reshape(-1, 4), signed_distances)
+
+    soups = []
+    for label, polygons, candidate_counts in [(DRY_QUADRILATERAL, dry_polygons, dry_counts), (WET_QUADRILATERAL, wet_polygons, wet_counts)]:
+        #Whole quadrilaterals keep their four corners in order, as the split tables give them, and each polygon goes to its quadrilateral's place
+        whole = np.flatnonzero(labels == label)
+        counts = np.zeros(len(quads), dtype=np.int64)
+        counts[whole], counts[candidates] = 4, candidate_counts
+        starts = np.concatenate([[0], np.cumsum(counts)])[np.concatenate([whole, candidates])]
+        offsets = np.concatenate([[0], np.cumsum(counts[counts > 0])])
+
+        vertices = np.empty((offsets[-1], 3))
+        vertices[(starts[:len(whole), None] + np.arange(4)).reshape(-1)] = points[quads[whole]].reshape(-1, 3)
+        used = np.arange(polygons.shape[1]) < candidate_counts[:, None]
+        vertices[(starts[len(whole):, None] + np.arange(polygons.shape[1]))[used]] = polygons[used]
+        soups.append(PolygonSoup(vertices, offsets))
+
+    if polygon_soup:
+        return(tuple(soups))
+
+    return(soups[0].tolist(), soups[1].tolist())
@@ -0,0 +1,448 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from batch_runner import read_geometry_file
+from polygon_soup import PolygonSoup
+from quadrilateral_slicing import _check_points_and_quads, _slice_gathered_quadrilaterals, plane_signed_distances
+from rigid_body_transforms import pose_matrices
+
+
+#How long a split request waits for others against the same mesh to join its batch, and the most requests split in one batch
+DEFAULT_BATCH_WINDOW = 0.002
+DEFAULT_MAX_BATCH_SIZE = 64
+
+#The longest line (request or response) either side reads, as 'polygons' responses for large meshes run to many megabytes
+MAX_MESSAGE_BYTES = 1 << 30
+
+#What a split request gets back: 'summary' gives the polygon counts only, 'polygons' also the dry and wet polygons' coordinates
+OUTPUT_MODES = ['summary', 'polygons']
+
+
+def posed_mesh_planes(plane_normal, plane_offset, transform):
+
+    """
+    The plane n.x = offset, given in the world frame, expressed in the frame of a mesh posed by 'transform' (world = R @ point + t),
+    so that splitting the unmoved mesh by the returned plane cuts it exactly where the posed mesh is cut by the given one.
+
+    Args:
+        plane_normal (tuple): Normal of the plane in the world frame, pointing to the dry side.
+        plane_offset (float): Offset of the plane along its normal.
+        transform (np.ndarray): (4, 4) homogeneous transform, see 'pose_matrices'.
+
+    Returns:
+        mesh_normal (np.ndarray): (3,) unit normal of the plane in the mesh's frame.
+        mesh_offset (float): Offset of the plane in the mesh's frame.
+
+    Raises:
+        ValueError: If 'plane_normal' is zero.
+    """
+
+    plane_normal = np.asarray(plane_normal, dtype=np.float64)
+    if not np.any(plane_normal):
+        raise ValueError("'plane_normal' argument must not be zero")
+
+    length = np.linalg.norm(plane_normal)
+    plane_normal, plane_offset = plane_normal / length, plane_offset / length
+
+    return(transform[:3, :3].T @ plane_normal, float(plane_offset - plane_normal @ transform[:3, 3]))
+
+
+def split_mesh_batch(points, quads, mesh_normals, mesh_offsets, transforms):
+
+    """
+    Splits one resident mesh for a batch of requests. Each request's plane is given in the mesh's frame (see 'posed_mesh_planes'), so
+    the corners are gathered once for the whole batch, and requests asking for the same plane are split only once. The planes are
+    split one at a time, each plane's padded (N, 6, 3) arrays being turned into its requests' PolygonSoups (moved into the world frame
+    by each request's transform) before the next plane is split, so the peak memory does not grow with the batch.
+
+    Args:
+        points (np.ndarray): (V, 3) array of positions in 3D space (the 'p' data).
+        quads (np.ndarray): (N, 4) int array of indices into 'points' (the 'q' data).
+        mesh_normals (np.ndarray): (K, 3) array of the requests' plane normals in the mesh's frame.
+        mesh_offsets (np.ndarray): (K,) array of the requests' plane offsets in the mesh's frame.
+        transforms (np.ndarray): (K, 4, 4) array of the requests' poses.
+
+    Returns:
+        request_results (list): K tuples of (dry_soup, wet_soup), PolygonSoups of the dry and wet polygons in the world frame.
+
+    Raises:
+        None
+    """
+
+    points, quads = _check_points_and_quads(points, quads)
+    planes, request_planes = np.unique(np.column_stack([mesh_normals, mesh_offsets]), axis=0, return_inverse=True)
+    request_planes = request_planes.reshape(-1)
+
+    quad_xyz_coordinates = points[quads]
+    request_results = [None] * len(request_planes)
+
+    for plane_number, plane in enumerate(planes):
+        signed_distances = plane_signed_distances(points, plane[:3], plane[3])[0]
+        dry_polygons, dry_counts, wet_polygons, wet_counts = _slice_gathered_quadrilaterals(quad_xyz_coordinates, signed_distances[quads])
+
+        for request in np.flatnonzero(request_planes == plane_number):
+            soups = [PolygonSoup.from_padded(dry_polygons, dry_counts), PolygonSoup.from_padded(wet_polygons, wet_counts)]
+            transform = transforms[request]
+            if not np.array_equal(transform, np.eye(4)): #Unmoved meshes skip the transform, and only the used corners are moved
+                soups = [PolygonSoup(soup.vertices @ transform[:3, :3].T + transform[:3, 3], soup.offsets) for soup in soups]
+            request_results[request] = tuple(soups)
+
+    return(request_results)
+
+
+class SplitService:
+
+    """
+    Long running, asyncio based splitting service, so that an orchestrator calling the splitter many times pays for reading a mesh
+    (and importing NumPy) once rather than on every call. Meshes are loaded on first use and stay resident until unloaded. Split
+    requests against the same mesh that arrive within 'batch_window' seconds of each other are split together in one batch (see
+    'split_mesh_batch'), and the splitting runs on a pool of worker threads, which share the resident meshes without copying them and
+    run in parallel while NumPy releases the GIL, so the event loop stays free to accept requests.
+
+    Requests are dicts with an 'op' of 'ping', 'load', 'unload', 'meshes' or 'split' (see 'handle_request'), sent as one line of json
+    each over a Unix socket or a localhost TCP port (see 'serve').
+
+    Args:
+        workers (int): The number of worker threads.
+        batch_window (float): Seconds a split request waits for others to join its batch.
+        max_batch_size (int): The most requests split in one batch.
+
+    Raises:
+        TypeError: If 'workers' or 'max_batch_size' is not an int
+        ValueError: If 'workers' or 'max_batch_size' is less than 1, or 'batch_window' is negative.
+    """
+
+    def __init__(self, workers=None, batch_window=DEFAULT_BATCH_WINDOW, max_batch_size=DEFAULT_MAX_BATCH_SIZE):
+
+        workers = (os.cpu_count() or 1) if workers is None else workers
+
+        if not isinstance(workers, (int)) or not isinstance(max_batch_size, (int)):
+            raise TypeError("'workers' and 'max_batch_size' arguments must be ints")
+        elif workers < 1 or max_batch_size < 1:
+            raise ValueError("'workers' and 'max_batch_size' arguments must be at least 1")
+        elif batch_window < 0:
+            raise ValueError("'batch_window' argument must not be negative")
+
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+
+        self._meshes = {} #Path -> future of the (points, quads) arrays, shared by concurrent first uses
+        self._pending = {} #Path -> list of (mesh normal, mesh offset, transform, future) waiting for the next batch
+
+    async def load_mesh(self, path):
+
+        """
+        Reads a geometry file ('.json' or '.qpb', see 'read_geometry_file') into memory, unless it is resident already. Concurrent
+        requests for a mesh being read wait for the same read.
+
+        Args:
+            path (str): The path of the geometry file, which is also the mesh's name in requests.
+
+        Returns:
+            mesh (tuple): The resident (points, quads) arrays.
+
+        Raises:
+            TypeError: If 'path' is not a string
+        """
+
+        if not isinstance(path, (str)):
+            raise TypeError("'path' argument must be a string")
+
+        if path not in self._meshes:
+            self._meshes[path] = asyncio.ensure_future(asyncio.get_running_loop().run_in_executor(self.executor, _read_mesh, path))
+
+        try:
+            return(await asyncio.shield(self._meshes[path]))
+        except Exception:
+            self._meshes.pop(path, None) #A failed read is not kept, so the next request tries again
+            raise
+
+    def unload_mesh(self, path):
+
+        #Frees a resident mesh, returning whether it was resident
+        return(self._meshes.pop(path, None) is not None)
+
+    @property
+    def meshes(self):
+
+        #The paths of the resident meshes (and those being read)
+        return(sorted(self._meshes))
+
+    async def split(self, path, plane_normal=(0.0, 0.0, 1.0), plane_offset=0.0, transform=None):
+
+        """
+        Splits a resident mesh (loading it first if needed), posed by 'transform', by a plane in the world frame. The request joins
+        the next batch of requests against the same mesh.
+
+        Args:
+            path (str): The path of the geometry file.
+            plane_normal (tuple): Normal of the cutting plane in the world frame, pointing to the dry side.
+            plane_offset (float): Offset of the cutting plane along its normal, the plane being n.x = offset.
+            transform (np.ndarray): (4, 4) homogeneous transform posing the mesh (see 'pose_matrices'), or None for no movement.
+
+        Returns:
+            dry_soup (PolygonSoup): The dry polygons in the world frame.
+            wet_soup (PolygonSoup): The wet polygons in the world frame.
+            batch_size (int): The number of requests split in the same batch.
+
+        Raises:
+            TypeError: If 'path' is not a string
+            ValueError: If 'plane_normal' is zero.
+        """
+
+        await self.load_mesh(path)
+
+        transform = np.eye(4) if transform is None else np.asarray(transform, dtype=np.float64).reshape(4, 4)
+        mesh_normal, mesh_offset = posed_mesh_planes(plane_normal, plane_offset, transform)
+
+        future = asyncio.get_running_loop().create_future()
+        if path not in self._pending:
+            self._pending[path] = []
+            asyncio.ensure_future(self._run_batch(path))
+        self._pending[path].append((mesh_normal, mesh_offset, transform, future))
+
+        return(await future)
+
+    async def _run_batch(self, path):
+
+        #Waits for the batch to fill, then splits it; requests beyond 'max_batch_size' start the next batch
+        await asyncio.sleep(self.batch_window)
+
+        batch = self._pending.pop(path)
+        if len(batch) > self.max_batch_size:
+            batch, self._pending[path] = batch[:self.max_batch_size], batch[self.max_batch_size:]
+            asyncio.ensure_future(self._run_batch(path))
+
+        try:
+            points, quads = await self.load_mesh(path)
+            mesh_normals, mesh_offsets, transforms, futures = zip(*batch)
+            request_results = await asyncio.get_running_loop().run_in_executor(self.executor, split_mesh_batch, points, quads, np.array(mesh_normals),
+                                                                             np.array(mesh_offsets), np.array(transforms))
+        except Exception as error:
+            for _, _, _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for future, (dry_soup, wet_soup) in zip(futures, request_results):
+            if not future.done(): #Not cancelled by a client that went away meanwhile
+                future.set_result((dry_soup, wet_soup, len(batch)))
+
+    async def handle_request(self, request):
+
+        """
+        Carries out one request, never raising: a failed request gets an 'error' of the form 'ValueError: ...' in its response. Each
+        response echoes the request's 'id', if given, so that clients can send many requests before reading the responses.
+
+        Requests:
+            {'op': 'ping'}
+            {'op': 'load', 'mesh': path} -> 'points' and 'quadrilaterals' counts.
+            {'op': 'unload', 'mesh': path} -> 'unloaded', whether the mesh was resident.
+            {'op': 'meshes'} -> 'meshes', the resident meshes.
+            {'op': 'split', 'mesh': path, 'plane': [nx, ny, nz, offset], 'pose': {'heel': deg, 'trim': deg, 'yaw': deg, 'translation': [x, y, z]},
+             'output': one of 'OUTPUT_MODES'} -> 'dry_polygons' and 'wet_polygons' counts (and with 'polygons' output, 'dry' and 'wet'
+             as lists of polygons, each a list of [x, y, z] corners), 'batch_size' and 'seconds'. 'plane' defaults to z = 0, and 'pose'
+             and each of its keys to no movement.
+
+        Args:
+            request (dict): The request.
+
+        Returns:
+            response (dict): The response.
+
+        Raises:
+            None
+        """
+
+        response = {'id': request.get('id')} if isinstance(request, dict) else {'id': None}
+
+        try:
+            if not isinstance(request, (dict)):
+                raise TypeError("A request must be a json object")
+
+            operation = request.get('op')
+            if operation == 'ping':
+                response['status'] = 'ok'
+            elif operation == 'load':
+                points, quads = await self.load_mesh(request.get('mesh'))
+                response.update({'points': len(points), 'quadrilaterals': len(quads)})
+            elif operation == 'unload':
+                response['unloaded'] = self.unload_mesh(request.get('mesh'))
+            elif operation == 'meshes':
+                response['meshes'] = self.meshes
+            elif operation == 'split':
+                response.update(await self._handle_split(request))
+            else:
+                raise ValueError(f"Unknown 'op' {operation!r}, expected one of ['ping', 'load', 'unload', 'meshes', 'split']")
+        except Exception as error:
+            response['error'] = f'{type(error).__name__}: {error}'
+
+        return(response)
+
+    async def _handle_split(self, request):
+
+        plane = request.get('plane', [0.0, 0.0, 1.0, 0.0])
+        if len(plane) != 4:
+            raise ValueError("'plane' must be [nx, ny, nz, offset]")
+
+        output = request.get('output', 'summary')
+        if output not in OUTPUT_MODES:
+            raise ValueError(f"'output' must be one of {OUTPUT_MODES}")
+
+        pose = request.get('pose') or {}
+        transform = pose_matrices(pose.get('heel', 0.0), pose.get('trim', 0.0), pose.get('yaw', 0.0), pose.get('translation', (0.0, 0.0, 0.0)))[0]
+
+        start_time = time.perf_counter()
+        dry_soup, wet_soup, batch_size = await self.split(request.get('mesh'), plane[:3], plane[3], transform)
+
+        response = {'dry_polygons': len(dry_soup), 'wet_polygons': len(wet_soup), 'batch_size': batch_size, 'seconds': time.perf_counter() - start_time}
+        if output == 'polygons':
+            response.update({'dry': dry_soup.tolist(), 'wet': wet_soup.tolist()})
+
+        return(response)
+
+    async def _handle_connection(self, reader, writer):
+
+        #Each line is handled as its own task, so a client may send many requests before reading any response
+        async def respond(line):
+            try:
+                response = await self.handle_request(json.loads(line))
+            except ValueError as error: #Not json
+                response = {'id': None, 'error': f'ValueError: {error}'}
+            writer.write(json.dumps(response).encode() + b'\n')
+            await writer.drain()
+
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    task = asyncio.ensure_future(respond(line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks, return_exceptions=True)
+        except (ConnectionError, asyncio.CancelledError): #The client went away, or the service is shutting down
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, socket_path=None, host='127.0.0.1', port=0):
+
+        """
+        Starts listening for requests, on a Unix socket if 'socket_path' is given, otherwise on a TCP port of 'host' (by default only
+        reachable from this machine).
+
+        Args:
+            socket_path (str): The path of the Unix socket, or None.
+            host (str): The address to listen on, if not using a Unix socket.
+            port (int): The TCP port, 0 to pick a free one.
+
+        Returns:
+            server (asyncio.Server): The running server, whose 'sockets' give the chosen port.
+
+        Raises:
+            None
+        """
+
+        if socket_path is not None:
+            return(await asyncio.start_unix_server(self._handle_connection, path=socket_path, limit=MAX_MESSAGE_BYTES))
+
+        return(await asyncio.start_server(self._handle_connection, host, port, limit=MAX_MESSAGE_BYTES))
+
+    def close(self):
+
+        #Frees the resident meshes and stops the worker threads
+        self._meshes.clear()
+        self.executor.shutdown(wait=True)
+
+
+def _read_mesh(path):
+
+    quadrilateral_position_dict = read_geometry_file(path)
+    return(_check_points_and_quads(quadrilateral_position_dict['p'], quadrilateral_position_dict['q']))
+
+
+async def send_requests(requests, socket_path=None, host='127.0.0.1', port=None):
+
+    """
+    Client side: sends requests to a running 'SplitService' over one connection, all before reading any response, so that
+    concurrent splits can be batched by the service.
+
+    Args:
+        requests (list): The request dicts (see 'SplitService.handle_request').
+        socket_path (str): The path of the service's Unix socket, or None to connect to 'host' and 'port'.
+        host (str): The address of the service.
+        port (int): The TCP port of the service.
+
+    Returns:
+        responses (list): The response dicts, in the order of 'requests'.
+
+    Raises:
+        None
+    """
+
+    if socket_path is not None:
+        reader, writer = await asyncio.open_unix_connection(socket_path, limit=MAX_MESSAGE_BYTES)
+    else:
+        reader, writer = await asyncio.open_connection(host, port, limit=MAX_MESSAGE_BYTES)
+
+    try:
+        requests = [{**request, 'id': number} for number, request in enumerate(requests)]
+        writer.write(b''.join(json.dumps(request).encode() + b'\n' for request in requests))
+        await writer.drain()
+
+        responses = [json.loads(await reader.readline()) for _ in requests]
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+    return(sorted(responses, key=lambda response: response['id']))
+
+
+async def _serve_forever(arguments):
+
+    service = SplitService(arguments.workers, arguments.batch_window, arguments.max_batch_size)
+
+    for path in arguments.preload:
+        _, quads = await service.load_mesh(path)
+        print(f'Loaded {path}: {len(quads)} quadrilaterals', file=sys.stderr)
+
+    server = await service.serve(arguments.socket, arguments.host, arguments.port)
+    address = arguments.socket or ':'.join(str(part) for part in server.sockets[0].getsockname()[:2])
+    print(f'Listening on {address}', file=sys.stderr, flush=True)
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(arguments=None):
+
+    parser = argparse.ArgumentParser(description='Serve dry/wet splits of resident meshes to local clients, one json request per line.')
+    parser.add_argument('--socket', help='listen on this Unix socket instead of a TCP port')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on')
+    parser.add_argument('--port', type=int, default=8765, help='TCP port to listen on')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='number of worker threads')
+    parser.add_argument('--batch-window', type=float, default=DEFAULT_BATCH_WINDOW, help='seconds a split waits for others against the same mesh')
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE, help='the most splits run as one batch')
+    parser.add_argument('--preload', nargs='*', default=[], help="geometry files ('.json' or '.qpb') to load before accepting requests")
+    arguments = parser.parse_args(arguments)
+
+    try:
+        asyncio.run(_serve_forever(arguments))
+    except KeyboardInterrupt:
+        pass
+
+    return(0)
+
+
+if __name__ == '__main__':
+
+    sys.exit(main())
@@ -0,0 +1,211 @@
+import numpy as np
+
+
+SHAPES = ['cylinder', 'sphere', 'wigley_hull']
+
+
+def _structured_grid_quads(rows, columns, wrap_columns):
+
+    """
+    Builds the 'q' data of a structured grid of (rows + 1) x (columns or columns + 1) points, stored row by row.
+
+    Args:
+        rows (int): The number of rows of quadrilaterals.
+        columns (int): The number of columns of quadrilaterals.
+        wrap_columns (bool): If True the last column of quadrilaterals joins back onto the first column of points (closed surfaces).
+
+    Returns:
+        quads (np.ndarray): (rows * columns, 4) int array of indices, with corners ordered around each quadrilateral.
+
+    Raises:
+        None
+    """
+
+    points_per_row = columns if wrap_columns else columns + 1
+    row, column = np.meshgrid(np.arange(rows), np.arange(columns), indexing='ij')
+    next_column = (column + 1) % points_per_row
+
+    quads = np.stack([row * points_per_row + column, row * points_per_row + next_column,
+                      (row + 1) * points_per_row + next_column, (row + 1) * points_per_row + column], axis=-1)
+
+    return(quads.reshape(-1, 4))
+
+
+def _grid_dimensions(panel_count, crossing_ratio):
+
+    """
+    Chooses the number of rows (along z) and columns (around the body) for a mesh with roughly 'panel_count' quadrilaterals, of
+    which a fraction 'crossing_ratio' straddle the z=0 plane. Exactly one row straddles the plane, so rows = 1 / crossing_ratio.
+
+    Args:
+        panel_count (int): The approximate number of quadrilaterals wanted.
+        crossing_ratio (float): The fraction of quadrilaterals that should cross z=0, in (0, 1].
+
+    Returns:
+        rows (int): The number of rows of quadrilaterals.
+        columns (int): The number of columns of quadrilaterals.
+        waterline_row (int): The index of the row that straddles z=0.
+
+    Raises:
+        TypeError: If 'panel_count' is not an int.
+        ValueError: If 'panel_count' is less than 3 or 'crossing_ratio' is not in (0, 1].
+    """
+
+    if not isinstance(panel_count, (int)):
+        raise TypeError("'panel_count' argument must be an int")
+    elif panel_count < 3:
+        raise ValueError("'panel_count' argument must be at least 3")
+    elif not 0 < crossing_ratio <= 1:
+        raise ValueError("'crossing_ratio' argument must be in (0, 1]")
+
+    rows = max(1, min(int(round(1 / crossing_ratio)), panel_count // 3))
+    columns = max(3, panel_count // rows)
+
+    return(rows, columns, rows // 2)
+
+
+def generate_cylinder(panel_count, crossing_ratio=0.05, radius=1.0, length=4.0):
+
+    """
+    Generates a vertical cylinder (open at both ends), meshed as a structured grid and cut by the z=0 plane through one row.
+
+    Args:
+        panel_count (int): The approximate number of quadrilaterals.
+        crossing_ratio (float): The fraction of quadrilaterals that cross z=0.
+        radius (float): The radius of the cylinder.
+        length (float): The height of the cylinder.
+
+    Returns:
+        quadrilateral_position_dict (dict): 'p' as a (V, 3) float array and 'q' as an (N, 4) int array.
+
+    Raises:
+        See '_grid_dimensions'.
+    """
+
+    rows, columns, waterline_row = _grid_dimensions(panel_count, crossing_ratio)
+
+    z = (np.arange(rows + 1) - waterline_row - 0.5) * (length / rows) #The waterline falls halfway up 'waterline_row'
+    theta = np.linspace(0, 2 * np.pi, columns, endpoint=False)
+    z_grid, theta_grid = np.meshgrid(z, theta, indexing='ij')
+
+    points = np.stack([radius * np.cos(theta_grid), radius * np.sin(theta_grid), z_grid], axis=-1).reshape(-1, 3)
+
+    return({'q': _structured_grid_quads(rows, columns, wrap_columns=True), 'p': points})
+
+
+def generate_sphere(panel_count, crossing_ratio=0.05, radius=1.0):
+
+    """
+    Generates a sphere meshed as a latitude/longitude grid, cut by the z=0 plane through one band of latitude. The quadrilaterals
+    touching the poles are degenerate (two corners share the pole position), as they often are in real panel meshes.
+
+    Args:
+        panel_count (int): The approximate number of quadrilaterals.
+        crossing_ratio (float): The fraction of quadrilaterals that cross z=0 (rounded to 1 / an odd number of bands).
+        radius (float): The radius of the sphere.
+
+    Returns:
+        quadrilateral_position_dict (dict): 'p' as a (V, 3) float array and 'q' as an (N, 4) int array.
+
+    Raises:
+        See '_grid_dimensions'.
+    """
+
+    rows, _, _ = _grid_dimensions(panel_count, crossing_ratio)
+    rows += (rows + 1) % 2 #An odd number of bands puts the equator halfway across the middle band
+    columns = max(3, panel_count // rows)
+
+    polar_angle = np.linspace(np.pi, 0, rows + 1) #From the bottom pole to the top pole
+    theta = np.linspace(0, 2 * np.pi, columns, endpoint=False)
+    polar_grid, theta_grid = np.meshgrid(polar_angle, theta, indexing='ij')
+
+    points = np.stack([radius * np.sin(polar_grid) * np.cos(theta_grid), radius * np.sin(polar_grid) * np.sin(theta_grid),
+                       radius * np.cos(polar_grid)], axis=-1).reshape(-1, 3)
+
+    return({'q': _structured_grid_quads(rows, columns, wrap_columns=True), 'p': points})
+
+
+def generate_wigley_hull(panel_count, crossing_ratio=0.05, length=10.0, beam=1.0, draft=0.625, freeboard=0.5):
+
+    """
+    Generates both sides of a Wigley hull, y = +-(B/2)(1 - (2x/L)^2)(1 - (z/T)^2), a standard analytic ship-like form. The hull is
+    meshed from the keel (z = -T) to the deck (z = freeboard), with the z=0 plane cutting through one row of quadrilaterals.
+
+    Args:
+        panel_count (int): The approximate number of quadrilaterals.
+        crossing_ratio (float): The fraction of quadrilaterals that cross z=0.
+        length (float): The length of the hull, L.
+        beam (float): The beam of the hull, B.
+        draft (float): The draft of the hull, T.
+        freeboard (float): The height of the hull above the waterline.
+
+    Returns:
+        quadrilateral_position_dict (dict): 'p' as a (V, 3) float array and 'q' as an (N, 4) int array.
+
+    Raises:
+        See '_grid_dimensions'.
+    """
+
+    rows, columns, waterline_row = _grid_dimensions(panel_count, crossing_ratio)
+    columns = max(2, columns // 2) #Half of the columns for each side
+
+    #The waterline row is centred on z=0, with the other rows evenly spaced down to the keel and up to the deck
+    row_height = min(draft / (waterline_row + 0.5), freeboard / max(rows - waterline_row - 0.5, 0.5))
+    z = np.concatenate([np.linspace(-draft, -row_height / 2, waterline_row + 1), np.linspace(row_height / 2, freeboard, rows - waterline_row)])
+
+    x = np.linspace(-length / 2, length / 2, columns + 1)
+    z_grid, x_grid = np.meshgrid(z, x, indexing='ij')
+    half_breadth = (beam / 2) * (1 - (2 * x_grid / length) ** 2) * (1 - (np.minimum(z_grid, 0) / draft) ** 2)
+
+    starboard = np.stack([x_grid, half_breadth, z_grid], axis=-1).reshape(-1, 3)
+    port = np.stack([x_grid[:, ::-1], -half_breadth[:, ::-1], z_grid], axis=-1).reshape(-1, 3)
+
+    starboard_quads = _structured_grid_quads(rows, columns, wrap_columns=False)
+    port_quads = _structured_grid_quads(rows, columns, wrap_columns=False) + len(starboard)
+
+    return({'q': np.concatenate([starboard_quads, port_quads]), 'p': np.concatenate([starboard, port])})
+
+
+def generate_synthetic_mesh(shape, panel_count, crossing_ratio=0.05):
+
+    """
+    Generates a synthetic panel mesh of the given shape (see 'SHAPES').
+
+    Args:
+        shape (str): 'cylinder', 'sphere' or 'wigley_hull'.
+        panel_count (int): The approximate number of quadrilaterals.
+        crossing_ratio (float): The fraction of quadrilaterals that cross z=0.
+
+    Returns:
+        quadrilateral_position_dict (dict): 'p' as a (V, 3) float array and 'q' as an (N, 4) int array.
+
+    Raises:
+        ValueError: If 'shape' is not one of 'SHAPES'.
+    """
+
+    generators = {'cylinder': generate_cylinder, 'sphere': generate_sphere, 'wigley_hull': generate_wigley_hull}
+
+    if shape not in generators:
+        raise ValueError(f"'shape' argument must be one of {SHAPES}")
+
+    return(generators[shape](panel_count, crossing_ratio))
+
+
+def waterline_crossing_ratio(quadrilateral_position_dict):
+
+    """
+    The fraction of quadrilaterals in a mesh that have corners on both sides of the z=0 plane.
+
+    Args:
+        quadrilateral_position_dict (dict): 'p' and 'q' data, as lists or arrays.
+
+    Returns:
+        crossing_ratio (float): The fraction of quadrilaterals that cross z=0.
+
+    Raises:
+        None
+    """
+
+    below = np.asarray(quadrilateral_position_dict['p'])[:, 2][np.asarray(quadrilateral_position_dict['q'])] < 0
+
+    return(float(np.mean(below.any(axis=1) & ~below.all(axis=1))))
@@ -0,0 +1,156 @@
+import unittest
+import io
+import os
+import shutil
+import tempfile
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from batch_runner import batch_output_paths, expand_input_patterns, is_up_to_date, main, process_geometry_file, run_batch, slicing_parameters
+from mesh_io import read_in_binary_geometry_file, read_in_json_file_streaming
+from mesh_writers import write_geometry_file
+from quadrilateral_slicing import split_up_quadrilateral_data_indexed, waterplane
+from synthetic_meshes import generate_synthetic_mesh
+
+
+
+class TestBatchRunner(unittest.TestCase):
+
+    def setUp(self):
+        #Set up preconditions for the test
+        self.directory = tempfile.mkdtemp()
+        self.input_directory = os.path.join(self.directory, 'hulls')
+        self.output_directory = os.path.join(self.directory, 'out')
+        os.makedirs(os.path.join(self.input_directory, 'nested'))
+
+        self.meshes = {'sphere': generate_synthetic_mesh('sphere', 200), 'cylinder': generate_synthetic_mesh('cylinder', 200)}
+        write_geometry_file(os.path.join(self.input_directory, 'sphere.json'), self.meshes['sphere'])
+        write_geometry_file(os.path.join(self.input_directory, 'nested', 'cylinder.qpb'), self.meshes['cylinder'])
+
+    def tearDown(self):
+        #Clean up any resources created during the test (if needed)
+        shutil.rmtree(self.directory)
+
+    #Test case for expand_input_patterns, with plain paths, recursive globs and patterns matching nothing
+    def test_expand_input_patterns(self):
+        sphere_path = os.path.join(self.input_directory, 'sphere.json')
+        cylinder_path = os.path.join(self.input_directory, 'nested', 'cylinder.qpb')
+
+        self.assertEqual(expand_input_patterns([os.path.join(self.input_directory, '**', '*.*'), sphere_path]), ([cylinder_path, sphere_path], []))
+
+        #Outputs written beside the inputs leave their parameter records there, which are never taken as inputs
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            self.assertEqual(main([sphere_path, '--output-dir', self.input_directory]), 0)
+        self.assertIn('sphere_dry.params', os.listdir(self.input_directory))
+        self.assertEqual(expand_input_patterns([os.path.join(self.input_directory, '*.json')])[0],
+                         [os.path.join(self.input_directory, name) for name in ['sphere.json', 'sphere_dry.json', 'sphere_wet.json']])
+        self.assertEqual(len(expand_input_patterns([os.path.join(self.input_directory, '**', '*.*')])[0]), 4)
+        self.assertEqual(expand_input_patterns([os.path.join(self.input_directory, '*.stl')]), ([], [os.path.join(self.input_directory, '*.stl')]))
+
+    #Test case for batch_output_paths and is_up_to_date
+    def test_batch_output_paths(self):
+        input_path = os.path.join(self.input_directory, 'sphere.json')
+        output_paths = batch_output_paths(input_path, self.output_directory, 'obj', 'gzip')
+        self.assertEqual(output_paths, [os.path.join(self.output_directory, 'sphere_dry.obj.gz'), os.path.join(self.output_directory, 'sphere_wet.obj.gz')])
+        self.assertFalse(is_up_to_date(input_path, output_paths))
+
+        #Only known extensions are stripped, and the directories below 'input_root' are kept
+        self.assertEqual(batch_output_paths(os.path.join(self.input_directory, 'hull.v2.json.gz'), self.output_directory)[0], os.path.join(self.output_directory, 'hull.v2_dry.json'))
+        self.assertEqual(batch_output_paths(os.path.join(self.input_directory, 'nested', 'hull.json'), self.output_directory, input_root=self.input_directory)[1],
+                         os.path.join(self.output_directory, 'nested', 'hull_wet.json'))
+
+        #Failure cases
+        self.assertRaises(ValueError, batch_output_paths, input_path, self.output_directory, 'ply')
+
+    #Test case for run_batch and main with same named inputs in different directories, which must not overwrite each other's outputs
+    def test_same_named_inputs(self):
+        input_paths = [os.path.join(self.input_directory, 'sphere.json'), os.path.join(self.input_directory, 'nested', 'sphere.json')]
+        write_geometry_file(input_paths[1], self.meshes['cylinder'])
+
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            self.assertEqual(main([os.path.join(self.input_directory, '**', 'sphere.json'), '--output-dir', self.output_directory, '--workers', '1']), 0)
+        for name, output_path in zip(['sphere', 'cylinder'], [os.path.join(self.output_directory, 'sphere_dry.json'), os.path.join(self.output_directory, 'nested', 'sphere_dry.json')]):
+            self.assertEqual(read_in_json_file_streaming(output_path)['p'].tolist(), split_up_quadrilateral_data_indexed(self.meshes[name])[0]['p'].tolist())
+
+        #Failure cases
+        self.assertRaises(ValueError, run_batch, input_paths, self.output_directory)
+        write_geometry_file(os.path.join(self.input_directory, 'sphere.qpb'), self.meshes['sphere'])
+        stderr = io.StringIO()
+        with redirect_stdout(io.StringIO()), redirect_stderr(stderr):
+            self.assertEqual(main([os.path.join(self.input_directory, 'sphere.*'), '--output-dir', self.output_directory]), 1)
+        self.assertIn('would both be written to', stderr.getvalue())
+
+    #Test case for run_batch, whose outputs match splitting each file directly, and which then skips the up to date files
+    def test_run_batch(self):
+        input_paths, _ = expand_input_patterns([os.path.join(self.input_directory, '**', '*.*')])
+
+        for workers in [1, 2]:
+            progress_calls = []
+            results = run_batch(input_paths, self.output_directory, 'binary', workers=workers, force=True, progress=lambda *call: progress_calls.append(call))
+            self.assertEqual([result['status'] for result in results], ['done', 'done'])
+            self.assertEqual(sorted(call[:2] for call in progress_calls), [(1, 2), (2, 2)])
+
+            for result, name in zip(results, ['cylinder', 'sphere']):
+                expected_dicts = split_up_quadrilateral_data_indexed(self.meshes[name])
+                for output_path, expected_dict in zip(result['outputs'], expected_dicts):
+                    written_dict = read_in_binary_geometry_file(output_path)
+                    self.assertEqual(written_dict['p'].tolist(), expected_dict['p'].tolist())
+                    self.assertEqual([polygon.tolist() for polygon in written_dict['q']], expected_dict['q'].tolist())
+
+        #Up to date outputs are skipped, until the input changes
+        self.assertEqual([result['status'] for result in run_batch(input_paths, self.output_directory, 'binary')], ['skipped', 'skipped'])
+        modified = time.time() + 10
+        os.utime(input_paths[1], (modified, modified))
+        self.assertEqual([result['status'] for result in run_batch(input_paths, self.output_directory, 'binary')], ['skipped', 'done'])
+
+        #With a cache, forced reruns load the splits instead
+        cache_directory = os.path.join(self.directory, 'cache')
+        for cached in [False, True]:
+            results = run_batch(input_paths, self.output_directory, 'binary', force=True, cache_directory=cache_directory)
+            self.assertEqual([result['cached'] for result in results], [cached, cached])
+            written_dict = read_in_binary_geometry_file(results[1]['outputs'][1])
+            self.assertEqual(written_dict['p'].tolist(), split_up_quadrilateral_data_indexed(self.meshes['sphere'])[1]['p'].tolist())
+
+        #Failure cases
+        broken_path = os.path.join(self.input_directory, 'broken.json')
+        with open(broken_path, 'w') as f:
+            f.write('{"p": [[0, 0]], "q": []}')
+        result = run_batch([broken_path], self.output_directory)[0]
+        self.assertEqual(result['status'], 'failed')
+        self.assertIn('ValueError', result['error'])
+        self.assertRaises(ValueError, run_batch, input_paths, workers=0)
+        self.assertRaises(ValueError, run_batch, input_paths, preview='sketch')
+
+    #Test case for main, the command line entry point, with a heeled waterplane and waterline previews
+    def test_main(self):
+        arguments = [os.path.join(self.input_directory, '*.json'), os.path.join(self.input_directory, '*.stl'), '--output-dir', self.output_directory,
+                     '--draft', '0.1', '--heel', '10', '--workers', '1', '--preview', 'waterline']
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            self.assertEqual(main(arguments), 1) #One pattern matched nothing
+        self.assertIn('1 files: 1 done, 0 skipped, 0 failed', stdout.getvalue())
+        self.assertIn('[1/1]', stderr.getvalue())
+        self.assertEqual(sorted(os.listdir(self.output_directory)), ['sphere_dry.json', 'sphere_dry.params', 'sphere_dry.png', 'sphere_wet.json', 'sphere_wet.png'])
+
+        wet_dict = read_in_json_file_streaming(os.path.join(self.output_directory, 'sphere_wet.json'))
+        self.assertGreater(wet_dict['p'][:, 2].max(), 0.1) #The heeled waterline rises above z = 0.1 on one side
+
+        #Outputs are only up to date for the plane and tolerance they were made with
+        for extra_arguments, summary in [([], '1 skipped'), (['--plane', '0', '0', '1', '0'], '1 done'), (['--plane', '0', '0', '1', '0'], '1 skipped'),
+                                         (['--plane', '0', '0', '1', '0', '--tolerance', '1e-9'], '1 done')]:
+            stdout = io.StringIO()
+            with redirect_stdout(stdout), redirect_stderr(io.StringIO()):
+                self.assertEqual(main(arguments[:1] + arguments[2:] + extra_arguments), 0)
+            self.assertIn(summary, stdout.getvalue())
+
+        #Failure cases
+        input_path, output_paths = os.path.join(self.input_directory, 'sphere.json'), batch_output_paths(os.path.join(self.input_directory, 'sphere.json'), self.output_directory)
+        os.remove(os.path.join(self.output_directory, 'sphere_wet.png'))
+        os.makedirs(os.path.join(self.output_directory, 'sphere_wet.png')) #The preview cannot be saved, so the outputs are not up to date
+        self.assertRaises(OSError, process_geometry_file, input_path, output_paths, *waterplane(0.1), 'waterline')
+        self.assertFalse(is_up_to_date(input_path, output_paths, slicing_parameters(*waterplane(0.1))))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import os
+from benchmark import IMPORT_BENCHMARK_MODULES, STAGES, benchmark_mesh, measure_import_time, run_benchmarks
+from synthetic_meshes import generate_synthetic_mesh
+
+
+
+class TestBenchmark(unittest.TestCase):
+
+    #Test case for benchmark_mesh, which must report every stage and leave no output files behind
+    def test_benchmark_mesh(self):
+        files_before = set(os.listdir('resulting_files'))
+        stage_results = benchmark_mesh(generate_synthetic_mesh('cylinder', 200), repeats=1)
+
+        self.assertEqual([stage_result['stage'] for stage_result in stage_results], STAGES)
+        for stage_result in stage_results:
+            self.assertGreater(stage_result['seconds'], 0)
+            self.assertGreater(stage_result['panels_per_second'], 0)
+            self.assertGreaterEqual(stage_result['peak_memory_bytes'], 0)
+        self.assertEqual(set(os.listdir('resulting_files')), files_before)
+
+    #Test case for run_benchmarks, which produces one result per mesh, engine and stage
+    def test_run_benchmarks(self):
+        report = run_benchmarks(['sphere', 'wigley_hull'], [100], [0.1, 0.5], repeats=1)
+        self.assertIn('numpy', report['environment'])
+        self.assertEqual(len(report['results']), 2 * 2 * len(STAGES))
+        self.assertEqual({result['shape'] for result in report['results']}, {'sphere', 'wigley_hull'})
+
+    #Test case for measure_import_time, and that none of the entry points import matplotlib or SymPy until they are needed
+    def test_measure_import_time(self):
+        for module_name in IMPORT_BENCHMARK_MODULES:
+            result = measure_import_time(module_name, repeats=1)
+            self.assertGreater(result['seconds'], 0)
+            self.assertEqual(result['heavy_modules_loaded'], [], module_name)
+
+        self.assertEqual(measure_import_time('matplotlib.pyplot', repeats=1)['heavy_modules_loaded'], ['matplotlib'])
+
+    #Test case for argument checks
+    def test_argument_errors(self):
+        with self.assertRaises(ValueError):
+            benchmark_mesh(generate_synthetic_mesh('cylinder', 100), engine='exact')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import numpy as np
+from hydrostatics import ORIENTED_WET_TABLE, slice_quadrilateral_arrays_with_hydrostatics, split_up_quadrilateral_data_with_hydrostatics
+from quadrilateral_slicing import slice_quadrilateral_arrays, split_up_quadrilateral_data_vectorised
+from synthetic_meshes import generate_synthetic_mesh
+
+
+
+class TestHydrostatics(unittest.TestCase):
+
+    def setUp(self):
+        #Set up preconditions for the test, a unit cube centred on the origin with outward facing quadrilaterals
+        self.points = np.array([[x, y, z] for z in (-0.5, 0.5) for y in (-0.5, 0.5) for x in (-0.5, 0.5)])
+        self.quads = np.array([[0, 2, 3, 1], [4, 5, 7, 6], [0, 1, 5, 4], [2, 6, 7, 3], [0, 4, 6, 2], [1, 3, 7, 5]])
+
+    #Test case for the oriented wet tables, every wet corner appearing in the quadrilateral's own order
+    def test_oriented_wet_table(self):
+        self.assertEqual(ORIENTED_WET_TABLE[0].tolist(), [-1] * 6)
+        self.assertEqual(ORIENTED_WET_TABLE[15].tolist(), [0, 1, 2, 3, -1, -1])
+        self.assertEqual(ORIENTED_WET_TABLE[1].tolist(), [0, 4, 7, -1, -1, -1])
+        self.assertEqual(ORIENTED_WET_TABLE[7].tolist(), [0, 1, 2, 6, 7, -1])
+
+    #Test case for slice_quadrilateral_arrays_with_hydrostatics on a cube, where every integral is known exactly
+    def test_cube(self):
+        *split, hydrostatics = slice_quadrilateral_arrays_with_hydrostatics(self.points + [0.3, 0.2, 0], self.quads, plane_offset=0.25, per_panel=True)
+        for result, expected in zip(split, slice_quadrilateral_arrays(self.points + [0.3, 0.2, 0], self.quads, self.points[:, 2] - 0.25)):
+            np.testing.assert_array_equal(result, expected)
+
+        self.assertAlmostEqual(hydrostatics['wetted_area'], 4.0)
+        self.assertAlmostEqual(hydrostatics['displaced_volume'], 0.75)
+        np.testing.assert_allclose(hydrostatics['centre_of_buoyancy'], [0.3, 0.2, -0.125], atol=1e-12)
+        self.assertAlmostEqual(hydrostatics['waterplane_area'], 1.0)
+        np.testing.assert_allclose(hydrostatics['centre_of_flotation'], [0.3, 0.2, 0.25], atol=1e-12)
+        np.testing.assert_allclose(hydrostatics['waterplane_second_moments'], [1 / 12, 1 / 12, 0.0], atol=1e-12)
+
+        np.testing.assert_allclose(hydrostatics['per_panel']['wetted_area'], [1.0, 0.0, 0.75, 0.75, 0.75, 0.75])
+        self.assertAlmostEqual(hydrostatics['per_panel']['displaced_volume'].sum(), 0.75)
+        self.assertAlmostEqual(hydrostatics['per_panel']['waterplane_area'].sum(), 1.0)
+
+        #Above and below the cube
+        self.assertEqual(slice_quadrilateral_arrays_with_hydrostatics(self.points, self.quads, plane_offset=-1)[-1]['centre_of_buoyancy'], None)
+        self.assertAlmostEqual(slice_quadrilateral_arrays_with_hydrostatics(self.points, self.quads, plane_offset=1)[-1]['displaced_volume'], 1.0)
+
+    #Test case for a heeled plane, where the waterplane is stretched by 1 / cos(heel) across the cube
+    def test_heeled_cube(self):
+        heel = np.radians(10)
+        hydrostatics = slice_quadrilateral_arrays_with_hydrostatics(self.points, self.quads, (0, np.sin(heel), np.cos(heel)), 0.0)[-1]
+        self.assertAlmostEqual(hydrostatics['displaced_volume'], 0.5)
+        self.assertAlmostEqual(hydrostatics['waterplane_area'], 1 / np.cos(heel))
+        self.assertAlmostEqual(hydrostatics['waterplane_second_moments'][0], (1 / np.cos(heel)) ** 3 / 12)
+
+    #Test case for a finely meshed sphere, against the analytic hemisphere
+    def test_sphere(self):
+        quadrilateral_position_dict = generate_synthetic_mesh('sphere', 20000, 0.02)
+        hydrostatics = slice_quadrilateral_arrays_with_hydrostatics(quadrilateral_position_dict['p'], quadrilateral_position_dict['q'])[-1]
+        self.assertAlmostEqual(hydrostatics['displaced_volume'], 2 * np.pi / 3, places=2)
+        self.assertAlmostEqual(hydrostatics['centre_of_buoyancy'][2], -3 / 8, places=3)
+        self.assertAlmostEqual(hydrostatics['wetted_area'], 2 * np.pi, places=2)
+        self.assertAlmostEqual(hydrostatics['waterplane_area'], np.pi, places=2)
+        self.assertAlmostEqual(hydrostatics['waterplane_second_moments'][1], np.pi / 4, places=2)
+
+    #Test case for split_up_quadrilateral_data_with_hydrostatics
+    def test_split_up_quadrilateral_data_with_hydrostatics(self):
+        quadrilateral_position_dict = {'q': self.quads.tolist(), 'p': self.points.tolist()}
+        dry, wet, hydrostatics = split_up_quadrilateral_data_with_hydrostatics(quadrilateral_position_dict)
+        self.assertEqual((dry, wet), split_up_quadrilateral_data_vectorised(quadrilateral_position_dict))
+        self.assertAlmostEqual(hydrostatics['displaced_volume'], 0.5)
+        self.assertNotIn('per_panel', hydrostatics)
+
+        #An empty mesh has nothing wet
+        dry, wet, hydrostatics = split_up_quadrilateral_data_with_hydrostatics({'p': [], 'q': []}, per_panel=True)
+        self.assertEqual((dry, wet, hydrostatics['displaced_volume'], hydrostatics['centre_of_buoyancy']), ([], [], 0.0, None))
+        self.assertEqual(len(hydrostatics['per_panel']['wetted_area']), 0)
+
+        #Failure cases
+        self.assertRaises(TypeError, split_up_quadrilateral_data_with_hydrostatics, [])
+        self.assertRaises(KeyError, split_up_quadrilateral_data_with_hydrostatics, {'q': []})
+        self.assertRaises(ValueError, split_up_quadrilateral_data_with_hydrostatics, quadrilateral_position_dict, (0, 0, 0))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
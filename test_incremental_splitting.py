@@ -0,0 +1,63 @@
+import unittest
+import numpy as np
+from incremental_splitting import IncrementalSplitter
+from quadrilateral_slicing import slice_quadrilateral_arrays
+from synthetic_meshes import generate_synthetic_mesh
+
+
+
+class TestIncrementalSplitting(unittest.TestCase):
+
+    def setUp(self):
+        #Set up preconditions for the test
+        self.quadrilateral_position_dict = generate_synthetic_mesh('wigley_hull', 2000, 0.1)
+        self.random_generator = np.random.default_rng(0)
+
+    def assertSplitMatches(self, splitter, points):
+        dry_polygons, dry_counts, wet_polygons, wet_counts = slice_quadrilateral_arrays(points, self.quadrilateral_position_dict['q'])
+        np.testing.assert_array_equal(splitter.dry_counts, dry_counts)
+        np.testing.assert_array_equal(splitter.wet_counts, wet_counts)
+        for polygons, expected_polygons, counts in [(splitter.dry_polygons, dry_polygons, dry_counts), (splitter.wet_polygons, wet_polygons, wet_counts)]:
+            used_corners = np.arange(polygons.shape[1]) < counts[:, None]
+            np.testing.assert_allclose(splitter.world_points(polygons)[used_corners], expected_polygons[used_corners], atol=1e-9)
+
+    #Test case for update_points, moving a handful of points across the waterline
+    def test_update_points(self):
+        splitter = IncrementalSplitter(self.quadrilateral_position_dict['p'], self.quadrilateral_position_dict['q'])
+        points = self.quadrilateral_position_dict['p'].copy()
+        moved = self.random_generator.choice(len(points), 10, replace=False)
+        points[moved, 2] += 0.2
+
+        resplit_count = splitter.update_points(points)
+        self.assertLessEqual(resplit_count, 4 * len(moved))
+        self.assertGreater(resplit_count, 0)
+        self.assertSplitMatches(splitter, points)
+
+        self.assertEqual(splitter.update_points(points), 0) #Nothing moved
+
+    #Test case for update_pose, which only re-splits quadrilaterals near the waterline
+    def test_update_pose(self):
+        splitter = IncrementalSplitter(self.quadrilateral_position_dict['p'], self.quadrilateral_position_dict['q'])
+        heel = np.radians(3)
+        rotation = np.array([[1, 0, 0], [0, np.cos(heel), -np.sin(heel)], [0, np.sin(heel), np.cos(heel)]])
+        translation = np.array([0.0, 0.0, -0.05])
+
+        resplit_count = splitter.update_pose(rotation, translation)
+        self.assertLess(resplit_count, len(self.quadrilateral_position_dict['q']) / 2)
+        self.assertSplitMatches(splitter, self.quadrilateral_position_dict['p'] @ rotation.T + translation)
+
+        dry_lists, wet_lists = splitter.as_lists(world_frame=True)
+        self.assertEqual(len(dry_lists), np.count_nonzero(splitter.dry_counts))
+        self.assertTrue(all(corner[2] > -1e-9 for polygon in dry_lists for corner in polygon))
+
+    #Test case for argument checks
+    def test_argument_errors(self):
+        splitter = IncrementalSplitter(self.quadrilateral_position_dict['p'], self.quadrilateral_position_dict['q'])
+        with self.assertRaises(ValueError):
+            splitter.update_points(self.quadrilateral_position_dict['p'][:10])
+        with self.assertRaises(ValueError):
+            splitter.update_pose(np.eye(2))
+
+
+if __name__ == '__main__':
+    unittest.main()
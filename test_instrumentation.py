@@ -0,0 +1,103 @@
+import unittest
+import os
+import json
+import tracemalloc
+import numpy as np
+from instrumentation import Instrumentation, instrumented_stage, record_split_statistics
+from quadrilateral_manipulation import split_up_quadrilateral_data
+from quadrilateral_slicing import split_up_quadrilateral_data_vectorised
+from utils import create_new_files
+
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        #Set up preconditions for the test
+        self.quadrilateral_test_dict = {"q": [[0, 1, 2, 3], [0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11], [12, 13, 14, 15]],
+                                        "p": [[-3.0, 0.0, 0.1], [-2.9, 0.0, 0.5], [-2.9, 0.5, 0.5], [-2.9, 0.5, 0.1], [-2.8, -0.5, 0.2],
+                                            [-2.8, 0.0, -0.5], [-2.5, 0.0, 0.1], [-2.5, 0.5, 0.1], [-2.0, -2.5, -0.2], [-2.0, 0.0, -2.5],
+                                            [-2.0, 0.0, 0.1], [-2.0, 0.5, 0.5], [0.0, -2.9, -0.1], [0.1, -2.9, -0.5], [0.5, -2.9, -0.5], [0.5, -2.9, -0.1]
+                                            ]
+                                        }
+        self.report_filename = 'resulting_files/test_profile_report.json'
+
+    def tearDown(self):
+        #Clean up any resources created during the test (if needed)
+        for filename in [self.report_filename, 'resulting_files/test_instrumented_data.json']:
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    #Test case for stages, counters and the saved report
+    def test_instrumentation_report(self):
+        instrumentation = Instrumentation(track_memory=True)
+        with instrumented_stage(instrumentation, 'build_list'):
+            [0.0] * 100000
+        with instrumented_stage(None, 'not_recorded'):
+            pass
+        instrumentation.count('items', 2)
+        instrumentation.count('items')
+
+        instrumentation.save_report(self.report_filename)
+        with open(self.report_filename, 'r') as file:
+            report = json.load(file)
+
+        self.assertEqual([stage['name'] for stage in report['stages']], ['build_list'])
+        self.assertGreater(report['stages'][0]['seconds'], 0)
+        self.assertGreaterEqual(report['stages'][0]['peak_memory_bytes'], 800000)
+        self.assertEqual(report['counters'], {'items': 3})
+
+    #Test case for nested stages, where each stage reports its own peak memory and tracing is only stopped by the outermost one
+    def test_nested_stages(self):
+        instrumentation = Instrumentation(track_memory=True)
+        with instrumentation.stage('outer'):
+            outer_data = np.ones(1000000)
+            del outer_data
+            with instrumentation.stage('inner'):
+                inner_data = np.ones(10000)
+                del inner_data
+            self.assertTrue(tracemalloc.is_tracing())
+        self.assertFalse(tracemalloc.is_tracing())
+
+        inner_stage, outer_stage = instrumentation.report()['stages']
+        self.assertEqual((inner_stage['name'], outer_stage['name']), ('inner', 'outer'))
+        self.assertGreaterEqual(outer_stage['peak_memory_bytes'], 8000000)
+        self.assertGreaterEqual(inner_stage['peak_memory_bytes'], 80000)
+        self.assertLess(inner_stage['peak_memory_bytes'], 1000000)
+
+        #Tracing started elsewhere is left running
+        tracemalloc.start()
+        try:
+            with instrumentation.stage('traced'):
+                [0.0] * 100000
+            self.assertTrue(tracemalloc.is_tracing())
+            self.assertGreaterEqual(instrumentation.stages[-1]['peak_memory_bytes'], 800000)
+        finally:
+            tracemalloc.stop()
+
+    #Test case for the split counters, which both engines must agree on (apart from how many intersections they compute)
+    def test_split_counters(self):
+        counters = []
+        for split_function in [split_up_quadrilateral_data, split_up_quadrilateral_data_vectorised]:
+            instrumentation = Instrumentation()
+            split_function(self.quadrilateral_test_dict, instrumentation=instrumentation)
+            counters.append(instrumentation.counters)
+
+        self.assertEqual(counters[0], {'quadrilaterals_dry': 2, 'quadrilaterals_wet': 1, 'quadrilaterals_mixed': 2, 'quadrilaterals_mixed_1_negative': 1,
+                                       'quadrilaterals_mixed_2_negative': 1, 'quadrilaterals_mixed_3_negative': 0, 'intersections_computed': 4})
+        self.assertEqual({**counters[1], 'intersections_computed': 4}, counters[0])
+
+    #Test case for the vertices_deduplicated counter of create_new_files
+    def test_vertices_deduplicated(self):
+        instrumentation = Instrumentation()
+        create_new_files([[[[0.0, 0.0, 1.0], [1.0, 0.0, 1.0], [1.0, 1.0, 1.0]], [[1.0, 1.0, 1.0], [1.0, 0.0, 1.0], [2.0, 0.0, 1.0]]]],
+                         ['test_instrumented_data'], instrumentation=instrumentation)
+        self.assertEqual(instrumentation.counters, {'vertices_deduplicated': 2})
+
+    #Test case for record_split_statistics doing nothing without instrumentation
+    def test_record_split_statistics_without_instrumentation(self):
+        self.assertIsNone(record_split_statistics(None, [0, 1, 4], 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
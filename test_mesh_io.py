@@ -0,0 +1,120 @@
+import unittest
+import os
+import json
+import numpy as np
+from utils import create_new_files, read_in_json_file, save_json_file
+from mesh_io import read_in_json_file_streaming, save_json_file_streaming, save_binary_geometry_file, read_in_binary_geometry_file
+from polygon_soup import PolygonSoup
+from quadrilateral_slicing import split_up_quadrilateral_data_vectorised
+
+
+
+class TestMeshIOStreaming(unittest.TestCase):
+
+    def setUp(self):
+        #Set up preconditions for the test
+        self.quadrilateral_test_dict = {"q": [[0, 1, 2, 3], [0, 1, 2], [3, 2, 1, 0, 4]],
+                                        "p": [[-3.0, 0.0, 0.1], [-2.9, 0.0, 0.5], [-2.9, 0.5, 0.5], [-2.9, 0.5, 0.1], [-2.8, -0.5, 0.0]]}
+        self.filenames = ['test_streaming_data', 'test_reference_data']
+
+    def tearDown(self):
+        #Clean up any resources created during the test (if needed)
+        for filename in self.filenames:
+            if os.path.exists(f'resulting_files/{filename}.json'):
+                os.remove(f'resulting_files/{filename}.json')
+
+    #Test case for read_in_json_file_streaming, with chunks small enough to split rows and keys
+    def test_read_in_json_file_streaming(self):
+        reference_dict = read_in_json_file("given_information/simple_challange_data.json")
+        for chunk_size in [7, 1000, 1 << 20]:
+            quadrilateral_position_dict = read_in_json_file_streaming("given_information/simple_challange_data.json", chunk_size)
+            self.assertEqual(quadrilateral_position_dict['p'].shape, (len(reference_dict['p']), 3))
+            self.assertEqual(quadrilateral_position_dict['q'].dtype, np.int32)
+            self.assertEqual(quadrilateral_position_dict['p'].tolist(), reference_dict['p'])
+            self.assertEqual(quadrilateral_position_dict['q'].tolist(), reference_dict['q'])
+
+    #Test case for reading polygons with differing numbers of corners
+    def test_read_in_json_file_streaming_ragged(self):
+        save_json_file(self.filenames[1], self.quadrilateral_test_dict)
+        quadrilateral_position_dict = read_in_json_file_streaming(f'resulting_files/{self.filenames[1]}.json', 5)
+        self.assertIsInstance(quadrilateral_position_dict['q'], PolygonSoup)
+        self.assertEqual(quadrilateral_position_dict['q'].tolist(), self.quadrilateral_test_dict['q'])
+
+    #Test case for reading back the output of a side with no polygons, as written for a wholly dry or wet mesh
+    def test_read_in_json_file_streaming_empty(self):
+        dry_soup, wet_soup = split_up_quadrilateral_data_vectorised(self.quadrilateral_test_dict | {'q': [[0, 1, 2, 3]]}, polygon_soup=True)
+        create_new_files([dry_soup, wet_soup], self.filenames)
+        dry_dict, wet_dict = [read_in_json_file_streaming(f'resulting_files/{filename}.json', 5) for filename in self.filenames]
+        self.assertEqual((dry_dict['q'].shape, dry_dict['p'].shape), ((1, 4), (4, 3)))
+        self.assertEqual((wet_dict['q'].shape, wet_dict['p'].shape), ((0, 4), (0, 3)))
+
+    #Test case for save_json_file_streaming, which must write exactly what save_json_file writes
+    def test_save_json_file_streaming(self):
+        save_json_file_streaming(self.filenames[0], self.quadrilateral_test_dict, 2)
+        save_json_file(self.filenames[1], self.quadrilateral_test_dict)
+        with open(f'resulting_files/{self.filenames[0]}.json', 'r') as streamed_file, open(f'resulting_files/{self.filenames[1]}.json', 'r') as reference_file:
+            self.assertEqual(streamed_file.read(), reference_file.read())
+
+        #Arrays are written chunk by chunk too
+        save_json_file_streaming(self.filenames[0], {'q': np.array([[0, 1, 2, 3]]), 'p': np.array(self.quadrilateral_test_dict['p'][:4])}, 1)
+        with open(f'resulting_files/{self.filenames[0]}.json', 'r') as file:
+            self.assertEqual(json.load(file), {'q': [[0, 1, 2, 3]], 'p': self.quadrilateral_test_dict['p'][:4]})
+
+    #Test case for argument checks
+    def test_argument_errors(self):
+        with self.assertRaises(TypeError):
+            read_in_json_file_streaming(1)
+        with self.assertRaises(KeyError):
+            save_json_file_streaming(self.filenames[0], {'q': []})
+        save_json_file(self.filenames[1], {'q': []})
+        with self.assertRaises(KeyError):
+            read_in_json_file_streaming(f'resulting_files/{self.filenames[1]}.json')
+
+
+class TestMeshIOBinary(unittest.TestCase):
+
+    def setUp(self):
+        #Set up preconditions for the test
+        self.quadrilateral_test_dict = {"q": [[0, 1, 2, 3], [0, 1, 2], [3, 2, 1, 0, 4]],
+                                        "p": [[-3.0, 0.0, 0.1], [-2.9, 0.0, 0.5], [-2.9, 0.5, 0.5], [-2.9, 0.5, 0.1], [-2.8, -0.5, 0.0]]}
+        self.filename = 'test_binary_data'
+
+    def tearDown(self):
+        #Clean up any resources created during the test (if needed)
+        for extension in ['.qpb', '.json']:
+            if os.path.exists(f'resulting_files/{self.filename}{extension}'):
+                os.remove(f'resulting_files/{self.filename}{extension}')
+
+    #Test case for a binary round trip of quadrilaterals, which are returned as a 2D memory mapped array
+    def test_binary_geometry_file_quadrilaterals(self):
+        reference_dict = read_in_json_file("given_information/simple_challange_data.json")
+        save_binary_geometry_file(self.filename, reference_dict)
+        quadrilateral_position_dict = read_in_binary_geometry_file(f'resulting_files/{self.filename}.qpb')
+
+        self.assertIsInstance(quadrilateral_position_dict['p'], np.memmap)
+        self.assertEqual(quadrilateral_position_dict['q'].shape, (len(reference_dict['q']), 4))
+        self.assertEqual(quadrilateral_position_dict['p'].tolist(), reference_dict['p'])
+        self.assertEqual(quadrilateral_position_dict['q'].tolist(), reference_dict['q'])
+
+    #Test case for a binary round trip of polygons with differing numbers of corners
+    def test_binary_geometry_file_ragged(self):
+        save_binary_geometry_file(self.filename, self.quadrilateral_test_dict)
+        quadrilateral_position_dict = read_in_binary_geometry_file(f'resulting_files/{self.filename}.qpb')
+        self.assertIsInstance(quadrilateral_position_dict['q'], PolygonSoup)
+        self.assertEqual(quadrilateral_position_dict['q'].tolist(), self.quadrilateral_test_dict['q'])
+        self.assertEqual(quadrilateral_position_dict['p'].tolist(), self.quadrilateral_test_dict['p'])
+
+    #Test case for argument checks
+    def test_argument_errors(self):
+        with self.assertRaises(KeyError):
+            save_binary_geometry_file(self.filename, {'p': []})
+        for quads in [np.array([[0, 1, 2, 2 ** 31]]), [[0, 1, 2], [-2 ** 31 - 1, 0, 1]], PolygonSoup(np.array([0, 1, 2 ** 40]), [0, 3])]:
+            with self.assertRaises(ValueError):
+                save_binary_geometry_file(self.filename, {'q': quads, 'p': self.quadrilateral_test_dict['p']})
+        save_json_file(self.filename, self.quadrilateral_test_dict)
+        with self.assertRaises(ValueError):
+            read_in_binary_geometry_file(f'resulting_files/{self.filename}.json')
+
+
+if __name__ == '__main__':
+    unittest.main()
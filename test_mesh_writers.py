@@ -0,0 +1,101 @@
+import unittest
+import bz2
+import gzip
+import json
+import lzma
+import os
+import shutil
+import tempfile
+import numpy as np
+from mesh_io import read_in_binary_geometry_file
+from mesh_writers import (geometry_format_from_path, geometry_output_path, write_geometry_file, write_geometry_files, zstandard)
+from polygon_soup import PolygonSoup
+
+
+
+class TestMeshWriters(unittest.TestCase):
+
+    def setUp(self):
+        #Set up preconditions for the test
+        self.quadrilateral_test_dict = {"q": [[0, 1, 2, 3], [0, 1, 2], [3, 2, 1, 0, 4]],
+                                        "p": [[-3.0, 0.0, 0.1], [-2.9, 0.0, 0.5], [-2.9, 0.5, 0.5], [-2.9, 0.5, 0.1], [-2.8, -0.5, 0.0]]}
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        #Clean up any resources created during the test (if needed)
+        shutil.rmtree(self.directory)
+
+    #Test case for geometry_format_from_path and geometry_output_path
+    def test_paths(self):
+        self.assertEqual(geometry_format_from_path('dry.json'), ('json', None))
+        self.assertEqual(geometry_format_from_path('out/wet.json.gz'), ('json', 'gzip'))
+        self.assertEqual(geometry_format_from_path('wet.obj.xz'), ('obj', 'xz'))
+        self.assertEqual(geometry_format_from_path('wet.qpb'), ('binary', None))
+        self.assertEqual(geometry_output_path('out', 'dry', 'stl', 'bz2'), os.path.join('out', 'dry.stl.bz2'))
+
+        #Failure cases
+        self.assertRaises(ValueError, geometry_format_from_path, 'dry.txt')
+        self.assertRaises(ValueError, geometry_output_path, 'out', 'dry', 'txt')
+        self.assertRaises(ValueError, geometry_output_path, 'out', 'dry', 'json', 'zip')
+
+    #Test case for json, compressed or not, which must match what json.dump writes
+    def test_json(self):
+        expected = json.dumps(self.quadrilateral_test_dict)
+        for extension, opener in [('.json', open), ('.json.gz', gzip.open), ('.json.bz2', bz2.open), ('.json.xz', lzma.open)]:
+            for chunk_size in [None, 2]:
+                path = write_geometry_file(os.path.join(self.directory, 'nested', 'dry' + extension), self.quadrilateral_test_dict, chunk_size=chunk_size)
+                with opener(path, 'rt') as f:
+                    self.assertEqual(f.read(), expected)
+
+    @unittest.skipIf(zstandard is None, "the 'zstandard' package is not installed")
+    def test_json_zstd(self):
+        path = write_geometry_file(os.path.join(self.directory, 'dry.json.zst'), self.quadrilateral_test_dict)
+        with zstandard.open(path, 'rt') as f:
+            self.assertEqual(json.load(f), self.quadrilateral_test_dict)
+
+    #Test case for the binary format, which must still be memory mappable
+    def test_binary(self):
+        path = write_geometry_file(os.path.join(self.directory, 'dry.qpb'), self.quadrilateral_test_dict)
+        quadrilateral_position_dict = read_in_binary_geometry_file(path)
+        self.assertEqual([polygon.tolist() for polygon in quadrilateral_position_dict['q']], self.quadrilateral_test_dict['q'])
+        self.assertEqual(quadrilateral_position_dict['p'].tolist(), self.quadrilateral_test_dict['p'])
+
+    #Test case for binary STL, with every polygon fan triangulated
+    def test_stl(self):
+        path = write_geometry_file(os.path.join(self.directory, 'dry.stl'), self.quadrilateral_test_dict)
+        with open(path, 'rb') as f:
+            data = f.read()
+        triangle_count = int(np.frombuffer(data, dtype='<u4', count=1, offset=80)[0])
+        self.assertEqual(triangle_count, 2 + 1 + 3)
+        self.assertEqual(len(data), 84 + 50 * triangle_count)
+
+        records = np.frombuffer(data, dtype=np.dtype([('normal', '<f4', (3,)), ('corners', '<f4', (3, 3)), ('attribute', '<u2')]), offset=84)
+        points = np.array(self.quadrilateral_test_dict['p'], dtype=np.float32)
+        np.testing.assert_array_equal(records['corners'][1], points[[0, 2, 3]])
+        np.testing.assert_array_equal(records['corners'][5], points[[3, 0, 4]])
+        np.testing.assert_allclose(np.linalg.norm(records['normal'], axis=1), 1, rtol=1e-6)
+
+    #Test case for OBJ, which keeps the polygons whole and the coordinates exact
+    def test_obj(self):
+        path = write_geometry_file(os.path.join(self.directory, 'dry.obj'), {'q': PolygonSoup.from_lists(self.quadrilateral_test_dict['q']), 'p': np.array(self.quadrilateral_test_dict['p'])}, chunk_size=2)
+        with open(path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual([[float(value) for value in line.split()[1:]] for line in lines if line.startswith('v ')], self.quadrilateral_test_dict['p'])
+        self.assertEqual([[int(value) - 1 for value in line.split()[1:]] for line in lines if line.startswith('f ')], self.quadrilateral_test_dict['q'])
+
+    #Test case for write_geometry_files, writing several files concurrently
+    def test_write_geometry_files(self):
+        paths = [os.path.join(self.directory, name) for name in ['dry.json.gz', 'wet.stl', 'wet.obj']]
+        self.assertEqual(write_geometry_files([self.quadrilateral_test_dict] * 3, paths), paths)
+        self.assertTrue(all(os.path.getsize(path) > 0 for path in paths))
+        self.assertEqual(write_geometry_files([], []), [])
+
+        #Failure cases
+        self.assertRaises(ValueError, write_geometry_files, [self.quadrilateral_test_dict], [])
+        self.assertRaises(ValueError, write_geometry_files, [self.quadrilateral_test_dict], [os.path.join(self.directory, 'dry.txt')])
+        self.assertRaises(TypeError, write_geometry_file, None, self.quadrilateral_test_dict)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+import numpy as np
+from utils import read_in_json_file
+from quadrilateral_manipulation import split_up_quadrilateral_data
+from quadrilateral_slicing import split_up_quadrilateral_data_vectorised
+from parallel_splitting import split_up_quadrilateral_data_parallel
+
+
+
+class TestParallelSplitting(unittest.TestCase):
+
+    def setUp(self):
+        #Set up preconditions for the test
+        self.quadrilateral_test_dict = {"q": [[0, 1, 2, 3], [0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11], [12, 13, 14, 15]],
+                                        "p": [[-3.0, 0.0, 0.1], [-2.9, 0.0, 0.5], [-2.9, 0.5, 0.5], [-2.9, 0.5, 0.1], [-2.8, -0.5, 0.0],
+                                            [-2.8, 0.0, -0.5], [-2.5, 0.0, 0.0], [-2.5, 0.5, 0.0], [-2.0, -2.5, 0.0], [-2.0, 0.0, -2.5],
+                                            [-2.0, 0.0, 0.0], [-2.0, 0.5, 0.5], [0.0, -2.9, -0.1], [0.1, -2.9, -0.5], [0.5, -2.9, -0.5], [0.5, -2.9, -0.1]
+                                            ]
+                                        }
+
+    #Test case for split_up_quadrilateral_data_parallel with the vectorised engine, merged in the original order
+    def test_split_up_quadrilateral_data_parallel_vectorised(self):
+        sample_dict = read_in_json_file("given_information/simple_challange_data.json")
+        self.assertEqual(split_up_quadrilateral_data_parallel(sample_dict, workers=2, chunk_size=100), split_up_quadrilateral_data_vectorised(sample_dict))
+
+        dry_soup, wet_soup = split_up_quadrilateral_data_parallel(sample_dict, workers=2, chunk_size=100, polygon_soup=True)
+        expected_dry_soup, expected_wet_soup = split_up_quadrilateral_data_vectorised(sample_dict, polygon_soup=True)
+        np.testing.assert_array_equal(dry_soup.vertices, expected_dry_soup.vertices)
+        np.testing.assert_array_equal(wet_soup.offsets, expected_wet_soup.offsets)
+        self.assertEqual(split_up_quadrilateral_data_parallel({'p': [], 'q': []}, workers=1), ([], []))
+
+    #Test case for split_up_quadrilateral_data_parallel with the SymPy engine
+    def test_split_up_quadrilateral_data_parallel_sympy(self):
+        self.assertEqual(split_up_quadrilateral_data_parallel(self.quadrilateral_test_dict, workers=2, chunk_size=2, engine='sympy'),
+                         split_up_quadrilateral_data(self.quadrilateral_test_dict))
+
+    #Test case for argument checks
+    def test_argument_errors(self):
+        with self.assertRaises(TypeError):
+            split_up_quadrilateral_data_parallel([])
+        with self.assertRaises(KeyError):
+            split_up_quadrilateral_data_parallel({'p': []})
+        with self.assertRaises(ValueError):
+            split_up_quadrilateral_data_parallel(self.quadrilateral_test_dict, engine='exact')
+        with self.assertRaises(ValueError):
+            split_up_quadrilateral_data_parallel(self.quadrilateral_test_dict, workers=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import numpy as np
+from polygon_soup import PolygonSoup
+from quadrilateral_slicing import padded_polygons_to_lists, slice_quadrilateral_arrays, split_up_quadrilateral_data_vectorised
+from synthetic_meshes import generate_synthetic_mesh
+
+
+
+class TestPolygonSoup(unittest.TestCase):
+
+    def setUp(self):
+        #Set up preconditions for the test
+        self.polygons = [[[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0]],
+                         [[0.0, 0.0, 1.0], [1.0, 0.0, 1.0], [1.0, 1.0, 1.0], [0.0, 1.0, 1.0]],
+                         [[0.0, 0.0, 2.0], [1.0, 0.0, 2.0], [1.5, 0.5, 2.0], [1.0, 1.0, 2.0], [0.0, 1.0, 2.0]]]
+        self.soup = PolygonSoup.from_lists(self.polygons)
+
+    #Test case for from_lists, tolist and the ragged layout
+    def test_from_lists(self):
+        self.assertEqual(len(self.soup), 3)
+        self.assertEqual(self.soup.offsets.tolist(), [0, 3, 7, 12])
+        self.assertEqual(self.soup.counts.tolist(), [3, 4, 5])
+        self.assertEqual(self.soup.vertices.shape, (12, 3))
+        self.assertEqual(self.soup.tolist(), self.polygons)
+        self.assertEqual(PolygonSoup.from_lists([]).tolist(), [])
+
+    #Test case for from_padded, against the nested lists built from the same padded arrays
+    def test_from_padded(self):
+        quadrilateral_position_dict = generate_synthetic_mesh('cylinder', 500, 0.2)
+        dry_polygons, dry_counts, wet_polygons, wet_counts = slice_quadrilateral_arrays(quadrilateral_position_dict['p'], quadrilateral_position_dict['q'])
+        for polygons, counts in [(dry_polygons, dry_counts), (wet_polygons, wet_counts)]:
+            self.assertEqual(PolygonSoup.from_padded(polygons, counts).tolist(), padded_polygons_to_lists(polygons, counts))
+
+        #The soup needs far less memory than the lists it replaces
+        soup = PolygonSoup.from_padded(wet_polygons, wet_counts)
+        self.assertLess(soup.nbytes, 8 * 8 * len(soup.vertices))
+
+    #Test case for concatenate, including slices that do not start at the first corner
+    def test_concatenate(self):
+        self.assertEqual(PolygonSoup.concatenate([self.soup[2:], self.soup[:1], self.soup[1:2]]).tolist(), [self.polygons[2], self.polygons[0], self.polygons[1]])
+        self.assertEqual(PolygonSoup.concatenate([self.soup, PolygonSoup.from_lists([])]).tolist(), self.polygons)
+
+        #Failure cases
+        self.assertRaises(ValueError, PolygonSoup.concatenate, [])
+
+    #Test case for indexing, slicing and iterating, which all give views rather than copies
+    def test_views(self):
+        self.assertEqual(self.soup[1].tolist(), self.polygons[1])
+        self.assertEqual(self.soup[-1].tolist(), self.polygons[-1])
+        self.assertTrue(np.shares_memory(self.soup[2], self.soup.vertices))
+        self.assertEqual(self.soup[1:].tolist(), self.polygons[1:])
+        self.assertEqual(self.soup[2:1].tolist(), [])
+        self.assertEqual([polygon.tolist() for polygon in self.soup], self.polygons)
+
+        #Failure cases
+        self.assertRaises(IndexError, self.soup.__getitem__, 3)
+        self.assertRaises(TypeError, self.soup.__getitem__, slice(None, None, 2))
+        self.assertRaises(TypeError, self.soup.__getitem__, 1.0)
+        self.assertRaises(ValueError, PolygonSoup, self.soup.vertices, [0, 5, 3])
+        self.assertRaises(ValueError, PolygonSoup, self.soup.vertices, [0, 13])
+
+    #Test case for split_up_quadrilateral_data_vectorised returning PolygonSoups
+    def test_split_up_quadrilateral_data_vectorised(self):
+        quadrilateral_position_dict = generate_synthetic_mesh('sphere', 500, 0.2)
+        dry_soup, wet_soup = split_up_quadrilateral_data_vectorised(quadrilateral_position_dict, polygon_soup=True)
+        self.assertEqual((dry_soup.tolist(), wet_soup.tolist()), split_up_quadrilateral_data_vectorised(quadrilateral_position_dict))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,268 @@
+import unittest
+import numpy as np
+from utils import read_in_json_file
+from quadrilateral_manipulation import split_up_quadrilateral_data
+from quadrilateral_slicing import (slice_quadrilateral_arrays, split_up_quadrilateral_data_vectorised, split_up_quadrilateral_data_by_planes,
+                                   plane_signed_distances, waterplane, slice_quadrilateral_indices, indexed_polygons_to_lists,
+                                   padded_polygons_to_lists, compact_indexed_polygons, split_up_quadrilateral_data_indexed, remove_degenerate_polygons,
+                                   DRY_SPLIT_TABLE, WET_SPLIT_TABLE, TOLERANT_DRY_SPLIT_TABLE, TOLERANT_WET_SPLIT_TABLE)
+from instrumentation import Instrumentation
+from hydrostatics import ORIENTED_WET_TABLE
+
+
+
+class TestQuadrilateralSlicing(unittest.TestCase):
+
+    def setUp(self):
+        #Set up preconditions for the test
+        self.quadrilateral_test_dict = {"q": [[0, 1, 2, 3], [0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11], [12, 13, 14, 15]],
+                                        "p": [[-3.0, 0.0, 0.1], [-2.9, 0.0, 0.5], [-2.9, 0.5, 0.5], [-2.9, 0.5, 0.1], [-2.8, -0.5, 0.0],
+                                            [-2.8, 0.0, -0.5], [-2.5, 0.0, 0.0], [-2.5, 0.5, 0.0], [-2.0, -2.5, 0.0], [-2.0, 0.0, -2.5],
+                                            [-2.0, 0.0, 0.0], [-2.0, 0.5, 0.5], [0.0, -2.9, -0.1], [0.1, -2.9, -0.5], [0.5, -2.9, -0.5], [0.5, -2.9, -0.1]
+                                            ]
+                                        }
+
+    def assertPolygonListsAlmostEqual(self, first, second):
+        self.assertEqual([len(polygon) for polygon in first], [len(polygon) for polygon in second])
+        for polygon_1, polygon_2 in zip(first, second):
+            np.testing.assert_allclose(polygon_1, polygon_2, atol=1e-12)
+
+    #Test case for slice_quadrilateral_arrays
+    def test_slice_quadrilateral_arrays(self):
+        dry_polygons, dry_counts, wet_polygons, wet_counts = slice_quadrilateral_arrays([[-3.0, 0.0, 0.1], [-2.9, 0.0, 0.5], [-2.9, 0.5, 0.5], [-2.9, 0.5, -0.1]], [[0, 1, 2, 3]])
+        self.assertEqual(dry_counts.tolist(), [5])
+        self.assertEqual(wet_counts.tolist(), [3])
+        np.testing.assert_allclose(dry_polygons[0, :5], [[-3.0, 0.0, 0.1], [-2.9, 0.0, 0.5], [-2.9, 0.5, 0.5], [-2.9, 0.5, 0], [-2.95, 0.25, 0]])
+        np.testing.assert_allclose(wet_polygons[0, :3], [[-2.9, 0.5, -0.1], [-2.9, 0.5, 0], [-2.95, 0.25, 0]])
+
+    #Test case for split_up_quadrilateral_data_vectorised
+    def test_split_up_quadrilateral_data_vectorised(self):
+        self.assertPolygonListsAlmostEqual(split_up_quadrilateral_data_vectorised(self.quadrilateral_test_dict)[0], split_up_quadrilateral_data(self.quadrilateral_test_dict)[0])
+        self.assertPolygonListsAlmostEqual(split_up_quadrilateral_data_vectorised(self.quadrilateral_test_dict)[1], split_up_quadrilateral_data(self.quadrilateral_test_dict)[1])
+
+    #Test case for agreement with the SymPy engine on every sign pattern found in the sample data
+    def test_matches_sympy_engine_on_sample_data(self):
+        sample_dict = read_in_json_file("given_information/simple_challange_data.json")
+        z = np.asarray(sample_dict['p'])[:, 2]
+        masks = ((z[np.asarray(sample_dict['q'])] < 0) * np.array([1, 2, 4, 8])).sum(axis=1)
+        first_of_each_mask = [int(np.argmax(masks == mask)) for mask in np.unique(masks)]
+        subset_dict = {'p': sample_dict['p'], 'q': [sample_dict['q'][i] for i in first_of_each_mask]}
+
+        vectorised_dry, vectorised_wet = split_up_quadrilateral_data_vectorised(subset_dict)
+        sympy_dry, sympy_wet = split_up_quadrilateral_data(subset_dict)
+        self.assertPolygonListsAlmostEqual(vectorised_dry, sympy_dry)
+        self.assertPolygonListsAlmostEqual(vectorised_wet, sympy_wet)
+
+    #Test case for the split tables, which give simple polygons for every sign pattern, with the SymPy engine's corners apart from saddles
+    def test_split_tables_give_simple_polygons(self):
+        def segments_cross(a, b, c, d):
+            side = lambda p, q, r: np.sign((q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0]))
+            return(side(a, b, c) * side(a, b, d) < 0 and side(c, d, a) * side(c, d, b) < 0)
+
+        for mask in range(16):
+            z = [-1.0 if mask >> i & 1 else 1.0 for i in range(4)]
+            quadrilateral_dict = {'p': [[0.0, 0.0, z[0]], [1.0, 0.0, z[1]], [1.0, 1.0, z[2]], [0.0, 1.0, z[3]]], 'q': [[0, 1, 2, 3]]}
+            for polygons, sympy_polygons in zip(split_up_quadrilateral_data_vectorised(quadrilateral_dict), split_up_quadrilateral_data(quadrilateral_dict)):
+                for polygon, sympy_polygon in zip(polygons, sympy_polygons):
+                    self.assertEqual(polygon[0], [float(value) for value in sympy_polygon[0]])
+                    if mask not in [5, 10]:
+                        self.assertEqual(sorted(map(tuple, polygon)), sorted(tuple(float(value) for value in corner) for corner in sympy_polygon))
+                    edges = list(zip(polygon, polygon[1:] + polygon[:1]))
+                    for i in range(len(edges)):
+                        for j in range(i + 2, len(edges) - (i == 0)):
+                            self.assertFalse(segments_cross(*edges[i], *edges[j]), (mask, polygon))
+
+    #Test case for the area of the split, where the dry and wet polygons tile the quadrilateral, apart from the saddles' shared middle
+    def test_split_areas(self):
+        def area(polygon):
+            x, y = np.asarray(polygon)[:, 0], np.asarray(polygon)[:, 1]
+            return(abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2)
+
+        for mask in range(16):
+            distances = np.array([-1.0 if mask >> i & 1 else 1.0 for i in range(4)]) * [1.0, 2.0, 3.0, 4.0]
+            quadrilateral_dict = {'p': [[0.0, 0.0, distances[0]], [2.0, 0.0, distances[1]], [2.0, 1.0, distances[2]], [0.0, 1.0, distances[3]]], 'q': [[0, 1, 2, 3]]}
+            dry_polygons, wet_polygons = split_up_quadrilateral_data_vectorised(quadrilateral_dict)
+            split_area = sum(area(polygon) for polygon in dry_polygons + wet_polygons)
+
+            if mask in [5, 10]: #A saddle's hexagons both cover the quadrilateral between its four crossings
+                self.assertEqual((len(dry_polygons[0]), len(wet_polygons[0])), (6, 6))
+                crossings = [corner for corner in dry_polygons[0] if abs(corner[2]) < 1e-12]
+                self.assertEqual(len(crossings), 4)
+                self.assertAlmostEqual(split_area, 2.0 + area(sorted(crossings, key=lambda corner: np.arctan2(corner[1] - 0.5, corner[0] - 1.0))))
+
+                #The wet hexagon is the one 'hydrostatics.py' integrates
+                wet_recipe, oriented_recipe = WET_SPLIT_TABLE[mask].tolist(), ORIENTED_WET_TABLE[mask].tolist()
+                self.assertIn(wet_recipe, [oriented_recipe[i:] + oriented_recipe[:i] for i in range(6)])
+            else:
+                self.assertAlmostEqual(split_area, 2.0)
+
+    #Test case for waterplane
+    def test_waterplane(self):
+        plane_normal, plane_offset = waterplane(0.3)
+        np.testing.assert_allclose(plane_normal, [0, 0, 1])
+        self.assertEqual(plane_offset, 0.3)
+        np.testing.assert_allclose(waterplane(heel_angle=90)[0], [0, 1, 0], atol=1e-12)
+        np.testing.assert_allclose(waterplane(trim_angle=90)[0], [-1, 0, 0], atol=1e-12)
+
+    #Test case for plane_signed_distances
+    def test_plane_signed_distances(self):
+        np.testing.assert_allclose(plane_signed_distances([[1.0, 2.0, 3.0], [0.0, 0.0, -1.0]], [[0, 0, 2], [1, 0, 0]], [1.0, 0.5]),
+                                   [[2.0, -2.0], [0.5, -0.5]])
+        with self.assertRaises(ValueError):
+            plane_signed_distances([[1.0, 2.0, 3.0]], [[0, 0, 1]], [0.0, 1.0])
+        with self.assertRaises(ValueError):
+            plane_signed_distances([[1.0, 2.0, 3.0]], [0, 0, 0], 0.0)
+
+    #Test case for split_up_quadrilateral_data_by_planes
+    def test_split_up_quadrilateral_data_by_planes(self):
+        planes = [waterplane(0.0), waterplane(0.2), waterplane(-0.2, heel_angle=10, trim_angle=-5)]
+        plane_results = split_up_quadrilateral_data_by_planes(self.quadrilateral_test_dict, [normal for normal, _ in planes], [offset for _, offset in planes])
+
+        self.assertEqual(len(plane_results), 3)
+        for (plane_normal, plane_offset), (dry, wet) in zip(planes, plane_results):
+            single_dry, single_wet = split_up_quadrilateral_data_vectorised(self.quadrilateral_test_dict, plane_normal, plane_offset)
+            self.assertPolygonListsAlmostEqual(dry, single_dry)
+            self.assertPolygonListsAlmostEqual(wet, single_wet)
+
+        #Every dry corner lies on or above the raised waterline
+        shifted_dry = plane_results[1][0]
+        self.assertTrue(all(corner[2] >= 0.2 - 1e-12 for polygon in shifted_dry for corner in polygon))
+
+    #Test case for slice_quadrilateral_indices, where two quadrilaterals share the edge (1, 2) which crosses the plane
+    def test_slice_quadrilateral_indices(self):
+        points = [[0.0, 0.0, 1.0], [1.0, 0.0, 1.0], [1.0, 0.0, -1.0], [0.0, 0.0, -1.0], [2.0, 0.0, 1.0], [2.0, 0.0, -1.0]]
+        quads = [[0, 1, 2, 3], [1, 4, 5, 2]]
+        all_points, dry_indices, dry_counts, wet_indices, wet_counts = slice_quadrilateral_indices(points, quads)
+
+        self.assertEqual(len(all_points), 9) #Three crossing edges: (0, 3), (1, 2) & (4, 5)
+        self.assertEqual(dry_counts.tolist(), [4, 4])
+        shared_crossing = set(dry_indices[0].tolist()) & set(dry_indices[1].tolist()) - {1, -1}
+        self.assertEqual(len(shared_crossing), 1)
+        self.assertEqual(all_points[min(shared_crossing)].tolist(), [1.0, 0.0, 0.0])
+        self.assertEqual(set(wet_indices[0].tolist()) & set(wet_indices[1].tolist()) - {2, -1}, shared_crossing)
+
+    #Test case for agreement between the index based and coordinate based engines on the sample data
+    def test_slice_quadrilateral_indices_matches_arrays(self):
+        sample_dict = read_in_json_file("given_information/simple_challange_data.json")
+        all_points, dry_indices, dry_counts, wet_indices, wet_counts = slice_quadrilateral_indices(sample_dict['p'], sample_dict['q'])
+        dry_polygons, _, wet_polygons, _ = slice_quadrilateral_arrays(sample_dict['p'], sample_dict['q'])
+        self.assertEqual(indexed_polygons_to_lists(all_points, dry_indices, dry_counts), padded_polygons_to_lists(dry_polygons, dry_counts))
+        self.assertEqual(indexed_polygons_to_lists(all_points, wet_indices, wet_counts), padded_polygons_to_lists(wet_polygons, wet_counts))
+
+    #Test case for compact_indexed_polygons, which keeps only the points used, in their original order
+    def test_compact_indexed_polygons(self):
+        all_points = np.arange(18, dtype=np.float64).reshape(6, 3)
+        indices = np.array([[4, 1, 5, -1, -1], [-1, -1, -1, -1, -1], [1, 2, 4, 5, -1]])
+        q_for_dict, p_for_dict, remap = compact_indexed_polygons(all_points, indices, np.array([3, 0, 4]))
+        self.assertEqual(q_for_dict.tolist(), [[2, 0, 3], [0, 1, 2, 3]])
+        self.assertEqual(p_for_dict.tolist(), all_points[[1, 2, 4, 5]].tolist())
+        self.assertEqual(remap.tolist(), [-1, 0, 1, -1, 2, 3])
+
+    #Test case for split_up_quadrilateral_data_indexed, giving the same polygons as the coordinate based engine
+    def test_split_up_quadrilateral_data_indexed(self):
+        sample_dict = read_in_json_file("given_information/simple_challange_data.json")
+        dry_dict, wet_dict = split_up_quadrilateral_data_indexed(sample_dict)
+        for quadrilateral_dict, polygon_lists in zip([dry_dict, wet_dict], split_up_quadrilateral_data_vectorised(sample_dict)):
+            self.assertEqual([quadrilateral_dict['p'][polygon].tolist() for polygon in quadrilateral_dict['q']], polygon_lists)
+            self.assertEqual(len(np.unique(quadrilateral_dict['q'].vertices)), len(quadrilateral_dict['p'])) #Every point is used
+
+        #Fully dry quadrilaterals keep their original indices, shifted past the unused points
+        dry_dict, _ = split_up_quadrilateral_data_indexed({'q': [[0, 1, 2, 3], [4, 5, 6, 7]], 'p': [[0, 0, -1]] * 4 + [[0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]]})
+        self.assertEqual(dry_dict['q'].tolist(), [[0, 1, 2, 3]])
+        self.assertEqual(dry_dict['p'].tolist(), [[0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]])
+
+    #Test case for the tolerant split tables, which only differ from the plain ones where a corner lies on the plane
+    def test_tolerant_split_tables(self):
+        for mask in range(16):
+            pattern = sum(2 * 3 ** i for i in range(4) if mask >> i & 1)
+            self.assertEqual(TOLERANT_DRY_SPLIT_TABLE[pattern].tolist(), DRY_SPLIT_TABLE[mask].tolist())
+            self.assertEqual(TOLERANT_WET_SPLIT_TABLE[pattern].tolist(), WET_SPLIT_TABLE[mask].tolist())
+
+    #Test case for slice_quadrilateral_arrays with a tolerance, for corners on (or within the tolerance of) the plane
+    def test_slice_quadrilateral_arrays_tolerant(self):
+        points = [[0.0, 0.0, 1e-12], [1.0, 0.0, 1.0], [1.0, 1.0, -1.0], [0.0, 1.0, -1.0]]
+
+        #Without a tolerance the first corner is dry, so the edge into it is cut at the corner itself, duplicating it
+        dry_polygons, dry_counts, _, wet_counts = slice_quadrilateral_arrays(points, [[0, 1, 2, 3]])
+        self.assertEqual((dry_counts.tolist(), wet_counts.tolist()), ([4], [4]))
+        np.testing.assert_allclose(dry_polygons[0, 1], dry_polygons[0, 2], atol=1e-11)
+
+        #With one, the corner belongs to both sides and only the edge from the dry to the wet side is cut
+        dry_polygons, dry_counts, wet_polygons, wet_counts = slice_quadrilateral_arrays(points, [[0, 1, 2, 3]], tolerance=1e-9)
+        self.assertEqual((dry_counts.tolist(), wet_counts.tolist()), ([3], [4]))
+        np.testing.assert_allclose(dry_polygons[0, :3], [points[0], points[1], [1.0, 0.5, 0.0]])
+        np.testing.assert_allclose(wet_polygons[0, :4], [points[0], [1.0, 0.5, 0.0], points[2], points[3]])
+
+        #A corner touching the plane from below leaves no dry sliver, a quadrilateral lying in the plane is dry, and one cut along its
+        #diagonal gives two triangles
+        points = [[0.0, 0.0, 0.0], [1.0, 0.0, -1.0], [1.0, 1.0, -1.0], [0.0, 1.0, -1.0], [0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0],
+                  [0.0, 1.0, 0.0], [1.0, 0.0, 1.0], [0.0, 1.0, -1.0]]
+        _, dry_counts, _, wet_counts = slice_quadrilateral_arrays(points, [[0, 1, 2, 3], [4, 5, 6, 7], [4, 8, 6, 9]], tolerance=0.0)
+        self.assertEqual((dry_counts.tolist(), wet_counts.tolist()), ([0, 4, 3], [4, 0, 3]))
+
+        #A collapsed edge (repeated index) is merged, and a quadrilateral collapsed to a line is dropped
+        dry_polygons, dry_counts, _, wet_counts = slice_quadrilateral_arrays([[0.0, 0.0, 1.0], [1.0, 0.0, 1.0], [1.0, 1.0, 1.0]], [[0, 1, 2, 0], [0, 1, 1, 0]], tolerance=0.0)
+        self.assertEqual((dry_counts.tolist(), wet_counts.tolist()), ([3, 0], [0, 0]))
+        np.testing.assert_allclose(dry_polygons[0, :3], [[0.0, 0.0, 1.0], [1.0, 0.0, 1.0], [1.0, 1.0, 1.0]])
+
+        #Failure cases
+        self.assertRaises(ValueError, slice_quadrilateral_arrays, points, [[0, 1, 2, 3]], None, -1.0)
+
+    #Test case for remove_degenerate_polygons, alongside the corners' indices
+    def test_remove_degenerate_polygons(self):
+        polygons = np.zeros((3, 5, 3))
+        polygons[0, :5] = [[0, 0, 0], [1, 0, 0], [1, 0, 0], [1, 1, 0], [0, 0, 0]]
+        polygons[1, :3] = [[0, 0, 0], [1, 0, 0], [2, 1e-12, 0]]
+        polygons[2, :4] = [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]]
+        indices = np.array([[0, 1, 1, 2, 0], [0, 1, 3, -1, -1], [0, 1, 2, 4, -1]])
+
+        polygons, counts, indices = remove_degenerate_polygons(polygons, np.array([5, 3, 4]), 1e-9, indices)
+        self.assertEqual(counts.tolist(), [3, 0, 4])
+        self.assertEqual(indices.tolist(), [[0, 1, 2, -1, -1], [-1] * 5, [0, 1, 2, 4, -1]])
+        np.testing.assert_array_equal(polygons[0, :3], [[0, 0, 0], [1, 0, 0], [1, 1, 0]])
+        np.testing.assert_array_equal(polygons[1], 0)
+
+    #Test case for the tolerant mode on the sample data, which has corners within 1e-16 of z=0 and quadrilaterals repeating an index
+    def test_tolerant_split_of_sample_data(self):
+        sample_dict = read_in_json_file("given_information/simple_challange_data.json")
+        instrumentation = Instrumentation()
+        dry_soup, wet_soup = split_up_quadrilateral_data_vectorised(sample_dict, polygon_soup=True, tolerance=1e-9, instrumentation=instrumentation)
+        self.assertEqual(instrumentation.counters['corners_on_plane'], 8)
+
+        for soup, quadrilateral_dict in zip([dry_soup, wet_soup], split_up_quadrilateral_data_indexed(sample_dict, tolerance=1e-9)):
+            self.assertEqual(soup.tolist(), [quadrilateral_dict['p'][polygon].tolist() for polygon in quadrilateral_dict['q']])
+            for polygon in quadrilateral_dict['q']:
+                self.assertGreaterEqual(len(polygon), 3)
+                self.assertTrue(np.all(polygon != np.roll(polygon, -1))) #No repeated corners
+            for polygon in soup:
+                self.assertGreater(np.linalg.norm(np.cross(polygon, np.roll(polygon, -1, axis=0)).sum(axis=0)), 0) #No zero-area polygons
+
+        #Away from the plane, the quadrilaterals without a repeated index are split exactly as by the plain split
+        points, quads = np.array(sample_dict['p']), np.array(sample_dict['q'])
+        distinct = (quads != np.roll(quads, -1, axis=1)).all(axis=1)
+        for tolerant_values, values in zip(slice_quadrilateral_arrays(points, quads, points[:, 2] - 0.5, 1e-9), slice_quadrilateral_arrays(points, quads, points[:, 2] - 0.5)):
+            np.testing.assert_array_equal(tolerant_values[distinct], values[distinct])
+
+    #Test case for an empty mesh, which gives empty results as the SymPy engine does
+    def test_empty_mesh(self):
+        for empty_dict in [{'p': [], 'q': []}, {'p': [[0.0, 0.0, 1.0]], 'q': []}]:
+            self.assertEqual(split_up_quadrilateral_data(empty_dict), ([], []))
+            for tolerance in [None, 1e-9]:
+                self.assertEqual(split_up_quadrilateral_data_vectorised(empty_dict, tolerance=tolerance), ([], []))
+                self.assertEqual([len(soup) for soup in split_up_quadrilateral_data_vectorised(empty_dict, polygon_soup=True, tolerance=tolerance)], [0, 0])
+                for quadrilateral_dict in split_up_quadrilateral_data_indexed(empty_dict, instrumentation=Instrumentation(), tolerance=tolerance):
+                    self.assertEqual((len(quadrilateral_dict['q']), quadrilateral_dict['p'].shape), (0, (0, 3)))
+            self.assertEqual(split_up_quadrilateral_data_by_planes(empty_dict, [[0.0, 0.0, 1.0]], [0.0]), [([], [])])
+
+    #Test case for argument checks
+    def test_argument_errors(self):
+        with self.assertRaises(TypeError):
+            split_up_quadrilateral_data_vectorised([])
+        with self.assertRaises(KeyError):
+            split_up_quadrilateral_data_vectorised({'q': []})
+        with self.assertRaises(ValueError):
+            slice_quadrilateral_arrays([[0.0, 0.0]], [[0, 0, 0, 0]])
+
+
+if __name__ == '__main__':
+    unittest.main()
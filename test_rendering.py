@@ -0,0 +1,81 @@
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+from polygon_soup import PolygonSoup
+from quadrilateral_slicing import split_up_quadrilateral_data_vectorised, waterplane
+from rendering import bounding_box_edges, decimate_polygons, save_dry_and_wet_previews, waterline_segments
+from synthetic_meshes import generate_synthetic_mesh
+
+
+
+class TestRendering(unittest.TestCase):
+
+    def setUp(self):
+        #Set up preconditions for the test
+        self.dry_soup, self.wet_soup = split_up_quadrilateral_data_vectorised(generate_synthetic_mesh('cylinder', 2000, 0.1), polygon_soup=True)
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        #Clean up any resources created during the test (if needed)
+        shutil.rmtree(self.directory)
+
+    #Test case for decimate_polygons, which keeps evenly spaced polygons
+    def test_decimate_polygons(self):
+        decimated = decimate_polygons(self.wet_soup, 100)
+        self.assertEqual(len(decimated), 100)
+        np.testing.assert_array_equal(decimated[0], self.wet_soup[0])
+        np.testing.assert_array_equal(decimated[-1], self.wet_soup[-1])
+        self.assertIs(decimate_polygons(self.wet_soup, len(self.wet_soup)), self.wet_soup)
+        self.assertEqual(len(decimate_polygons(self.wet_soup.tolist(), 10)), 10)
+
+        #Failure cases
+        self.assertRaises(ValueError, decimate_polygons, self.wet_soup, 0)
+
+    #Test case for bounding_box_edges
+    def test_bounding_box_edges(self):
+        edges = bounding_box_edges([[[0.0, 0.0, 0.0], [1.0, 2.0, 0.0], [1.0, 2.0, 3.0]]])
+        self.assertEqual(edges.shape, (12, 2, 3))
+        np.testing.assert_allclose(np.sort(np.linalg.norm(edges[:, 1] - edges[:, 0], axis=1)), [1] * 4 + [2] * 4 + [3] * 4)
+        self.assertEqual(bounding_box_edges([]).shape, (0, 2, 3))
+
+    #Test case for waterline_segments, the cut edges of the split, which go once around the cylinder on each side
+    def test_waterline_segments(self):
+        for soup in [self.dry_soup, self.wet_soup]:
+            segments = waterline_segments(soup)
+            self.assertEqual(len(segments), 200) #One per column of the cylinder
+            np.testing.assert_allclose(segments[..., 2], 0, atol=1e-12)
+            self.assertAlmostEqual(np.linalg.norm(segments[:, 1] - segments[:, 0], axis=1).sum(), 2 * 200 * np.sin(np.pi / 200)) #Perimeter of the 200-gon
+
+        self.assertEqual(len(waterline_segments(PolygonSoup.from_lists([[[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0]]]))), 3)
+
+    #Test case for save_dry_and_wet_previews, in every preview mode
+    def test_save_dry_and_wet_previews(self):
+        for preview in ['auto', 'full', 'decimated', 'bounding_box', 'waterline']:
+            filenames = [os.path.join(self.directory, f'{preview}_{side}.png') for side in ['dry', 'wet']]
+            self.assertEqual(save_dry_and_wet_previews([self.dry_soup, self.wet_soup.tolist()], filenames, preview=preview, max_polygons=50), filenames)
+            for filename in filenames:
+                with open(filename, 'rb') as f:
+                    self.assertEqual(f.read(8), b'\x89PNG\r\n\x1a\n')
+
+        #A waterline along a plane other than z = 0 is traced on that plane, and a side with no polygons is drawn empty
+        dry_soup, _ = split_up_quadrilateral_data_vectorised(generate_synthetic_mesh('cylinder', 2000, 0.1), *waterplane(0.03), polygon_soup=True)
+        segments = waterline_segments(dry_soup, *waterplane(0.03))
+        self.assertEqual(len(segments), 200)
+        np.testing.assert_allclose(segments[..., 2], 0.03)
+        self.assertEqual(len(waterline_segments(dry_soup)), 0)
+        for preview in ['auto', 'bounding_box', 'waterline']:
+            filenames = [os.path.join(self.directory, f'{preview}_draft_{side}.png') for side in ['dry', 'wet']]
+            self.assertEqual(save_dry_and_wet_previews([dry_soup, PolygonSoup.from_lists([])], filenames, preview=preview, plane_normal=(0.0, 0.0, 1.0), plane_offset=0.03), filenames)
+            self.assertTrue(all(os.path.exists(filename) for filename in filenames))
+
+        #Failure cases
+        self.assertRaises(TypeError, save_dry_and_wet_previews, self.dry_soup, filenames)
+        self.assertRaises(TypeError, save_dry_and_wet_previews, [self.dry_soup], filenames[0])
+        self.assertRaises(ValueError, save_dry_and_wet_previews, [self.dry_soup], filenames, preview='wireframe')
+
+
+
+if __name__ == '__main__':
+    unittest.main()
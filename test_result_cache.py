@@ -0,0 +1,122 @@
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+from instrumentation import Instrumentation
+from polygon_soup import PolygonSoup
+from quadrilateral_slicing import split_up_quadrilateral_data_indexed, split_up_quadrilateral_data_vectorised, waterplane
+from result_cache import ResultCache, cache_key, split_up_quadrilateral_data_cached
+from synthetic_meshes import generate_synthetic_mesh
+
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        #Set up preconditions for the test
+        self.directory = tempfile.mkdtemp()
+        self.mesh = generate_synthetic_mesh('sphere', 400)
+
+    def tearDown(self):
+        #Clean up any resources created during the test (if needed)
+        shutil.rmtree(self.directory)
+
+    #Test case for cache_key, which depends on the data and every slicing parameter, but not on how the data is held
+    def test_cache_key(self):
+        key = cache_key(self.mesh)
+        self.assertEqual(key, cache_key({'p': self.mesh['p'].tolist(), 'q': self.mesh['q'].astype(np.int32).tolist()}))
+
+        moved_mesh = {'p': self.mesh['p'] + [0.0, 0.0, 1e-12], 'q': self.mesh['q']}
+        other_keys = [cache_key(moved_mesh), cache_key(self.mesh, plane_offset=0.1), cache_key(self.mesh, plane_normal=(0.0, 0.0, -1.0)),
+                      cache_key(self.mesh, mode='soup')]
+        self.assertEqual(len({key, *other_keys}), 5)
+
+        #The normal is normalised, as in the split, while the offset stays a distance along the unit normal
+        self.assertEqual(cache_key(self.mesh, (0.0, 0.0, 2.0), 0.2), cache_key(self.mesh, (0.0, 0.0, 1.0), 0.2))
+        self.assertNotEqual(cache_key(self.mesh, (0.0, 0.0, 2.0), 0.2), cache_key(self.mesh, (0.0, 0.0, 1.0), 0.1))
+        self.assertEqual(split_up_quadrilateral_data_indexed(self.mesh, (0.0, 0.0, 2.0), 0.2)[0]['p'].tolist(),
+                         split_up_quadrilateral_data_indexed(self.mesh, (0.0, 0.0, 1.0), 0.2)[0]['p'].tolist())
+
+        #Failure cases
+        self.assertRaises(KeyError, cache_key, {'p': self.mesh['p']})
+        self.assertRaises(ValueError, cache_key, self.mesh, (0.0, 0.0, 0.0))
+
+    #Test case for split_up_quadrilateral_data_cached, whose cached results equal the split, in both modes
+    def test_split_up_quadrilateral_data_cached(self):
+        cache = ResultCache(self.directory)
+        plane_normal, plane_offset = waterplane(0.2, 10, 5)
+
+        instrumentation = Instrumentation()
+        for _ in range(2):
+            dry_dict, wet_dict = split_up_quadrilateral_data_cached(self.mesh, cache, plane_normal, plane_offset, instrumentation=instrumentation)
+            for result, expected in zip([dry_dict, wet_dict], split_up_quadrilateral_data_indexed(self.mesh, plane_normal, plane_offset)):
+                self.assertIsInstance(result['q'], PolygonSoup)
+                self.assertEqual(result['q'].tolist(), expected['q'].tolist())
+                np.testing.assert_array_equal(result['p'], expected['p'])
+        self.assertEqual((instrumentation.counters['cache_misses'], instrumentation.counters['cache_hits']), (1, 1))
+
+        for _ in range(2):
+            dry_soup, wet_soup = split_up_quadrilateral_data_cached(self.mesh, cache, plane_normal, plane_offset, mode='soup')
+            for result, expected in zip([dry_soup, wet_soup], split_up_quadrilateral_data_vectorised(self.mesh, plane_normal, plane_offset, polygon_soup=True)):
+                np.testing.assert_array_equal(result.vertices, expected.vertices)
+                np.testing.assert_array_equal(result.offsets, expected.offsets)
+        self.assertEqual(len(cache), 2)
+
+        #Failure cases
+        self.assertRaises(TypeError, split_up_quadrilateral_data_cached, self.mesh, self.directory)
+        self.assertRaises(ValueError, split_up_quadrilateral_data_cached, self.mesh, cache, mode='lists')
+
+    #Test case for a corrupted entry, which is deleted and split again rather than raising
+    def test_corrupted_entry(self):
+        cache = ResultCache(self.directory)
+        key = cache_key(self.mesh)
+        expected_dicts = split_up_quadrilateral_data_cached(self.mesh, cache)
+
+        for contents in [lambda data: data[:len(data) // 2], lambda data: b'', lambda data: b'not a zip file']:
+            with open(cache._path(key), 'rb') as f:
+                data = f.read()
+            with open(cache._path(key), 'wb') as f:
+                f.write(contents(data))
+
+            self.assertIsNone(cache.get(key))
+            self.assertNotIn(key, cache)
+
+            instrumentation = Instrumentation()
+            dry_dict, _ = split_up_quadrilateral_data_cached(self.mesh, cache, instrumentation=instrumentation)
+            self.assertEqual(instrumentation.counters['cache_misses'], 1)
+            self.assertEqual(dry_dict['q'].tolist(), expected_dicts[0]['q'].tolist())
+            self.assertIn(key, cache)
+
+    #Test case for the least recently used eviction of ResultCache
+    def test_eviction(self):
+        results = split_up_quadrilateral_data_indexed(self.mesh)
+        ResultCache(os.path.join(self.directory, 'probe')).put('probe', results)
+        entry_size = os.path.getsize(os.path.join(self.directory, 'probe', 'probe.npz'))
+
+        cache = ResultCache(os.path.join(self.directory, 'cache'), max_bytes=3 * entry_size)
+        for count, key in enumerate(['a', 'b', 'c']):
+            cache.put(key, results)
+            os.utime(os.path.join(cache.directory, key + '.npz'), ns=(count * 10**9, count * 10**9)) #Distinct last uses, oldest first
+
+        self.assertIsNotNone(cache.get('a')) #'a' becomes the most recently used, leaving 'b' the least
+        cache.put('d', results)
+        self.assertEqual(sorted(key for key in 'abcd' if key in cache), ['a', 'c', 'd'])
+        self.assertLessEqual(cache.size, cache.max_bytes)
+        self.assertIsNone(cache.get('b'))
+
+        #Entries larger than the whole cache are not kept
+        ResultCache(os.path.join(self.directory, 'tiny'), max_bytes=10).put('a', results)
+        self.assertEqual(os.listdir(os.path.join(self.directory, 'tiny')), [])
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+        #Failure cases
+        self.assertRaises(TypeError, ResultCache, 1)
+        self.assertRaises(ValueError, ResultCache, self.directory, -1)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
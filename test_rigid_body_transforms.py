@@ -0,0 +1,81 @@
+import unittest
+import numpy as np
+from rigid_body_transforms import rotation_matrix, pose_matrices, transform_points, slice_quadrilateral_arrays_by_poses, split_up_quadrilateral_data_by_poses
+from quadrilateral_slicing import slice_quadrilateral_arrays, split_up_quadrilateral_data_vectorised, waterplane
+from synthetic_meshes import generate_synthetic_mesh
+
+
+
+class TestRigidBodyTransforms(unittest.TestCase):
+
+    def setUp(self):
+        #Set up preconditions for the test
+        self.quadrilateral_position_dict = generate_synthetic_mesh('wigley_hull', 1000, 0.1)
+        self.transforms = pose_matrices([0, 5, 10], [0, 2, -1], 0, [[0, 0, 0], [0, 0, 0.1], [0, 0, -0.2]])
+
+    #Test case for rotation_matrix, single and batched
+    def test_rotation_matrix(self):
+        np.testing.assert_allclose(rotation_matrix(90), [[1, 0, 0], [0, 0, -1], [0, 1, 0]], atol=1e-12)
+        np.testing.assert_allclose(rotation_matrix(yaw_angle=90) @ [1, 0, 0], [0, 1, 0], atol=1e-12)
+        rotations = rotation_matrix([0, 10, 20], 5)
+        self.assertEqual(rotations.shape, (3, 3, 3))
+        np.testing.assert_allclose(rotations @ np.swapaxes(rotations, 1, 2), np.broadcast_to(np.eye(3), (3, 3, 3)), atol=1e-12)
+
+        #The plane built by 'waterplane' is the world plane z=0 seen from the heeled and trimmed mesh's frame
+        np.testing.assert_allclose(rotation_matrix(7, 3).T @ [0, 0, 1], waterplane(0, 7, 3)[0], atol=1e-12)
+
+    #Test case for pose_matrices
+    def test_pose_matrices(self):
+        self.assertEqual(pose_matrices().shape, (1, 4, 4))
+        self.assertEqual(self.transforms.shape, (3, 4, 4))
+        np.testing.assert_array_equal(self.transforms[:, 3], np.broadcast_to([0, 0, 0, 1], (3, 4)))
+        np.testing.assert_array_equal(self.transforms[2, :3, 3], [0, 0, -0.2])
+
+        #Failure cases
+        self.assertRaises(ValueError, pose_matrices, [0, 1, 2], 0, 0, [[0, 0, 0], [0, 0, 1]])
+
+    #Test case for transform_points, against applying each homogeneous transform separately
+    def test_transform_points(self):
+        points = self.quadrilateral_position_dict['p']
+        posed_points = transform_points(points, self.transforms)
+        self.assertEqual(posed_points.shape, (3, len(points), 3))
+        homogeneous_points = np.hstack([points, np.ones((len(points), 1))])
+        for transform, pose_points in zip(self.transforms, posed_points):
+            np.testing.assert_allclose(pose_points, (homogeneous_points @ transform.T)[:, :3], atol=1e-12)
+        np.testing.assert_allclose(transform_points(points, self.transforms[1]), posed_points[1])
+
+        #Failure cases
+        self.assertRaises(ValueError, transform_points, points[:, :2], self.transforms)
+        self.assertRaises(ValueError, transform_points, points, np.eye(3))
+
+    #Test case for slice_quadrilateral_arrays_by_poses, against slicing each pose separately
+    def test_slice_quadrilateral_arrays_by_poses(self):
+        points, quads = self.quadrilateral_position_dict['p'], self.quadrilateral_position_dict['q']
+        results = slice_quadrilateral_arrays_by_poses(points, quads, self.transforms)
+        self.assertEqual(results[0].shape, (3, len(quads), 6, 3))
+        for pose, transform in enumerate(self.transforms):
+            for result, expected in zip(results, slice_quadrilateral_arrays(transform_points(points, transform), quads)):
+                np.testing.assert_array_equal(result[pose], expected)
+
+        #Failure cases
+        self.assertRaises(ValueError, slice_quadrilateral_arrays_by_poses, points, quads, self.transforms[0])
+        self.assertRaises(ValueError, slice_quadrilateral_arrays_by_poses, points, quads, self.transforms, (0, 0, 0))
+
+    #Test case for split_up_quadrilateral_data_by_poses
+    def test_split_up_quadrilateral_data_by_poses(self):
+        pose_results = split_up_quadrilateral_data_by_poses(self.quadrilateral_position_dict, self.transforms)
+        self.assertEqual(len(pose_results), 3)
+        posed_dict = {'q': self.quadrilateral_position_dict['q'], 'p': transform_points(self.quadrilateral_position_dict['p'], self.transforms[2])}
+        self.assertEqual(pose_results[2], split_up_quadrilateral_data_vectorised(posed_dict))
+
+        #An empty mesh gives empty results at every pose
+        self.assertEqual(split_up_quadrilateral_data_by_poses({'p': [], 'q': []}, self.transforms), [([], [])] * 3)
+
+        #Failure cases
+        self.assertRaises(TypeError, split_up_quadrilateral_data_by_poses, [], self.transforms)
+        self.assertRaises(KeyError, split_up_quadrilateral_data_by_poses, {'q': []}, self.transforms)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
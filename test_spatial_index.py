@@ -0,0 +1,147 @@
+import unittest
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+from quadrilateral_slicing import plane_signed_distances, slice_quadrilateral_arrays, split_up_quadrilateral_data_vectorised, waterplane
+from spatial_index import (CANDIDATE_QUADRILATERAL, DRY_QUADRILATERAL, WET_QUADRILATERAL, SpatialIndex, load_or_build_spatial_index, spatial_index_path,
+                           split_up_quadrilateral_data_in_region, split_up_quadrilateral_data_with_index)
+from synthetic_meshes import generate_synthetic_mesh
+
+
+
+class TestSpatialIndex(unittest.TestCase):
+
+    def setUp(self):
+        #Set up preconditions for the test
+        self.directory = tempfile.mkdtemp()
+        self.mesh = generate_synthetic_mesh('wigley_hull', 2000)
+        self.points, self.quads = self.mesh['p'], np.asarray(self.mesh['q'])
+        self.spatial_index = SpatialIndex.build(self.points, self.quads, quads_per_cell=16)
+
+        #A region of interest around the bow, between z = -0.2 and z = 0.2
+        self.lower, self.upper = np.array([self.points[:, 0].max() - 1.0, -np.inf, -0.2]), np.array([np.inf, np.inf, 0.2])
+
+    def tearDown(self):
+        #Clean up any resources created during the test (if needed)
+        shutil.rmtree(self.directory)
+
+    #Test case for SpatialIndex.build, which stores every quadrilateral once, grouped by cell within the cell's bounds
+    def test_build(self):
+        self.assertEqual(len(self.spatial_index), len(self.quads))
+        self.assertEqual(sorted(self.spatial_index.quad_order.tolist()), list(range(len(self.quads))))
+        self.assertGreater(self.spatial_index.cell_count, 1)
+
+        cells = np.repeat(np.arange(self.spatial_index.cell_count), np.diff(self.spatial_index.cell_offsets))
+        self.assertTrue(np.all(self.spatial_index.cell_lower[cells] <= self.spatial_index.quad_lower))
+        self.assertTrue(np.all(self.spatial_index.cell_upper[cells] >= self.spatial_index.quad_upper))
+
+        #A flat mesh gets a single layer of cells, and an empty mesh no cells
+        flat_index = SpatialIndex.build(self.points * [1.0, 1.0, 0.0], self.quads, quads_per_cell=16)
+        self.assertEqual(len(flat_index.query_box([-np.inf, -np.inf, 0.0], [np.inf, np.inf, 0.0])), len(self.quads))
+        self.assertEqual(SpatialIndex.build(self.points, np.zeros((0, 4), dtype=int)).cell_count, 0)
+
+        #Failure cases
+        self.assertRaises(ValueError, SpatialIndex.build, self.points, self.quads, 0)
+        self.assertRaises(ValueError, SpatialIndex.build, self.points[:, :2], self.quads)
+
+    #Test case for query_box and query_plane, which match testing every quadrilateral
+    def test_queries(self):
+        quad_xyz_coordinates = self.points[self.quads]
+        quad_lower, quad_upper = quad_xyz_coordinates.min(axis=1), quad_xyz_coordinates.max(axis=1)
+
+        expected = np.flatnonzero(np.all((quad_lower <= self.upper) & (quad_upper >= self.lower), axis=1))
+        np.testing.assert_array_equal(self.spatial_index.query_box(self.lower, self.upper), expected)
+        self.assertLess(len(expected), len(self.quads))
+
+        for plane_normal, plane_offset in [((0.0, 0.0, 1.0), 0.0), ((0.0, 0.0, 1.0), -0.3), waterplane(0.1, 10, 3)]:
+            signed_distances = plane_signed_distances(self.points, plane_normal, plane_offset)[0]
+            quad_distances = signed_distances[self.quads]
+            mixed = np.flatnonzero((quad_distances < 0).any(axis=1) & (quad_distances >= 0).any(axis=1))
+
+            candidates = self.spatial_index.query_plane(plane_normal, plane_offset)
+            self.assertTrue(np.isin(mixed, candidates).all())
+            self.assertLess(len(candidates), len(self.quads) / 2)
+
+            regional_candidates = self.spatial_index.query_plane(plane_normal, plane_offset, self.lower, self.upper)
+            np.testing.assert_array_equal(regional_candidates, np.intersect1d(candidates, expected))
+
+            #Every quadrilateral labelled wholly dry or wet is so, and the candidates include every cut one
+            labels = self.spatial_index.classify_quadrilaterals(plane_normal, plane_offset)
+            self.assertTrue(np.all(quad_distances[labels == DRY_QUADRILATERAL] >= 0))
+            self.assertTrue(np.all(quad_distances[labels == WET_QUADRILATERAL] < 0))
+            np.testing.assert_array_equal(np.flatnonzero(labels == CANDIDATE_QUADRILATERAL), candidates)
+
+        #Failure cases
+        self.assertRaises(ValueError, self.spatial_index.query_plane, (0.0, 0.0, 0.0))
+        self.assertRaises(ValueError, self.spatial_index.classify_quadrilaterals, (0.0, 0.0, 0.0))
+
+    #Test case for split_up_quadrilateral_data_in_region, which gives the region's quadrilaterals exactly the polygons of the full split
+    def test_split_up_quadrilateral_data_in_region(self):
+        plane_normal, plane_offset = waterplane(0.05, 5, 0)
+        dry_polygons, dry_counts, wet_polygons, wet_counts = slice_quadrilateral_arrays(self.points, self.quads, plane_signed_distances(self.points, plane_normal, plane_offset)[0])
+
+        dry_soup, wet_soup, quad_indices = split_up_quadrilateral_data_in_region(self.mesh, self.spatial_index, self.lower, self.upper, plane_normal, plane_offset, polygon_soup=True)
+        np.testing.assert_array_equal(quad_indices, self.spatial_index.query_box(self.lower, self.upper))
+        for soup, polygons, counts in [(dry_soup, dry_polygons, dry_counts), (wet_soup, wet_polygons, wet_counts)]:
+            self.assertEqual(soup.tolist(), [polygons[index, :counts[index]].tolist() for index in quad_indices if counts[index] > 0])
+
+        dry_lists, _, _ = split_up_quadrilateral_data_in_region(self.mesh, self.spatial_index, self.lower, self.upper, plane_normal, plane_offset)
+        self.assertEqual(dry_lists, dry_soup.tolist())
+
+        #The whole mesh as the region gives the full split
+        whole_dry_soup, _, _ = split_up_quadrilateral_data_in_region(self.mesh, self.spatial_index, [-np.inf] * 3, [np.inf] * 3, polygon_soup=True)
+        np.testing.assert_array_equal(whole_dry_soup.vertices, split_up_quadrilateral_data_vectorised(self.mesh, polygon_soup=True)[0].vertices)
+
+        #Failure cases
+        self.assertRaises(TypeError, split_up_quadrilateral_data_in_region, {'p': self.points.tolist(), 'q': self.quads.tolist()}, self.spatial_index, self.lower, self.upper)
+        self.assertRaises(TypeError, split_up_quadrilateral_data_in_region, self.mesh, None, self.lower, self.upper)
+        self.assertRaises(ValueError, split_up_quadrilateral_data_in_region, self.mesh, SpatialIndex.build(self.points, self.quads[:10]), self.lower, self.upper)
+        self.assertRaises(KeyError, split_up_quadrilateral_data_in_region, {'p': self.points}, self.spatial_index, self.lower, self.upper)
+
+    #Test case for split_up_quadrilateral_data_with_index, which gives exactly the polygons of the full split, including for planes through points
+    def test_split_up_quadrilateral_data_with_index(self):
+        for plane_normal, plane_offset in [((0.0, 0.0, 1.0), 0.0), ((0.0, 0.0, 1.0), self.points[7, 2]), waterplane(0.1, 10, 3), ((1.0, 0.0, 0.0), 0.0)]:
+            for result, expected in zip(split_up_quadrilateral_data_with_index(self.mesh, self.spatial_index, plane_normal, plane_offset, polygon_soup=True),
+                                        split_up_quadrilateral_data_vectorised(self.mesh, plane_normal, plane_offset, polygon_soup=True)):
+                np.testing.assert_array_equal(result.vertices, expected.vertices)
+                np.testing.assert_array_equal(result.offsets, expected.offsets)
+
+        self.assertEqual(split_up_quadrilateral_data_with_index(self.mesh, self.spatial_index), split_up_quadrilateral_data_vectorised(self.mesh))
+
+        #Failure cases
+        self.assertRaises(TypeError, split_up_quadrilateral_data_with_index, {'p': self.points, 'q': self.quads.tolist()}, self.spatial_index)
+        self.assertRaises(ValueError, split_up_quadrilateral_data_with_index, generate_synthetic_mesh('sphere', 100), self.spatial_index)
+        self.assertRaises(ValueError, split_up_quadrilateral_data_with_index, self.mesh, self.spatial_index, (0.0, 0.0, 0.0))
+
+    #Test case for save, load and load_or_build_spatial_index, which keeps the index beside its mesh and rebuilds a stale one
+    def test_save_and_load(self):
+        filename = os.path.join(self.directory, 'index.npz')
+        loaded_index = SpatialIndex.load(self.spatial_index.save(filename))
+        np.testing.assert_array_equal(loaded_index.query_box(self.lower, self.upper), self.spatial_index.query_box(self.lower, self.upper))
+        self.assertEqual(loaded_index.point_count, len(self.points))
+
+        mesh_filename = os.path.join(self.directory, 'hull.qpb')
+        open(mesh_filename, 'w').close()
+        self.assertEqual(spatial_index_path(mesh_filename), mesh_filename + '.qpi.npz')
+
+        built_index = load_or_build_spatial_index(mesh_filename, self.mesh)
+        self.assertTrue(os.path.exists(spatial_index_path(mesh_filename)))
+        self.assertEqual(load_or_build_spatial_index(mesh_filename, self.mesh).cell_count, built_index.cell_count)
+
+        #A different mesh under the same name, or a mesh newer than its index, gets a new index
+        other_mesh = generate_synthetic_mesh('sphere', 100)
+        self.assertEqual(len(load_or_build_spatial_index(mesh_filename, other_mesh)), len(other_mesh['q']))
+        modified = time.time() + 10
+        os.utime(mesh_filename, (modified, modified))
+        self.assertEqual(len(load_or_build_spatial_index(mesh_filename, self.mesh)), len(self.quads))
+
+        #Failure cases
+        self.assertRaises(TypeError, self.spatial_index.save, 1)
+        self.assertRaises(TypeError, SpatialIndex.load, 1)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+import asyncio
+import os
+import shutil
+import tempfile
+import numpy as np
+from mesh_writers import write_geometry_file
+from quadrilateral_slicing import split_up_quadrilateral_data_vectorised
+from rigid_body_transforms import pose_matrices, slice_quadrilateral_arrays_by_poses
+from split_service import SplitService, posed_mesh_planes, send_requests, split_mesh_batch
+from synthetic_meshes import generate_synthetic_mesh
+
+
+
+class TestSplitService(unittest.TestCase):
+
+    def setUp(self):
+        #Set up preconditions for the test
+        self.directory = tempfile.mkdtemp()
+        self.mesh = generate_synthetic_mesh('wigley_hull', 400)
+        self.mesh_path = os.path.join(self.directory, 'hull.qpb')
+        write_geometry_file(self.mesh_path, self.mesh)
+        self.transform = pose_matrices(5, 2, 10, [0.0, 0.0, -0.1])[0]
+
+    def tearDown(self):
+        #Clean up any resources created during the test (if needed)
+        shutil.rmtree(self.directory)
+
+    #Test case for posed_mesh_planes and split_mesh_batch, which match splitting the posed mesh
+    def test_split_mesh_batch(self):
+        mesh_normal, mesh_offset = posed_mesh_planes((0.0, 0.0, 2.0), 0.1, self.transform)
+        np.testing.assert_allclose(np.linalg.norm(mesh_normal), 1.0)
+
+        request_results = split_mesh_batch(self.mesh['p'], self.mesh['q'], np.array([mesh_normal, [0.0, 0.0, 1.0], mesh_normal]),
+                                           np.array([mesh_offset, 0.0, mesh_offset]), np.array([self.transform, np.eye(4), self.transform]))
+        self.assertEqual(len(request_results), 3)
+
+        dry_polygons, dry_counts, _, _ = slice_quadrilateral_arrays_by_poses(self.mesh['p'], self.mesh['q'], self.transform[None], (0.0, 0.0, 1.0), 0.05)
+        expected_dry_polygons = [polygon[:count] for polygon, count in zip(dry_polygons[0], dry_counts[0]) if count > 0]
+        self.assertEqual(len(request_results[0][0]), len(expected_dry_polygons))
+        np.testing.assert_allclose(request_results[0][0].vertices, np.concatenate(expected_dry_polygons), atol=1e-12)
+        np.testing.assert_array_equal(request_results[2][0].vertices, request_results[0][0].vertices)
+
+        expected_dry_soup, expected_wet_soup = split_up_quadrilateral_data_vectorised(self.mesh, polygon_soup=True)
+        np.testing.assert_array_equal(request_results[1][0].vertices, expected_dry_soup.vertices)
+        np.testing.assert_array_equal(request_results[1][1].vertices, expected_wet_soup.vertices)
+
+        #Failure cases
+        self.assertRaises(ValueError, posed_mesh_planes, (0.0, 0.0, 0.0), 0.0, self.transform)
+
+    #Test case for SplitService, which reads each mesh once and batches concurrent splits of it
+    def test_split_service(self):
+        async def run():
+            service = SplitService(workers=2, batch_window=0.05)
+            try:
+                results = await asyncio.gather(*[service.split(self.mesh_path, (0.0, 0.0, 1.0), offset) for offset in [-0.1, 0.0, 0.1]])
+                self.assertEqual([batch_size for _, _, batch_size in results], [3, 3, 3])
+                self.assertEqual(service.meshes, [self.mesh_path])
+
+                dry_soup, _, _ = results[1]
+                self.assertEqual(dry_soup.tolist(), split_up_quadrilateral_data_vectorised(self.mesh, polygon_soup=True)[0].tolist())
+
+                #Requests beyond 'max_batch_size' go into the next batch
+                service.max_batch_size = 2
+                results = await asyncio.gather(*[service.split(self.mesh_path) for _ in range(3)])
+                self.assertEqual(sorted(batch_size for _, _, batch_size in results), [1, 2, 2])
+
+                self.assertTrue(service.unload_mesh(self.mesh_path))
+                self.assertFalse(service.unload_mesh(self.mesh_path))
+
+                #Failure cases
+                with self.assertRaises(FileNotFoundError):
+                    await service.split(os.path.join(self.directory, 'missing.json'))
+                self.assertEqual(service.meshes, [])
+            finally:
+                service.close()
+
+        asyncio.run(run())
+
+        #Failure cases
+        self.assertRaises(TypeError, SplitService, 1.5)
+        self.assertRaises(ValueError, SplitService, 0)
+        self.assertRaises(ValueError, SplitService, 1, -1.0)
+
+    #Test case for the json lines protocol, served on a localhost port and answered by send_requests
+    def test_serve(self):
+        async def run():
+            service = SplitService(workers=1)
+            server = await service.serve(port=0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                requests = [{'op': 'ping'}, {'op': 'load', 'mesh': self.mesh_path},
+                            {'op': 'split', 'mesh': self.mesh_path, 'plane': [0, 0, 1, 0.05], 'output': 'polygons'},
+                            {'op': 'split', 'mesh': self.mesh_path, 'pose': {'heel': 5, 'trim': 2, 'yaw': 10, 'translation': [0, 0, -0.1]}, 'plane': [0, 0, 1, 0.05]},
+                            {'op': 'meshes'}, {'op': 'split', 'mesh': self.mesh_path, 'plane': [0, 0, 1]}, {'op': 'split', 'mesh': self.mesh_path, 'output': 'mesh'},
+                            {'op': 'resize'}, {'op': 'load', 'mesh': 1}]
+                responses = await send_requests(requests, host='127.0.0.1', port=port)
+            finally:
+                server.close()
+                await server.wait_closed()
+                service.close()
+            return(responses)
+
+        responses = asyncio.run(run())
+        self.assertEqual([response['id'] for response in responses], list(range(9)))
+        self.assertEqual(responses[0]['status'], 'ok')
+        self.assertEqual((responses[1]['points'], responses[1]['quadrilaterals']), (len(self.mesh['p']), len(self.mesh['q'])))
+
+        expected_dry_soup, expected_wet_soup = split_up_quadrilateral_data_vectorised(self.mesh, plane_offset=0.05, polygon_soup=True)
+        self.assertEqual((responses[2]['dry'], responses[2]['wet']), (expected_dry_soup.tolist(), expected_wet_soup.tolist()))
+        self.assertEqual(responses[2]['dry_polygons'], len(expected_dry_soup))
+        self.assertNotIn('dry', responses[3])
+        self.assertNotEqual(responses[3]['dry_polygons'], responses[2]['dry_polygons'])
+        self.assertEqual(responses[4]['meshes'], [self.mesh_path])
+
+        #Failure cases
+        self.assertTrue(responses[5]['error'].startswith('ValueError'))
+        self.assertTrue(responses[6]['error'].startswith('ValueError'))
+        self.assertTrue(responses[7]['error'].startswith('ValueError'))
+        self.assertTrue(responses[8]['error'].startswith('TypeError'))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+import numpy as np
+from synthetic_meshes import SHAPES, generate_synthetic_mesh, waterline_crossing_ratio
+
+
+
+class TestSyntheticMeshes(unittest.TestCase):
+
+    #Test case for generate_synthetic_mesh, checking size, crossing ratio and index validity for every shape
+    def test_generate_synthetic_mesh(self):
+        for shape in SHAPES:
+            for panel_count, crossing_ratio in [(1000, 0.05), (5000, 0.2), (30, 1.0)]:
+                quadrilateral_position_dict = generate_synthetic_mesh(shape, panel_count, crossing_ratio)
+                quads = quadrilateral_position_dict['q']
+
+                self.assertEqual(quads.shape[1], 4)
+                self.assertAlmostEqual(len(quads) / panel_count, 1, delta=0.1)
+                self.assertTrue(0 <= quads.min() and quads.max() < len(quadrilateral_position_dict['p']))
+                self.assertAlmostEqual(waterline_crossing_ratio(quadrilateral_position_dict), crossing_ratio, delta=0.1 * crossing_ratio)
+
+    #Test case for the Wigley hull staying within its beam, draft and freeboard
+    def test_wigley_hull_bounds(self):
+        points = generate_synthetic_mesh('wigley_hull', 2000)['p']
+        np.testing.assert_array_less(np.abs(points[:, 1]), 0.5 + 1e-12)
+        self.assertAlmostEqual(points[:, 2].min(), -0.625)
+        self.assertAlmostEqual(points[:, 2].max(), 0.5)
+
+    #Test case for waterline_crossing_ratio
+    def test_waterline_crossing_ratio(self):
+        self.assertEqual(waterline_crossing_ratio({'p': [[0, 0, 1], [0, 0, -1]], 'q': [[0, 0, 0, 1], [0, 0, 0, 0]]}), 0.5)
+
+    #Test case for argument checks
+    def test_argument_errors(self):
+        with self.assertRaises(ValueError):
+            generate_synthetic_mesh('cube', 100)
+        with self.assertRaises(ValueError):
+            generate_synthetic_mesh('cylinder', 100, 0)
+        with self.assertRaises(TypeError):
+            generate_synthetic_mesh('cylinder', 100.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
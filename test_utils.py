@@ -1,7 +1,13 @@
 import unittest
 import os
 import json
-from utils import next_and_previous_index, create_new_files
+import gzip
+import shutil
+import tempfile
+import numpy as np
+from utils import next_and_previous_index, create_new_files, weld_polygon_vertices
+from mesh_io import read_in_binary_geometry_file
+from polygon_soup import PolygonSoup
 
 
 
@@ -13,6 +19,35 @@ class TestUtilsGeneral(unittest.TestCase):
         self.assertEqual(next_and_previous_index(2, 3), (3,1))
 
 
+class TestUtilsVertexWelding(unittest.TestCase):
+
+    #Test case for weld_polygon_vertices with exact matching
+    def test_weld_polygon_vertices(self):
+        #Equal points share an index, however they are written (0 vs 0.0 vs -0.0)
+        self.assertEqual(weld_polygon_vertices([[[1.0, 2.0, 0], [1.0, 0.0, 0.5]], [[1.0, 2.0, 0.0], [1.0, 2.0, -0.0], [3.0, 0.0, 0.5]]]),
+                         ([[0, 1], [0, 0, 2]], [[1.0, 2.0, 0], [1.0, 0.0, 0.5], [3.0, 0.0, 0.5]]))
+
+    #Test case for weld_polygon_vertices with a tolerance, including points either side of a grid cell boundary
+    def test_weld_polygon_vertices_tolerance(self):
+        polygons = [[[0.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.99999999, 1.00000001, 0.0]], [[1.00000001, 0.99999999, 1e-9], [2.0, 0.0, 0.0]]]
+        self.assertEqual(weld_polygon_vertices(polygons, 1e-6), ([[0, 1, 1], [1, 2]], [[0.0, 0.0, 0.0], [1.0, 1.0, 0.0], [2.0, 0.0, 0.0]]))
+        self.assertEqual(len(weld_polygon_vertices(polygons)[1]), 5)
+
+    #Test case for weld_polygon_vertices given a PolygonSoup, which must number the points exactly as the lists do
+    def test_weld_polygon_vertices_polygon_soup(self):
+        polygons = [[[1.0, 2.0, 0.0], [1.0, 0.0, 0.5]], [[1.0, 2.0, 0.0], [1.0, 2.0, -0.0], [3.0, 0.0, 0.5]], [[3.0, 0.0, 0.5], [0.0, 0.0, 0.0], [1.0, 0.0, 0.5]]]
+        for tolerance in [0.0, 1e-6]:
+            q_for_dict, p_for_dict = weld_polygon_vertices(PolygonSoup.from_lists(polygons), tolerance)
+            self.assertEqual((q_for_dict.tolist(), p_for_dict.tolist()), weld_polygon_vertices(polygons, tolerance))
+
+    #Test case for argument checks
+    def test_weld_polygon_vertices_errors(self):
+        with self.assertRaises(TypeError):
+            weld_polygon_vertices([], '0.1')
+        with self.assertRaises(ValueError):
+            weld_polygon_vertices([], -0.1)
+
+
 class TestUtilsJSONFileCreation(unittest.TestCase):
 
     def setUp(self):
@@ -33,8 +68,9 @@ class TestUtilsJSONFileCreation(unittest.TestCase):
 
     def tearDown(self):
         #Clean up any resources created during the test (if needed)
-        if os.path.exists(f'resulting_files/{self.filename}.json'):
-            os.remove(f'resulting_files/{self.filename}.json')
+        for extension in ['.json', '.qpb']:
+            if os.path.exists(f'resulting_files/{self.filename}{extension}'):
+                os.remove(f'resulting_files/{self.filename}{extension}')
 
     def test_create_new_files(self):
         #Call the function to create the JSON file
@@ -48,6 +84,57 @@ class TestUtilsJSONFileCreation(unittest.TestCase):
             file_data = json.load(file)
             self.assertEqual(file_data, self.expected_result)
 
+    def test_create_new_files_binary(self):
+        #The binary format holds the same data
+        create_new_files([self.quadrilateral_test_data], [self.filename], file_format='binary')
+
+        quadrilateral_position_dict = read_in_binary_geometry_file(f'resulting_files/{self.filename}.qpb')
+        self.assertEqual(quadrilateral_position_dict['q'].tolist(), self.expected_result['q'])
+        self.assertEqual(quadrilateral_position_dict['p'].tolist(), self.expected_result['p'])
+
+    def test_create_new_files_streaming(self):
+        #Writing in chunks must give the same file contents
+        create_new_files([self.quadrilateral_test_data], [self.filename], chunk_size=2)
+
+        with open(f'resulting_files/{self.filename}.json', 'r') as file:
+            file_data = json.load(file)
+            self.assertEqual(file_data, self.expected_result)
+
+    def test_create_new_files_polygon_soup(self):
+        #A PolygonSoup is saved exactly as the equivalent lists are, in every format
+        for options in [{}, {'chunk_size': 2}]:
+            create_new_files([PolygonSoup.from_lists(self.quadrilateral_test_data)], [self.filename], **options)
+            with open(f'resulting_files/{self.filename}.json', 'r') as file:
+                self.assertEqual(json.load(file), self.expected_result)
+
+        create_new_files([PolygonSoup.from_lists(self.quadrilateral_test_data)], [self.filename], file_format='binary')
+        self.assertEqual(read_in_binary_geometry_file(f'resulting_files/{self.filename}.qpb')['q'].tolist(), self.expected_result['q'])
+
+
+    def test_create_new_files_indexed(self):
+        #Dicts that already hold 'q' and 'p' are saved as they are, without welding
+        create_new_files([{'q': PolygonSoup(np.array([0, 1, 2, 0, 0, 1, 2]), [0, 3, 7]), 'p': np.zeros((3, 3))}], [self.filename])
+        with open(f'resulting_files/{self.filename}.json', 'r') as file:
+            self.assertEqual(json.load(file), {'q': [[0, 1, 2], [0, 0, 1, 2]], 'p': [[0.0, 0.0, 0.0]] * 3})
+
+
+    def test_create_new_files_output_directory(self):
+        #Files can be compressed, and saved to any directory
+        directory = tempfile.mkdtemp()
+        try:
+            create_new_files([self.quadrilateral_test_data, self.quadrilateral_test_data], ['dry', 'wet'], output_directory=directory, compression='gzip')
+            for name in ['dry', 'wet']:
+                with gzip.open(os.path.join(directory, f'{name}.json.gz'), 'rt') as file:
+                    self.assertEqual(json.load(file), self.expected_result)
+        finally:
+            shutil.rmtree(directory)
+
+        with self.assertRaises(ValueError):
+            create_new_files([self.quadrilateral_test_data], [self.filename], file_format='txt')
+        with self.assertRaises(ValueError):
+            create_new_files([self.quadrilateral_test_data], [self.filename], compression='zip')
+
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
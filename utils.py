@@ -1,7 +1,10 @@
 import json
+import math
 import os
-from mpl_toolkits.mplot3d.art3d import Poly3DCollection
-import matplotlib.pyplot as plt
+import numpy as np
+from mesh_writers import GEOMETRY_WRITERS, geometry_output_path, write_geometry_files, write_json_geometry
+from polygon_soup import PolygonSoup
+from rendering import DEFAULT_MAX_PREVIEW_POLYGONS, draw_preview
 
 
 
@@ -54,8 +57,10 @@ def save_json_file(filename, quadrilateral_dict_for_saving):
     if not os.path.exists('resulting_files'):
         os.makedirs('resulting_files')
     
+    #Written by the same json writer as 'create_new_files', which converts array backed data (e.g. from 'weld_polygon_vertices' given a
+    #PolygonSoup) to lists for the json encoder
     with open(f'resulting_files/{filename}.json', 'w') as f:
-        json.dump(quadrilateral_dict_for_saving, f)
+        write_json_geometry(f, quadrilateral_dict_for_saving)
 
 
 def next_and_previous_index(index, max_index):
@@ -92,59 +97,153 @@ def next_and_previous_index(index, max_index):
     return(next_index, prev_index)
 
 
-def create_new_files(data_objects_for_saving, data_object_filenames):
+def weld_polygon_vertices(polygons, tolerance=0.0):
+
+    """
+    Builds a shared list of unique points ('p') and the per-polygon indices into it ('q') from a list of polygons, in roughly linear
+    time. Points are indexed in a hash map keyed on their coordinates; with a 'tolerance' the key is instead the point's cell in a
+    grid of that spacing, and the neighbouring cells are searched too, so that points closer than 'tolerance' in every coordinate
+    (e.g. the same cut point computed from two neighbouring quadrilaterals) are merged into the first one found.
+
+    A PolygonSoup is welded without leaving NumPy when 'tolerance' is 0, by sorting its corners into unique rows, and gives its
+    results as arrays: 'q' as a PolygonSoup of point indices, and 'p' as a (V, 3) array.
+
+    Args:
+        polygons (list): A list of polygons, each a list of [x, y, z] points, e.g. [[[-3.0, 0.0, 0.1], [-2.9, 0.0, 0.5], [-2.9, 0.5, 0.5]], ...].
+            Or a PolygonSoup.
+        tolerance (float): The distance (per coordinate) within which two points are treated as the same point. 0 means exact matches only.
+
+    Returns:
+        q_for_dict (list): A list of index lists, one per polygon (a PolygonSoup of indices, if given a PolygonSoup).
+        p_for_dict (list): The unique points, in order of first appearance (a (V, 3) array, if given a PolygonSoup).
+
+    Raises:
+        TypeError: If 'tolerance' is not an int or float.
+        ValueError: If 'tolerance' is negative.
+    """
+
+    if not isinstance(tolerance, (int, float)):
+        raise TypeError("'tolerance' argument must be an int or float")
+    elif tolerance < 0:
+        raise ValueError("'tolerance' argument must not be negative")
+
+    if isinstance(polygons, PolygonSoup):
+        if tolerance != 0:
+            q_for_dict, p_for_dict = weld_polygon_vertices(polygons.tolist(), tolerance)
+            flat_indices = np.array([index for polygon in q_for_dict for index in polygon], dtype=np.int64)
+            return(PolygonSoup(flat_indices, polygons.offsets - polygons.offsets[0]), np.array(p_for_dict).reshape(-1, 3))
+
+        corners = polygons.vertices[polygons.offsets[0]:polygons.offsets[-1]].reshape(-1, 3) + 0.0 #'+ 0.0' merges -0.0 with 0.0, as the hash map does
+        unique_points, first_positions, inverse = np.unique(corners, axis=0, return_index=True, return_inverse=True)
+        order = np.argsort(first_positions) #Renumbers the unique points in order of first appearance
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+
+        return(PolygonSoup(rank[inverse.reshape(-1)], polygons.offsets - polygons.offsets[0]), unique_points[order])
+
+    q_for_dict = []
+    p_for_dict = []
+    position_identifier = {} #Maps a point (or its grid cell) to its position in p_for_dict
+
+    for polygon in polygons:
+        q_position = []
+        for point in polygon:
+
+            if tolerance == 0:
+                key = tuple(point)
+                if key not in position_identifier:
+                    position_identifier[key] = len(p_for_dict) #This is run before appending, so that position starts at 0
+                    p_for_dict.append(point)
+                q_position.append(position_identifier[key])
+                continue
+
+            cell = tuple(math.floor(coordinate / tolerance) for coordinate in point)
+            position = None
+            for neighbour in ((cell[0] + i, cell[1] + j, cell[2] + k) for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1)):
+                for candidate in position_identifier.get(neighbour, []):
+                    if all(abs(a - b) <= tolerance for a, b in zip(point, p_for_dict[candidate])):
+                        position = candidate
+                        break
+                if position is not None:
+                    break
+
+            if position is None:
+                position = len(p_for_dict)
+                position_identifier.setdefault(cell, []).append(position)
+                p_for_dict.append(point)
+            q_position.append(position)
+
+        q_for_dict.append(q_position)
+
+    return(q_for_dict, p_for_dict)
+
+
+def create_new_files(data_objects_for_saving, data_object_filenames, chunk_size=None, tolerance=0.0, file_format='json', instrumentation=None,
+                     output_directory='resulting_files', compression=None, max_workers=None):
 
     """
     Takes a list of lists (+ associated filename) and creates a dict object, which is then saved to a json file.
     This function can take any number of lists for saving, as long as it comes with an associated name.
+    The files are written concurrently, on a thread pool (see 'write_geometry_files' in 'mesh_writers.py').
 
     Args:
         data_objects_for_saving (list): A list of lists, where every list within takes the shape of - [[-3.0, 0.0, 0.1], [-2.9, 0.0, 0.5], [-2.9, 0.5, 0.5], [-2.9, 0.5, 0.1]].
+            Any of them may instead be a PolygonSoup, which is welded and saved without being converted to lists first.
+            Or a dict already holding 'q' and 'p' (e.g. from 'split_up_quadrilateral_data_indexed'), which is saved as it is.
         data_object_filenames (list): The name to be given to the file saved from each list given.
+        chunk_size (int): If given, json files are written 'chunk_size' rows at a time rather than converted to lists all at once.
+        tolerance (float): Points closer than this (per coordinate) share one entry in 'p', see 'weld_polygon_vertices'.
+        file_format (str): 'json', 'binary' for the memory mappable format of 'save_binary_geometry_file', 'stl' or 'obj'.
+        instrumentation (Instrumentation): If given, the number of corners merged into existing points is counted as 'vertices_deduplicated'.
+        output_directory (str): The directory the files are saved within.
+        compression (str): None, or 'gzip', 'bz2', 'xz' or 'zstd' to compress the files as they are written.
+        max_workers (int): The number of writer threads. Defaults to one per file.
 
     Returns:
         None
 
     Raises:
         TypeError: If either 'data_objects_for_saving' or 'data_object_filenames' is not a list.
-        TypeError: If 'data_objects_for_saving[0][0]' is not a list.
+        TypeError: If 'data_objects_for_saving[0][0]' is not a list (or 'data_objects_for_saving[0]' a PolygonSoup or dict).
         TypeError: If 'data_object_filenames[0]' is not a string.
+        ValueError: If 'tolerance' is negative.
+        ValueError: If 'file_format' or 'compression' is not recognised.
     """
 
     if not isinstance(data_objects_for_saving, (list)):
         raise TypeError("'data_objects_for_saving' argument must be a list")
     elif not isinstance(data_object_filenames, (list)):
         raise TypeError("'data_object_filenames' argument must be a list")
+    elif file_format not in GEOMETRY_WRITERS:
+        raise ValueError(f"'file_format' argument must be one of {list(GEOMETRY_WRITERS)}")
+
+    quadrilateral_dicts_for_saving = []
+    output_paths = []
 
     for data_set,filename in zip(data_objects_for_saving, data_object_filenames):
 
-        if not isinstance(data_set[0], (list)):
+        if not isinstance(data_set, (PolygonSoup, dict)) and not isinstance(data_set[0], (list)):
             raise TypeError("'data_objects_for_saving' must contain a list of lists")
         elif not isinstance(filename, (str)):
             raise TypeError("'data_object_filenames' list must only contain strings")
 
-        q_for_dict = []
-        p_for_dict = []
-        position_identifier = {} #For assigning the position of p lists to q dict
+        if isinstance(data_set, (dict)):
+            quadrilateral_dict_for_saving = data_set
+        else:
+            q_for_dict, p_for_dict = weld_polygon_vertices(data_set, tolerance)
+            if instrumentation is not None:
+                corner_count = len(q_for_dict.vertices) if isinstance(q_for_dict, PolygonSoup) else sum(len(polygon) for polygon in q_for_dict)
+                instrumentation.count('vertices_deduplicated', corner_count - len(p_for_dict))
 
-        for quadrilateral in data_set: #[[-3.0, 0.0, 0.1], [-2.9, 0.0, 0.5], [-2.9, 0.5, 0.5], [-2.9, 0.5, 0.1]]
-            q_position = []
-            for point in quadrilateral: #[-3.0, 0.0, 0.1]
+            quadrilateral_dict_for_saving = {'q':q_for_dict, 'p':p_for_dict}
 
-                if point not in p_for_dict:
+        quadrilateral_dicts_for_saving.append(quadrilateral_dict_for_saving)
+        output_paths.append(geometry_output_path(output_directory, filename, file_format, compression))
 
-                    position_identifier[str(point)] = len(p_for_dict) #This is run before appending, so that position starts at 0
-                    p_for_dict.append(point)
-
-                q_position.append(position_identifier[str(point)])
-
-            q_for_dict.append(q_position)
+    write_geometry_files(quadrilateral_dicts_for_saving, output_paths, file_format, compression, chunk_size, max_workers)
 
-        quadrilateral_dict_for_saving = {'q':q_for_dict, 'p':p_for_dict}
-        save_json_file(filename, quadrilateral_dict_for_saving)
 
-
-def plot_dry_and_wet_data(quadrilateral_xyz_positions, figure_suptitle):
+def plot_dry_and_wet_data(quadrilateral_xyz_positions, figure_suptitle, preview='full', max_polygons=DEFAULT_MAX_PREVIEW_POLYGONS):
 
     #Test assumption: The vertices are connected in the order provided. Otherwise, we will get a self-intersecting polygon.
 
@@ -158,14 +257,19 @@ def plot_dry_and_wet_data(quadrilateral_xyz_positions, figure_suptitle):
                 representing the 4 corners of a quadrilateral, e.g. [[[1,2,3], [1,2,3], [1,2,3], [1,2,3]], [...], [...], ...].
                 **  As some of the original quadrilaterals get slices, it is not uncommon that some of these inner lists may contain
                     as loas as three or as high as 5 corner positions (no longer technically quadrilaterals)
+                Either may instead be a PolygonSoup.
         figure_suptitle (list): List containing strings corresponding to the plots for each dataset.
+        preview (str): 'full' to draw every polygon, or a cheaper preview for large meshes, see 'draw_preview' in 'rendering.py'.
+            To save images without opening a window, use 'save_dry_and_wet_previews' instead.
+        max_polygons (int): The most polygons drawn by the 'auto' and 'decimated' previews.
 
     Returns:
         None
 
     Raises:
-        TypeError: If either 'quadrilateral_xyz_positions' is not a list, or does not contain lists.
+        TypeError: If either 'quadrilateral_xyz_positions' is not a list, or does not contain lists (or PolygonSoups).
         TypeError: If either 'figure_suptitle' is not a list, or does not contain strings.
+        ValueError: If 'preview' is not one of 'PREVIEW_MODES'.
     """
 
     if not isinstance(quadrilateral_xyz_positions, (list)):
@@ -173,28 +277,24 @@ def plot_dry_and_wet_data(quadrilateral_xyz_positions, figure_suptitle):
     elif not isinstance(figure_suptitle, (list)):
         raise TypeError("'figure_suptitle' argument must be a list")
 
-    axis_limits = 8
+    #Imported here rather than at module load, as pyplot (and its GUI backend) takes most of a second to import, which runs that never
+    #plot (e.g. batch jobs and worker processes) should not pay
+    from matplotlib import pyplot
+
     colours = ['red', 'blue']
 
     for position_data, suptitle, colour in zip(quadrilateral_xyz_positions, figure_suptitle, colours):
         
-        if not isinstance(position_data, (list)):
-            raise TypeError("'quadrilateral_xyz_positions' argument must contain lists")
+        if not isinstance(position_data, (list, PolygonSoup)):
+            raise TypeError("'quadrilateral_xyz_positions' argument must contain lists or PolygonSoups")
         elif not isinstance(suptitle, (str)):
             raise TypeError("'figure_suptitle' argument must contain strings")
 
-        fig = plt.figure()
+        fig = pyplot.figure()
         fig.suptitle(suptitle)
-        ax = fig.add_subplot(projection='3d')
-        ax.set_xlabel('x')
-        ax.set_ylabel('y')
-        ax.set_zlabel('z')
-        ax.add_collection3d(Poly3DCollection(position_data, facecolor=colour)) # list of position data
-        ax.set_ylim3d(-axis_limits, axis_limits)
-        ax.set_xlim3d(-axis_limits, axis_limits)
-        ax.set_zlim3d(-axis_limits, axis_limits)
-
-    plt.show()
+        draw_preview(fig.add_subplot(projection='3d'), position_data, colour, preview, max_polygons)
+
+    pyplot.show()
 
     
 